@@ -1,726 +1,2713 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import mysql.connector
-from mysql.connector import Error
-from datetime import datetime
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-app = Flask(__name__)
-CORS(app)
-
-# Database configuration
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', 3306)),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', '@yush2004'),
-    'database': os.getenv('DB_NAME', 'project_recommender')
-}
-
-def get_db_connection():
-    """Create and return MySQL database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password'],
-            database=DB_CONFIG['database']
-        )
-        return connection
-    except Error as e:
-        print(f"Database connection error: {str(e)}")
-        return None
-
-# ==================== AUTHENTICATION ROUTES ====================
-
-@app.route('/api/auth/signup', methods=['POST'])
-def signup():
-    """Sign up a new user with Full Name, email, and password"""
-    try:
-        data = request.json
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip().lower()
-        password = data.get('password', '').strip()
-        
-        # Validation
-        if not name or not email or not password:
-            return jsonify({'error': 'Full Name, email, and password are required'}), 400
-        
-        if len(password) < 6:
-            return jsonify({'error': 'Password must be at least 6 characters long'}), 400
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Check if email already exists
-        cursor.execute("""
-            SELECT student_id FROM STUDENTS WHERE email = %s
-        """, (email,))
-        
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Email already registered. Please login instead.'}), 400
-        
-        # Insert student (store password as plain text)
-        cursor.execute("""
-            INSERT INTO STUDENTS (name, email, password_hash)
-            VALUES (%s, %s, %s)
-        """, (name, email, password))
-        
-        student_id = cursor.lastrowid
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'message': 'Account created successfully',
-            'student_id': student_id
-        }), 201
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/auth/login', methods=['POST'])
-def login():
-    """Login with email and password"""
-    try:
-        data = request.json
-        email = data.get('email', '').strip().lower()
-        password = data.get('password', '').strip()
-        
-        # Validation
-        if not email or not password:
-            return jsonify({'error': 'Email and password are required'}), 400
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Get student by email
-        cursor.execute("""
-            SELECT student_id, name, email, password_hash
-            FROM STUDENTS
-            WHERE email = %s
-        """, (email,))
-        
-        student_row = cursor.fetchone()
-        if not student_row:
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Invalid email or password'}), 401
-        
-        student_id, name, db_email, stored_password = student_row
-        
-        # Verify password (plain text comparison)
-        if not stored_password or stored_password != password:
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Invalid email or password'}), 401
-        
-        # Get student skills
-        cursor.execute("""
-            SELECT s.skill_id, s.skill_name, ss.proficiency_level, ss.years_of_experience
-            FROM STUDENT_SKILLS ss
-            JOIN SKILLS s ON ss.skill_id = s.skill_id
-            WHERE ss.student_id = %s
-        """, (student_id,))
-        
-        skills = []
-        for row in cursor.fetchall():
-            skills.append({
-                'skill_id': row[0],
-                'skill_name': row[1],
-                'proficiency_level': row[2],
-                'years_of_experience': row[3]
-            })
-        
-        student = {
-            'student_id': student_id,
-            'name': name,
-            'email': db_email,
-            'skills': skills
-        }
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'message': 'Login successful',
-            'student': student
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# ==================== STUDENT ROUTES ====================
-
-@app.route('/api/students', methods=['POST'])
-def create_student():
-    """Create a new student profile"""
-    try:
-        data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Insert student
-        cursor.execute("""
-            INSERT INTO STUDENTS (name, email)
-            VALUES (%s, %s)
-        """, (data.get('name'), data.get('email')))
-        
-        student_id = cursor.lastrowid
-        
-        # Insert student skills
-        if 'skills' in data and data['skills']:
-            for skill in data['skills']:
-                cursor.execute("""
-                    INSERT INTO STUDENT_SKILLS (student_id, skill_id, proficiency_level, years_of_experience)
-                    VALUES (%s, %s, %s, %s)
-                """, (
-                    student_id,
-                    skill.get('skill_id'),
-                    skill.get('proficiency_level', 'Beginner'),
-                    skill.get('years_of_experience', 0)
-                ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'message': 'Student created successfully',
-            'student_id': student_id
-        }), 201
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/students/<int:student_id>', methods=['GET'])
-def get_student(student_id):
-    """Get student profile with skills"""
-    try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Get student info
-        cursor.execute("""
-            SELECT student_id, name, email, created_at, updated_at
-            FROM STUDENTS
-            WHERE student_id = %s
-        """, (student_id,))
-        
-        student_row = cursor.fetchone()
-        if not student_row:
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Student not found'}), 404
-        
-        student = {
-            'student_id': student_row[0],
-            'name': student_row[1],
-            'email': student_row[2],
-            'created_at': student_row[3].isoformat() if student_row[3] else None,
-            'updated_at': student_row[4].isoformat() if student_row[4] else None
-        }
-        
-        # Get student skills
-        cursor.execute("""
-            SELECT s.skill_id, s.skill_name, ss.proficiency_level, ss.years_of_experience
-            FROM STUDENT_SKILLS ss
-            JOIN SKILLS s ON ss.skill_id = s.skill_id
-            WHERE ss.student_id = %s
-        """, (student_id,))
-        
-        skills = []
-        for row in cursor.fetchall():
-            skills.append({
-                'skill_id': row[0],
-                'skill_name': row[1],
-                'proficiency_level': row[2],
-                'years_of_experience': row[3]
-            })
-        
-        student['skills'] = skills
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify(student), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/students/<int:student_id>', methods=['PUT'])
-def update_student(student_id):
-    """Update student profile and skills"""
-    try:
-        data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Update student info
-        cursor.execute("""
-            UPDATE STUDENTS
-            SET name = %s, email = %s
-            WHERE student_id = %s
-        """, (data.get('name'), data.get('email'), student_id))
-        
-        # Delete existing skills
-        cursor.execute("""
-            DELETE FROM STUDENT_SKILLS WHERE student_id = %s
-        """, (student_id,))
-        
-        # Insert new skills
-        if 'skills' in data and data['skills']:
-            for skill in data['skills']:
-                cursor.execute("""
-                    INSERT INTO STUDENT_SKILLS (student_id, skill_id, proficiency_level, years_of_experience)
-                    VALUES (%s, %s, %s, %s)
-                """, (
-                    student_id,
-                    skill.get('skill_id'),
-                    skill.get('proficiency_level', 'Beginner'),
-                    skill.get('years_of_experience', 0)
-                ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'message': 'Student updated successfully'}), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# ==================== PROJECT ROUTES ====================
-
-@app.route('/api/projects', methods=['GET'])
-def get_projects():
-    """Get all projects with optional filters"""
-    try:
-        difficulty = request.args.get('difficulty')
-        category = request.args.get('category')
-        search = request.args.get('search', '')
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Build query with filters
-        query = """
-            SELECT DISTINCT p.project_id, p.title, p.description, 
-                   p.difficulty_level, p.category, p.created_at
-            FROM PROJECTS p
-            WHERE 1=1
-        """
-        params = []
-        
-        if difficulty:
-            query += " AND UPPER(p.difficulty_level) = UPPER(%s)"
-            params.append(difficulty)
-        
-        if category:
-            query += " AND UPPER(p.category) = UPPER(%s)"
-            params.append(category)
-        
-        if search:
-            query += " AND (UPPER(p.title) LIKE UPPER(%s) OR UPPER(p.description) LIKE UPPER(%s))"
-            params.extend([f'%{search}%', f'%{search}%'])
-        
-        query += " ORDER BY p.created_at DESC"
-        
-        cursor.execute(query, tuple(params))
-        
-        projects = []
-        for row in cursor.fetchall():
-            project = {
-                'project_id': row[0],
-                'title': row[1],
-                'description': row[2],
-                'difficulty_level': row[3],
-                'category': row[4],
-                'created_at': row[5].isoformat() if row[5] else None
-            }
-            
-            # Get project skills
-            cursor.execute("""
-                SELECT s.skill_id, s.skill_name, ps.required_proficiency_level, ps.is_mandatory
-                FROM PROJECT_SKILLS ps
-                JOIN SKILLS s ON ps.skill_id = s.skill_id
-                WHERE ps.project_id = %s
-            """, (row[0],))
-            
-            skills = []
-            for skill_row in cursor.fetchall():
-                skills.append({
-                    'skill_id': skill_row[0],
-                    'skill_name': skill_row[1],
-                    'required_proficiency_level': skill_row[2],
-                    'is_mandatory': skill_row[3]
-                })
-            
-            project['skills'] = skills
-            projects.append(project)
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify(projects), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/projects/<int:project_id>', methods=['GET'])
-def get_project(project_id):
-    """Get project details by ID"""
-    try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT project_id, title, description, difficulty_level, 
-                   category, created_at, created_by
-            FROM PROJECTS
-            WHERE project_id = %s
-        """, (project_id,))
-        
-        row = cursor.fetchone()
-        if not row:
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Project not found'}), 404
-        
-        project = {
-            'project_id': row[0],
-            'title': row[1],
-            'description': row[2],
-            'difficulty_level': row[3],
-            'category': row[4],
-            'created_at': row[5].isoformat() if row[5] else None,
-            'created_by': row[6]
-        }
-        
-        # Get project skills
-        cursor.execute("""
-            SELECT s.skill_id, s.skill_name, s.skill_type, 
-                   ps.required_proficiency_level, ps.is_mandatory
-            FROM PROJECT_SKILLS ps
-            JOIN SKILLS s ON ps.skill_id = s.skill_id
-            WHERE ps.project_id = %s
-        """, (project_id,))
-        
-        skills = []
-        for skill_row in cursor.fetchall():
-            skills.append({
-                'skill_id': skill_row[0],
-                'skill_name': skill_row[1],
-                'skill_type': skill_row[2],
-                'required_proficiency_level': skill_row[3],
-                'is_mandatory': skill_row[4]
-            })
-        
-        project['skills'] = skills
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify(project), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/projects', methods=['POST'])
-def create_project():
-    """Create a new project"""
-    try:
-        data = request.json
-        title = data.get('title', '').strip()
-        
-        if not title:
-            return jsonify({'error': 'Project title is required'}), 400
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Check if project with same title already exists
-        cursor.execute("""
-            SELECT project_id FROM PROJECTS WHERE UPPER(title) = UPPER(%s)
-        """, (title,))
-        
-        existing_project = cursor.fetchone()
-        if existing_project:
-            cursor.close()
-            conn.close()
-            return jsonify({
-                'error': 'A project with this title already exists',
-                'project_id': existing_project[0]
-            }), 409
-        
-        # Insert project
-        cursor.execute("""
-            INSERT INTO PROJECTS (title, description, difficulty_level, category, created_by)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (
-            title,
-            data.get('description'),
-            data.get('difficulty_level', 'Beginner'),
-            data.get('category'),
-            data.get('created_by', 'Admin')
-        ))
-        
-        project_id = cursor.lastrowid
-        
-        # Insert project skills
-        if 'skills' in data and data['skills']:
-            for skill in data['skills']:
-                cursor.execute("""
-                    INSERT INTO PROJECT_SKILLS (project_id, skill_id, required_proficiency_level, is_mandatory)
-                    VALUES (%s, %s, %s, %s)
-                """, (
-                    project_id,
-                    skill.get('skill_id'),
-                    skill.get('required_proficiency_level', 'Beginner'),
-                    skill.get('is_mandatory', 'Y')
-                ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'message': 'Project created successfully',
-            'project_id': project_id
-        }), 201
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# ==================== SKILLS ROUTES ====================
-
-@app.route('/api/skills', methods=['GET'])
-def get_skills():
-    """Get all available skills"""
-    try:
-        skill_type = request.args.get('type')
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        if skill_type:
-            cursor.execute("""
-                SELECT skill_id, skill_name, skill_type, description
-                FROM SKILLS
-                WHERE UPPER(skill_type) = UPPER(%s)
-                ORDER BY skill_name
-            """, (skill_type,))
-        else:
-            cursor.execute("""
-                SELECT skill_id, skill_name, skill_type, description
-                FROM SKILLS
-                ORDER BY skill_type, skill_name
-            """)
-        
-        skills = []
-        for row in cursor.fetchall():
-            skills.append({
-                'skill_id': row[0],
-                'skill_name': row[1],
-                'skill_type': row[2],
-                'description': row[3]
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify(skills), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# ==================== RECOMMENDATIONS ROUTE ====================
-
-@app.route('/api/recommendations/<int:student_id>', methods=['GET'])
-def get_recommendations(student_id):
-    """Get personalized project recommendations for a student"""
-    try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        cursor = conn.cursor()
-        
-        # Get student skills
-        cursor.execute("""
-            SELECT s.skill_id, s.skill_name, ss.proficiency_level
-            FROM STUDENT_SKILLS ss
-            JOIN SKILLS s ON ss.skill_id = s.skill_id
-            WHERE ss.student_id = %s
-        """, (student_id,))
-        
-        student_skills = {}
-        for row in cursor.fetchall():
-            student_skills[row[0]] = {
-                'skill_name': row[1],
-                'proficiency_level': row[2]
-            }
-        
-        if not student_skills:
-            cursor.close()
-            conn.close()
-            return jsonify({
-                'message': 'No skills found. Please add skills to your profile.',
-                'recommendations': []
-            }), 200
-        
-        # Get all projects
-        cursor.execute("""
-            SELECT project_id, title, description, difficulty_level, category
-            FROM PROJECTS
-            ORDER BY created_at DESC
-        """)
-        
-        projects = []
-        for row in cursor.fetchall():
-            project_id = row[0]
-            
-            # Get project required skills
-            cursor.execute("""
-                SELECT s.skill_id, s.skill_name, ps.required_proficiency_level, ps.is_mandatory
-                FROM PROJECT_SKILLS ps
-                JOIN SKILLS s ON ps.skill_id = s.skill_id
-                WHERE ps.project_id = %s
-            """, (project_id,))
-            
-            project_skills = []
-            for skill_row in cursor.fetchall():
-                project_skills.append({
-                    'skill_id': skill_row[0],
-                    'skill_name': skill_row[1],
-                    'required_proficiency_level': skill_row[2],
-                    'is_mandatory': skill_row[3]
-                })
-            
-            # Calculate match score
-            match_score = calculate_match_score(student_skills, project_skills)
-            
-            projects.append({
-                'project_id': project_id,
-                'title': row[1],
-                'description': row[2],
-                'difficulty_level': row[3],
-                'category': row[4],
-                'skills': project_skills,
-                'match_score': match_score
-            })
-        
-        # Sort by match score (descending)
-        projects.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'student_id': student_id,
-            'recommendations': projects
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-def calculate_match_score(student_skills, project_skills):
-    """Calculate match score between student skills and project requirements"""
-    if not project_skills:
-        return 50  # Default score if no skills required
-    
-    total_skills = len(project_skills)
-    matched_skills = 0
-    proficiency_bonus = 0
-    
-    proficiency_levels = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
-    
-    for project_skill in project_skills:
-        skill_id = project_skill['skill_id']
-        
-        if skill_id in student_skills:
-            matched_skills += 1
-            
-            # Check proficiency match
-            student_prof = student_skills[skill_id]['proficiency_level']
-            required_prof = project_skill.get('required_proficiency_level', 'Beginner')
-            
-            student_level = proficiency_levels.get(student_prof, 1)
-            required_level = proficiency_levels.get(required_prof, 1)
-            
-            if student_level >= required_level:
-                proficiency_bonus += 10  # Bonus for meeting or exceeding requirement
-            elif student_level >= required_level - 1:
-                proficiency_bonus += 5   # Partial bonus
-    
-    # Base score: percentage of matched skills
-    base_score = (matched_skills / total_skills) * 100
-    
-    # Add proficiency bonus (capped at 20% of total)
-    bonus = min(proficiency_bonus, total_skills * 10)
-    
-    # Final score (max 100)
-    final_score = min(base_score + bonus, 100)
-    
-    return round(final_score, 2)
-
-# ==================== HEALTH CHECK ====================
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    try:
-        conn = get_db_connection()
-        if conn:
-            conn.close()
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected'
-            }), 200
-        else:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'disconnected'
-            }), 503
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'error': str(e)
-        }), 503
-
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+from flask import Flask, Response, request, jsonify, g, has_app_context, has_request_context
+from flask_cors import CORS
+import mysql.connector
+from mysql.connector import Error
+from contextlib import contextmanager
+from functools import wraps
+import base64
+import heapq
+import itertools
+import json
+import math
+from datetime import datetime
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from db_pool import ConnectionPool, ReplicaSet
+from catalog import CatalogIndex
+from catalog_snapshot import CatalogSnapshot, latest_snapshot_path, publish_lock, snapshot_version, write_snapshot
+from collaborative import ScoreCache, blend_scores
+from change_feed import ChangeFeed
+from scoring import NO_REQUIREMENTS_SCORE, SCORING_ENGINES, ScoringPool, first_row_below, score_page, select_top
+from response_cache import CacheEntry, ResponseCache, make_etag
+from profile_cache import create_profile_cache
+from metrics import COUNT_BUCKETS, ROW_BUCKETS, MetricsRegistry, SlowQueryLog
+from singleflight import SingleFlight
+
+load_dotenv()
+
+app = Flask(__name__)
+CORS(app)
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': int(os.getenv('DB_PORT', 3306)),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', '@yush2004'),
+    'database': os.getenv('DB_NAME', 'project_recommender'),
+    # Connection pool settings
+    'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+    'pool_max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', 10)),
+    'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+    'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true',
+    # Read replicas as comma separated host[:port] (same user, password and
+    # database as the primary); empty sends every query to the primary
+    'replicas': [entry.strip() for entry in os.getenv('DB_REPLICAS', '').split(',') if entry.strip()],
+    'replica_check_interval': float(os.getenv('DB_REPLICA_CHECK_INTERVAL', 5)),
+    'replica_max_lag': float(os.getenv('DB_REPLICA_MAX_LAG', 30)),
+    'replica_connect_timeout': int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', 2))
+}
+
+# Seconds after a write during which the writing client reads from the primary
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', 10))
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
+_pool = None
+_replicas = None
+_pool_lock = threading.Lock()
+
+def create_pool(host, port, **connect_args):
+    """Connection pool to one MySQL server with the configured database, credentials and sizes"""
+    return ConnectionPool(
+        {
+            'host': host,
+            'port': port,
+            'user': DB_CONFIG['user'],
+            'password': DB_CONFIG['password'],
+            'database': DB_CONFIG['database'],
+            **connect_args
+        },
+        pool_size=DB_CONFIG['pool_size'],
+        max_overflow=DB_CONFIG['pool_max_overflow'],
+        timeout=DB_CONFIG['pool_timeout'],
+        recycle=DB_CONFIG['pool_recycle'],
+        pre_ping=DB_CONFIG['pool_pre_ping'],
+        on_checkout=record_pool_wait if METRICS_ENABLED else None,
+        on_query=record_query if METRICS_ENABLED else None,
+        on_rows=record_rows if METRICS_ENABLED else None
+    )
+
+def get_db_pool():
+    """Return the connection pool for this process, creating it on first use"""
+    global _pool
+    # A pool inherited through fork() shares sockets with the parent, so each
+    # worker process builds its own
+    if _pool is None or _pool.pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool.pid != os.getpid():
+                _pool = create_pool(DB_CONFIG['host'], DB_CONFIG['port'])
+    return _pool
+
+def get_replica_set():
+    """Return this process's read replicas (pools plus health monitor), or None if none are configured"""
+    global _replicas
+    if not DB_CONFIG['replicas']:
+        return None
+    if _replicas is None or _replicas.pid != os.getpid():
+        with _pool_lock:
+            if _replicas is None or _replicas.pid != os.getpid():
+                pools = []
+                for entry in DB_CONFIG['replicas']:
+                    host, _, port = entry.partition(':')
+                    pools.append((entry, create_pool(
+                        host, int(port or 3306), connection_timeout=DB_CONFIG['replica_connect_timeout']
+                    )))
+                _replicas = ReplicaSet(pools, DB_CONFIG['replica_check_interval'], DB_CONFIG['replica_max_lag'])
+                _replicas.start_monitor()
+    return _replicas
+
+def read_your_writes():
+    """True if the current client wrote recently, so its reads must see the primary"""
+    if not has_request_context():
+        return False
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def acquire_replica_connection():
+    """Connection to a healthy replica, the same one for the whole request; None to use the primary"""
+    replicas = get_replica_set()
+    if replicas is None or read_your_writes():
+        return None
+    prefer = g.get('replica') if has_app_context() else None
+    index, connection = replicas.acquire(prefer)
+    if index is not None and has_app_context():
+        g.replica = index
+    return connection
+
+def get_db_connection(track=True, read_only=False):
+    """Check out a pooled MySQL connection; close() returns it to the pool
+    
+    track=False skips the release at app context teardown, for connections
+    used by streamed responses that outlive the request. read_only=True reads
+    from a replica when any is configured and healthy.
+    """
+    try:
+        connection = acquire_replica_connection() if read_only else None
+        if connection is None:
+            connection = get_db_pool().acquire()
+    except Error as e:
+        print(f"Database connection error: {str(e)}")
+        return None
+    
+    # Remember the checkout so teardown can release it if a route bails out early
+    if track and has_app_context():
+        g.setdefault('db_connections', []).append(connection)
+    return connection
+
+@contextmanager
+def db_connection(read_only=False):
+    """Context manager that always returns the connection to the pool"""
+    conn = get_db_connection(read_only=read_only)
+    try:
+        yield conn
+    finally:
+        if conn:
+            conn.close()
+
+@app.teardown_appcontext
+def release_db_connections(exception=None):
+    """Return any connection a request left checked out"""
+    for conn in g.pop('db_connections', []):
+        conn.close()
+
+@app.after_request
+def pin_reads_to_primary(response):
+    """After a write, send the client's reads to the primary until the replicas have caught up"""
+    if DB_CONFIG['replicas'] and g.get('wrote') and response.status_code < 400:
+        response.set_cookie(READ_PRIMARY_COOKIE, f'{time.time() + READ_YOUR_WRITES_SECONDS:.3f}',
+                            max_age=math.ceil(READ_YOUR_WRITES_SECONDS), httponly=True, samesite='Lax')
+    return response
+
+# ==================== METRICS ====================
+#
+# Every request records its latency and its database cost (statements, time
+# in SQL, rows fetched) per route, served in the Prometheus text format on
+# /api/metrics. Statements slower than SLOW_QUERY_MS are logged with the route
+# that issued them, and printed at most once per SLOW_QUERY_PRINT_INTERVAL
+# seconds. The cost per statement is two perf_counter() calls and a
+# few counter updates, cheap enough to leave on in production.
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+
+metrics = MetricsRegistry()
+slow_query_log = SlowQueryLog(
+    threshold_ms=float(os.getenv('SLOW_QUERY_MS', 200)),
+    max_entries=int(os.getenv('SLOW_QUERY_LOG_SIZE', 100)),
+    print_interval=float(os.getenv('SLOW_QUERY_PRINT_INTERVAL', 60))
+)
+
+request_latency = metrics.histogram(
+    'http_request_duration_seconds', 'Time to produce a response', ('method', 'route', 'status'))
+request_db_queries = metrics.histogram(
+    'db_queries_per_request', 'SQL statements issued per request', ('route',), COUNT_BUCKETS)
+request_db_time = metrics.histogram(
+    'db_time_per_request_seconds', 'Time spent in SQL statements per request', ('route',))
+request_db_rows = metrics.histogram(
+    'db_rows_per_request', 'Rows fetched per request', ('route',), ROW_BUCKETS)
+query_duration = metrics.histogram(
+    'db_query_duration_seconds', 'Duration of single SQL statements')
+slow_queries = metrics.counter(
+    'db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS', ('route',))
+pool_wait = metrics.histogram(
+    'db_pool_wait_seconds', 'Time spent waiting to check out a pooled connection')
+scoring_time = metrics.histogram(
+    'recommendation_scoring_seconds', 'Time spent ranking the catalog for one student', ('mode',))
+
+metrics.gauge(
+    'db_pool_connections', 'Pooled connections by state',
+    lambda: {(state,): get_db_pool().stats()[state] for state in ('in_use', 'idle', 'waiting')},
+    ('state',))
+metrics.callback_counter(
+    'cache_lookups_total', 'Cache lookups by cache and result',
+    lambda: {
+        (name, result): cache.stats()[counter]
+        for name, cache in (('responses', response_cache), ('profiles', profile_cache), ('scores', score_cache))
+        for result, counter in (('hit', 'hits'), ('miss', 'misses'))
+    },
+    ('cache', 'result'))
+metrics.callback_counter(
+    'coalesced_requests_total', 'Requests served by a computation they ran (leader) or joined (coalesced)',
+    lambda: {
+        (name, result): group.stats()[counter]
+        for name, group in (('responses', response_flights), ('recommendations', recommendation_flights))
+        for result, counter in (('leader', 'executions'), ('coalesced', 'coalesced'))
+    },
+    ('group', 'result'))
+
+def request_route():
+    """Route template of the current request, used as a low-cardinality label"""
+    if not has_request_context():
+        return 'background'
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+def record_pool_wait(seconds):
+    pool_wait.observe(seconds)
+
+def record_query(statement, seconds):
+    query_duration.observe(seconds)
+    if has_app_context() and 'db_stats' in g:
+        g.db_stats['queries'] += 1
+        g.db_stats['seconds'] += seconds
+    if seconds >= slow_query_log.threshold:
+        route = request_route()
+        slow_query_log.record(statement, seconds, route)
+        slow_queries.inc(route)
+
+def record_rows(count):
+    if has_app_context() and 'db_stats' in g:
+        g.db_stats['rows'] += count
+
+@app.before_request
+def start_request_metrics():
+    if METRICS_ENABLED:
+        g.request_started = time.perf_counter()
+        g.db_stats = {'queries': 0, 'seconds': 0.0, 'rows': 0}
+
+@app.after_request
+def record_request_metrics(response):
+    if METRICS_ENABLED and 'request_started' in g:
+        route = request_route()
+        request_latency.observe(time.perf_counter() - g.request_started,
+                                request.method, route, str(response.status_code))
+        request_db_queries.observe(g.db_stats['queries'], route)
+        request_db_time.observe(g.db_stats['seconds'], route)
+        request_db_rows.observe(g.db_stats['rows'], route)
+    return response
+
+# ==================== PAGINATION HELPERS ====================
+
+RECOMMENDATIONS_MAX_LIMIT = int(os.getenv('RECOMMENDATIONS_MAX_LIMIT', 100))
+PROJECTS_MAX_LIMIT = int(os.getenv('PROJECTS_MAX_LIMIT', 100))
+
+# Serve recommendations from the RECOMMENDATIONS table instead of scoring on every request
+MATERIALIZED_RECOMMENDATIONS = os.getenv('MATERIALIZED_RECOMMENDATIONS', 'True').lower() == 'true'
+# Extra rows read per materialized page, covering rows of projects deleted since the last refresh
+MATERIALIZED_OVERFETCH = int(os.getenv('MATERIALIZED_OVERFETCH', 10))
+
+# Cohort scoring for the batch recommendations endpoint
+BATCH_MAX_STUDENTS = int(os.getenv('BATCH_MAX_STUDENTS', 1000))
+RECOMMENDATION_WORKERS = int(os.getenv('RECOMMENDATION_WORKERS', os.cpu_count() or 1))
+
+# Catalog scoring representation: 'bitset' (packed skill bitsets) or 'matrix' (sparse CSR)
+SCORING_ENGINE = os.getenv('SCORING_ENGINE', 'bitset')
+
+def encode_cursor(*values):
+    """Encode sort key values into an opaque page cursor"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, *types):
+    """Decode a page cursor back into sort key values, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if len(values) != len(types):
+            raise ValueError
+        return tuple(cast(value) for cast, value in zip(types, values))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+def parse_limit(max_limit, default=None):
+    """Read the `limit` query arg, clamped to [1, max_limit]; raises ValueError if not an integer"""
+    limit = request.args.get('limit')
+    if limit is None or limit == '':
+        return default
+    return max(1, min(int(limit), max_limit))
+
+# ==================== CATALOG INDEX ====================
+
+# Similar projects: weight each skill by its required proficiency level
+SIMILAR_PROJECTS_WEIGHTED = os.getenv('SIMILAR_PROJECTS_WEIGHTED', 'True').lower() == 'true'
+SIMILAR_PROJECTS_MAX_LIMIT = int(os.getenv('SIMILAR_PROJECTS_MAX_LIMIT', 50))
+
+catalog = CatalogIndex(SCORING_ENGINES[SCORING_ENGINE], SIMILAR_PROJECTS_WEIGHTED)
+_catalog_lock = threading.Lock()
+# Newest CATALOG_VERSION whose changes the catalog index may hold; a replica
+# behind it may lack stored scores of projects this worker already serves
+_catalog_floor = {'version': 0}
+_catalog_floor_lock = threading.Lock()
+# CATALOG_VERSION the catalog index was last loaded at; without the change
+# feed, a newer version makes get_catalog reload it
+_catalog_synced = {'version': 0}
+scoring_pool = ScoringPool(RECOMMENDATION_WORKERS)
+
+# Upper bound on ids per IN (...) list so statements stay a sane size
+SKILL_LOADER_BATCH_SIZE = 1000
+
+def fetch_project_skills(cursor, project_ids=None, with_type=False):
+    """Get the required skills of many projects in batched queries, grouped by project_id
+    
+    Passing project_ids=None loads the requirements of every project in one query.
+    """
+    columns = "ps.project_id, s.skill_id, s.skill_name, ps.required_proficiency_level, ps.is_mandatory"
+    if with_type:
+        columns += ", s.skill_type"
+    query = f"""
+        SELECT {columns}
+        FROM PROJECT_SKILLS ps
+        JOIN SKILLS s ON ps.skill_id = s.skill_id
+    """
+    
+    if project_ids is None:
+        batches = [None]
+    else:
+        project_ids = list(dict.fromkeys(project_ids))
+        batches = [project_ids[i:i + SKILL_LOADER_BATCH_SIZE]
+                   for i in range(0, len(project_ids), SKILL_LOADER_BATCH_SIZE)]
+    
+    project_skills = {} if project_ids is None else {project_id: [] for project_id in project_ids}
+    for batch in batches:
+        if batch is None:
+            cursor.execute(query)
+        else:
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(query + f" WHERE ps.project_id IN ({placeholders})", tuple(batch))
+        
+        for row in cursor.fetchall():
+            skill = {
+                'skill_id': row[1],
+                'skill_name': row[2],
+                'required_proficiency_level': row[3],
+                'is_mandatory': row[4]
+            }
+            if with_type:
+                skill['skill_type'] = row[5]
+            project_skills.setdefault(row[0], []).append(skill)
+    
+    return project_skills
+
+def fetch_student_skills(cursor, student_ids):
+    """Get the skills of many students in batched queries, keyed by student_id then skill_id"""
+    student_ids = list(dict.fromkeys(student_ids))
+    student_skills = {student_id: {} for student_id in student_ids}
+    
+    for i in range(0, len(student_ids), SKILL_LOADER_BATCH_SIZE):
+        batch = student_ids[i:i + SKILL_LOADER_BATCH_SIZE]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(f"""
+            SELECT ss.student_id, s.skill_id, s.skill_name, ss.proficiency_level
+            FROM STUDENT_SKILLS ss
+            JOIN SKILLS s ON ss.skill_id = s.skill_id
+            WHERE ss.student_id IN ({placeholders})
+        """, tuple(batch))
+        
+        for row in cursor.fetchall():
+            student_skills[row[0]][row[1]] = {
+                'skill_name': row[2],
+                'proficiency_level': row[3]
+            }
+    
+    return student_skills
+
+def read_catalog_rows(cursor, project_ids=None):
+    """(projects, project_skills) of the whole catalog, or of some projects, from PROJECTS and PROJECT_SKILLS"""
+    query = """
+        SELECT project_id, title, description, difficulty_level, category, created_at
+        FROM PROJECTS
+    """
+    if project_ids is None:
+        cursor.execute(query)
+    else:
+        project_ids = list(project_ids)
+        cursor.execute(query + f" WHERE project_id IN ({id_placeholders(project_ids)})", tuple(project_ids))
+    
+    projects = []
+    for row in cursor.fetchall():
+        projects.append({
+            'project_id': row[0],
+            'title': row[1],
+            'description': row[2],
+            'difficulty_level': row[3],
+            'category': row[4],
+            'created_at': row[5]
+        })
+    
+    if project_ids is None:
+        return projects, fetch_project_skills(cursor)
+    return projects, fetch_project_skills(cursor, project_ids)
+
+def load_catalog(cursor):
+    """Build the in-memory catalog index from PROJECTS and PROJECT_SKILLS"""
+    # Read before the rows, so they hold at least this version's changes
+    version = read_catalog_version(cursor)
+    catalog.load(*read_catalog_rows(cursor))
+    note_catalog_version(cursor)
+    _catalog_synced['version'] = version
+
+def note_catalog_version(cursor):
+    """Raise the catalog floor to cursor's CATALOG_VERSION; call after updating the index from cursor"""
+    # Read after the rows, so the version is at least the one they were written at
+    version = read_catalog_version(cursor)
+    with _catalog_floor_lock:
+        _catalog_floor['version'] = max(_catalog_floor['version'], version)
+
+def catalog_floor():
+    """Oldest CATALOG_VERSION a database may be at to have every change the catalog index holds"""
+    return max(_catalog_floor['version'], catalog.version or 0)
+
+def get_catalog(cursor):
+    """Return the catalog index, loading it on first use"""
+    sync_changes(cursor)
+    if CATALOG_SNAPSHOT_DIR:
+        refresh_catalog_snapshot(cursor)
+        return catalog
+    if not catalog.loaded:
+        with _catalog_lock:
+            if not catalog.loaded:
+                load_catalog(cursor)
+    elif not CHANGE_FEED:
+        # Nothing tells this worker what other workers changed: reload the
+        # whole catalog once CATALOG_VERSION moved past the loaded one
+        version = current_catalog_version(cursor)
+        if version is not None and version > _catalog_synced['version']:
+            with _catalog_lock:
+                if version > _catalog_synced['version']:
+                    load_catalog(cursor)
+    return catalog
+
+def update_catalog(cursor, entries):
+    """Apply committed (project, skills) writes to the catalog: a new snapshot file, or the in-memory index"""
+    if not catalog.loaded:
+        return
+    if CATALOG_SNAPSHOT_DIR:
+        try:
+            with _catalog_lock:
+                publish_catalog_snapshot(cursor)
+            return
+        except (Error, OSError, ValueError) as e:
+            # This worker stays correct; the others publish the change
+            # themselves once they have waited CATALOG_SNAPSHOT_MAX_DELAY for it
+            print(f"Catalog snapshot publish failed: {str(e)}")
+    catalog.add_projects(entries)
+    note_catalog_version(cursor)
+
+def warm_catalog():
+    """Load the catalog index at startup so the first request does not pay for it"""
+    with db_connection(read_only=True) as conn:
+        if conn:
+            cursor = conn.cursor()
+            get_catalog(cursor)
+            cursor.close()
+
+# ==================== CATALOG SNAPSHOT ====================
+#
+# With CATALOG_SNAPSHOT_DIR set, workers share the catalog through a
+# memory-mapped snapshot file (catalog_snapshot.py) instead of each loading
+# it from the database. A worker that changes the catalog publishes a new
+# file after committing; the other workers map it on their next check.
+
+CATALOG_SNAPSHOT_DIR = os.getenv('CATALOG_SNAPSHOT_DIR', '')
+# Seconds a worker may serve its mapped snapshot before looking for a newer file
+CATALOG_SNAPSHOT_CHECK_INTERVAL = float(os.getenv('CATALOG_SNAPSHOT_CHECK_INTERVAL', 1.0))
+# Seconds a worker waits for the writer's snapshot of a newer catalog version
+# before publishing it itself (or loading the catalog from the database)
+CATALOG_SNAPSHOT_MAX_DELAY = float(os.getenv('CATALOG_SNAPSHOT_MAX_DELAY', 10.0))
+
+_snapshot_check = {'checked_at': 0.0, 'behind_since': None}
+
+def read_catalog_version(cursor):
+    cursor.execute("""
+        SELECT version FROM CATALOG_VERSION WHERE id = 1
+    """)
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def map_newest_snapshot():
+    """Map the newest snapshot file if it is newer than the catalog this worker serves
+    
+    Returns False if a newer file exists but cannot be mapped; the current
+    catalog is then kept.
+    """
+    # A file can be removed by a newer publish between listing and opening; look once more
+    for _ in range(2):
+        path = latest_snapshot_path(CATALOG_SNAPSHOT_DIR)
+        if path is None or (catalog.version is not None and snapshot_version(path) <= catalog.version):
+            return True
+        try:
+            catalog.load_snapshot(CatalogSnapshot(path))
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Could not map catalog snapshot {path}: {str(e)}")
+    return False
+
+def refreshed_catalog_version():
+    """Catalog version this worker serves, after mapping a newer snapshot if a check is due; None if unknown"""
+    if not catalog.loaded or time.monotonic() - _snapshot_check['checked_at'] >= CATALOG_SNAPSHOT_CHECK_INTERVAL:
+        try:
+            with db_connection(read_only=True) as conn:
+                if not conn:
+                    return None
+                cursor = conn.cursor()
+                refresh_catalog_snapshot(cursor)
+                cursor.close()
+        except (Error, OSError, ValueError) as e:
+            print(f"Catalog snapshot check failed: {str(e)}")
+            return None
+    return catalog.version
+
+def publish_catalog_snapshot(cursor):
+    """Write the committed catalog to a new snapshot file unless one as new exists, and map the newest file
+    
+    Publishers queue on a lock file. A burst of writes is published by
+    whichever worker gets the lock first after the last of them committed;
+    the others find its file already at their version and only map it.
+    """
+    with publish_lock(CATALOG_SNAPSHOT_DIR):
+        # The version and the rows are read in one transaction, so they match
+        version = read_catalog_version(cursor)
+        path = latest_snapshot_path(CATALOG_SNAPSHOT_DIR)
+        if path is None or snapshot_version(path) < version or not map_newest_snapshot():
+            projects, project_skills = read_catalog_rows(cursor)
+            write_snapshot(CATALOG_SNAPSHOT_DIR, version, projects, project_skills,
+                           similarity_weighted=SIMILAR_PROJECTS_WEIGHTED)
+    # Another worker may have published a later version in the meantime
+    if not map_newest_snapshot():
+        raise ValueError('the published catalog snapshot cannot be mapped')
+
+def refresh_catalog_snapshot(cursor):
+    """Keep this worker's catalog at the database's catalog version
+    
+    Maps the newest snapshot file when there is a newer one. If the catalog
+    version stays ahead of every file for CATALOG_SNAPSHOT_MAX_DELAY seconds
+    (the writer's publish failed or it died), or nothing is loaded yet, the
+    worker publishes the snapshot itself, and if that fails too it loads the
+    catalog from the database.
+    """
+    now = time.monotonic()
+    if catalog.loaded and now - _snapshot_check['checked_at'] < CATALOG_SNAPSHOT_CHECK_INTERVAL:
+        return
+    
+    with _catalog_lock:
+        if catalog.loaded and now - _snapshot_check['checked_at'] < CATALOG_SNAPSHOT_CHECK_INTERVAL:
+            return
+        _snapshot_check['checked_at'] = now
+        
+        map_newest_snapshot()
+        version = read_catalog_version(cursor)
+        if catalog.loaded and catalog.version is not None and catalog.version >= version:
+            _snapshot_check['behind_since'] = None
+            return
+        
+        if _snapshot_check['behind_since'] is None:
+            _snapshot_check['behind_since'] = now
+        # Files left behind by an older deployment may miss later writes
+        if catalog.loaded and now - _snapshot_check['behind_since'] < CATALOG_SNAPSHOT_MAX_DELAY:
+            return
+        
+        try:
+            publish_catalog_snapshot(cursor)
+        except (Error, OSError, ValueError) as e:
+            print(f"Catalog snapshot publish failed, loading the catalog from the database: {str(e)}")
+            catalog.load(*read_catalog_rows(cursor), version=version)
+        _snapshot_check['behind_since'] = None
+
+# ==================== REQUEST COALESCING ====================
+#
+# Concurrent identical requests (a class logging in together, a cold cache
+# right after a catalog write) share one in-flight computation per worker
+# process instead of each repeating the full catalog scan.
+
+REQUEST_COALESCING = os.getenv('REQUEST_COALESCING', 'True').lower() == 'true'
+
+response_flights = SingleFlight(REQUEST_COALESCING)
+recommendation_flights = SingleFlight(REQUEST_COALESCING)
+
+# ==================== RESPONSE CACHE ====================
+#
+# Catalog endpoints are cached per worker. With the change feed on, entries
+# are tagged with a local generation that the feed bumps (see CHANGE FEED);
+# without it, with the catalog version from the CATALOG_VERSION table, which
+# writes bump in their own transaction.
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Seconds a worker may reuse the last version it read (0 = check on every request)
+CATALOG_VERSION_CHECK_INTERVAL = float(os.getenv('CATALOG_VERSION_CHECK_INTERVAL', 0))
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+_catalog_version = {'value': None, 'checked_at': 0.0}
+
+def bump_catalog_version(cursor):
+    """Invalidate cached catalog responses in every worker; call inside the writing transaction"""
+    cursor.execute("""
+        UPDATE CATALOG_VERSION SET version = version + 1 WHERE id = 1
+    """)
+
+def current_catalog_version(cursor=None):
+    """Latest catalog version, or None if it cannot be read (caching is then skipped)
+    
+    Reads through `cursor` if given, else on a connection of its own.
+    """
+    now = time.monotonic()
+    if (_catalog_version['value'] is not None
+            and now - _catalog_version['checked_at'] < CATALOG_VERSION_CHECK_INTERVAL):
+        return _catalog_version['value']
+    
+    query = """
+        SELECT version FROM CATALOG_VERSION WHERE id = 1
+    """
+    try:
+        if cursor is not None:
+            cursor.execute(query)
+            row = cursor.fetchone()
+        else:
+            with db_connection(read_only=True) as conn:
+                if not conn:
+                    return None
+                cursor = conn.cursor()
+                cursor.execute(query)
+                row = cursor.fetchone()
+                cursor.close()
+    except Error as e:
+        print(f"Catalog version check failed: {str(e)}")
+        return None
+    
+    if row is None:
+        return None
+    _catalog_version['value'] = row[0]
+    _catalog_version['checked_at'] = now
+    return row[0]
+
+def render_cache_entry(view, args, kwargs, version):
+    """Run the view; (CacheEntry, None) for a cacheable 200 response, else (None, response)"""
+    response = app.make_response(view(*args, **kwargs))
+    if response.status_code != 200 or response.is_streamed:
+        return None, response
+    body = response.get_data()
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name not in ('Content-Length', 'ETag')
+    }
+    return CacheEntry(body, make_etag(body), headers, version), None
+
+def cached_response(view):
+    """Serve a GET route from the response cache, with a strong ETag and 304 support"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Streamed bodies are never cached (and may be asked for by Accept header alone)
+        if stream_format():
+            return view(*args, **kwargs)
+        
+        version = response_cache_version()
+        if version is None:
+            return view(*args, **kwargs)
+        
+        # Same route and same args in any order share an entry
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = response_cache.get(key, version)
+        
+        if entry is None:
+            # Concurrent misses on the same key render the view once
+            (entry, response), shared = response_flights.do(
+                (key, version), lambda: render_cache_entry(view, args, kwargs, version)
+            )
+            if entry is None:
+                # Not cacheable (error or streamed): every request runs the view itself
+                return view(*args, **kwargs) if shared else response
+            # A render that mapped a newer snapshot must not be stored under the older tag
+            if not shared and not g.get('stale_reads') and not catalog_moved(version):
+                response_cache.put(key, entry)
+        response = Response(entry.body, status=200, headers=entry.headers)
+        
+        response.set_etag(entry.etag)
+        return response.make_conditional(request)
+    return wrapper
+
+# ==================== STUDENT PROFILE CACHE ====================
+#
+# login, get_student and get_recommendations all need the same student row
+# and skills. Profiles are cached by student_id and written through by every
+# route that changes them, after its transaction commits.
+
+profile_cache = create_profile_cache(
+    os.getenv('PROFILE_CACHE_BACKEND', 'local'),
+    url=os.getenv('PROFILE_CACHE_URL'),
+    ttl=int(os.getenv('PROFILE_CACHE_TTL', 300)),
+    max_entries=int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', 10000))
+)
+
+def load_student_profile(cursor, student_id):
+    """Read a student's profile with skills from the database, or None if there is no such student"""
+    cursor.execute("""
+        SELECT student_id, name, email, created_at, updated_at
+        FROM STUDENTS
+        WHERE student_id = %s
+    """, (student_id,))
+    
+    student_row = cursor.fetchone()
+    if not student_row:
+        return None
+    
+    profile = {
+        'student_id': student_row[0],
+        'name': student_row[1],
+        'email': student_row[2],
+        'created_at': student_row[3].isoformat() if student_row[3] else None,
+        'updated_at': student_row[4].isoformat() if student_row[4] else None
+    }
+    
+    cursor.execute("""
+        SELECT s.skill_id, s.skill_name, ss.proficiency_level, ss.years_of_experience
+        FROM STUDENT_SKILLS ss
+        JOIN SKILLS s ON ss.skill_id = s.skill_id
+        WHERE ss.student_id = %s
+    """, (student_id,))
+    
+    skills = []
+    for row in cursor.fetchall():
+        skills.append({
+            'skill_id': row[0],
+            'skill_name': row[1],
+            'proficiency_level': row[2],
+            'years_of_experience': row[3]
+        })
+    
+    profile['skills'] = skills
+    return profile
+
+def get_student_profile(cursor, student_id):
+    """Student profile from the cache, loading and caching it on a miss"""
+    sync_changes(cursor)
+    profile = profile_cache.get(student_id)
+    if profile is None:
+        # The feed head read first is at most the sequence the profile is read
+        # at, so the entry never replaces the write-through of a later write
+        version = read_feed_head(cursor) if CHANGE_FEED else None
+        profile = load_student_profile(cursor, student_id)
+        if profile is not None and not g.get('stale_reads'):
+            profile_cache.set(student_id, profile, version)
+    return profile
+
+# ==================== CHANGE FEED ====================
+#
+# Project and student writes append the ids they changed to CHANGE_FEED in
+# their own transaction (record_changes). Before reading a cache, each worker
+# polls the feed head and drops exactly what other workers changed: single
+# projects from the catalog index and the project listings, single student
+# profiles, or everything after a whole-catalog change.
+
+CHANGE_FEED = os.getenv('CHANGE_FEED', 'True').lower() == 'true'
+# Seconds a worker may go without polling the feed (0 = once per request that reads a cache)
+CHANGE_FEED_POLL_INTERVAL = float(os.getenv('CHANGE_FEED_POLL_INTERVAL', 0))
+# Sequences kept in CHANGE_FEED; a worker further behind invalidates everything
+CHANGE_FEED_RETENTION = int(os.getenv('CHANGE_FEED_RETENTION', 10000))
+# Ids per write above which it is recorded as a change of the whole scope
+CHANGE_FEED_MAX_IDS = int(os.getenv('CHANGE_FEED_MAX_IDS', 1000))
+
+change_feed = ChangeFeed(CHANGE_FEED_RETENTION, CHANGE_FEED_MAX_IDS)
+_change_poll = {'checked_at': 0.0}
+_change_poll_lock = threading.Lock()
+
+# With the feed, cached responses are tagged with a local generation per
+# group of routes, bumped only by the changes that affect the group
+response_generations = {'projects': 0, 'skills': 0}
+_generations_lock = threading.Lock()
+
+def record_changes(cursor, scope, entity_ids=None):
+    """Append a change ('project', 'student' or 'catalog') to the feed and return its sequence
+    
+    Call last in the writing transaction: the feed head stays locked until
+    commit, which is what keeps sequences in commit order. Project and catalog
+    changes also bump CATALOG_VERSION. entity_ids=None changes the whole scope.
+    """
+    if has_app_context():
+        g.wrote = True
+    if scope != 'student':
+        bump_catalog_version(cursor)
+    if not CHANGE_FEED:
+        return None
+    
+    cursor.execute("""
+        UPDATE CHANGE_FEED_HEAD SET seq = seq + 1 WHERE id = 1
+    """)
+    cursor.execute("""
+        SELECT seq FROM CHANGE_FEED_HEAD WHERE id = 1
+    """)
+    seq = cursor.fetchone()[0]
+    
+    if entity_ids is not None:
+        entity_ids = list(dict.fromkeys(entity_ids))
+    if entity_ids is None or len(entity_ids) > CHANGE_FEED_MAX_IDS:
+        entity_ids = [None]
+    cursor.executemany("""
+        INSERT INTO CHANGE_FEED (seq, scope, entity_id)
+        VALUES (%s, %s, %s)
+    """, [(seq, scope, entity_id) for entity_id in entity_ids])
+    
+    if seq > CHANGE_FEED_RETENTION:
+        cursor.execute("""
+            DELETE FROM CHANGE_FEED WHERE seq <= %s
+        """, (seq - CHANGE_FEED_RETENTION,))
+    return seq
+
+def changes_committed(seq, scope):
+    """After a write commits: drop this worker's cached responses it affects and skip its feed entry"""
+    # With replicas the change is applied again once the replica a worker
+    # reads from has it, which drops anything cached from a lagging replica
+    if seq is not None and not DB_CONFIG['replicas']:
+        change_feed.skip(seq)
+    invalidate_responses(scope)
+
+def invalidate_responses(scope):
+    """Move the cached routes a change of `scope` affects to a new generation"""
+    groups = {'project': ('projects',), 'catalog': ('projects', 'skills')}.get(scope, ())
+    with _generations_lock:
+        for group in groups:
+            response_generations[group] += 1
+
+def response_cache_version():
+    """Tag for cached responses of the current route, or None if it cannot be determined (caching is then skipped)"""
+    if not CHANGE_FEED:
+        version = current_catalog_version()
+    elif not sync_changes():
+        return None
+    else:
+        version = response_generations['skills' if request.path.startswith('/api/skills') else 'projects']
+    if version is not None and CATALOG_SNAPSHOT_DIR:
+        # A worker can learn of a change before it maps the snapshot holding
+        # it, so entries also carry the catalog version they are rendered from
+        catalog_version = refreshed_catalog_version()
+        return None if catalog_version is None else (version, catalog_version)
+    return version
+
+def catalog_moved(version):
+    """True if this worker switched catalogs since the cache tag `version` was taken"""
+    return bool(CATALOG_SNAPSHOT_DIR) and version[1] != catalog.version
+
+def sync_changes(cursor=None):
+    """Apply the feed entries other workers wrote since the last poll; False if the feed cannot be read"""
+    if not CHANGE_FEED or (has_app_context() and g.get('changes_synced')):
+        return True
+    if (change_feed.seq is not None
+            and time.monotonic() - _change_poll['checked_at'] < CHANGE_FEED_POLL_INTERVAL):
+        return True
+    
+    with _change_poll_lock:
+        now = time.monotonic()
+        try:
+            if cursor is not None:
+                poll_changes(cursor)
+            else:
+                with db_connection(read_only=True) as conn:
+                    if not conn:
+                        return False
+                    cursor = conn.cursor()
+                    poll_changes(cursor)
+                    cursor.close()
+        except Error as e:
+            print(f"Change feed poll failed: {str(e)}")
+            return False
+        _change_poll['checked_at'] = now
+    
+    if has_app_context():
+        g.changes_synced = True
+    return True
+
+def read_feed_head(cursor):
+    """Last sequence handed out by record_changes"""
+    cursor.execute("""
+        SELECT seq FROM CHANGE_FEED_HEAD WHERE id = 1
+    """)
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def poll_changes(cursor):
+    """Read the feed head and the entries after this worker's sequence, and apply them"""
+    head = read_feed_head(cursor)
+    if change_feed.seq is not None and head < change_feed.seq and has_app_context():
+        # A replica behind what this worker has applied: serve its data, but do not cache it
+        g.stale_reads = True
+    
+    rows = []
+    if change_feed.behind(head) and head - change_feed.seq <= CHANGE_FEED_RETENTION:
+        cursor.execute("""
+            SELECT seq, scope, entity_id
+            FROM CHANGE_FEED
+            WHERE seq > %s AND seq <= %s
+            LIMIT %s
+        """, (change_feed.seq, head, CHANGE_FEED_MAX_IDS + 1))
+        rows = cursor.fetchall()
+    
+    changes = change_feed.advance(head, rows)
+    if changes:
+        apply_changes(cursor, changes)
+
+def apply_changes(cursor, changes):
+    """Drop the changed projects, students or whole catalog from this worker's caches"""
+    whole = {scope for scope, entity_id in changes if entity_id is None}
+    project_ids = {entity_id for scope, entity_id in changes if scope == 'project' and entity_id is not None}
+    student_ids = {entity_id for scope, entity_id in changes if scope == 'student' and entity_id is not None}
+    
+    if whole & {'project', 'catalog'}:
+        invalidate_responses('catalog')
+        if CATALOG_SNAPSHOT_DIR:
+            _snapshot_check['checked_at'] = 0.0
+        elif catalog.loaded:
+            load_catalog(cursor)
+    elif project_ids:
+        invalidate_responses('project')
+        if CATALOG_SNAPSHOT_DIR:
+            # The writer publishes a new snapshot; look for it on the next read
+            _snapshot_check['checked_at'] = 0.0
+        elif catalog.loaded:
+            projects, project_skills = read_catalog_rows(cursor, project_ids)
+            catalog.add_projects((project, project_skills[project['project_id']]) for project in projects)
+            note_catalog_version(cursor)
+    
+    # A shared profile cache was already written through by the writer
+    if not profile_cache.shared:
+        if 'student' in whole:
+            profile_cache.clear()
+        for student_id in student_ids:
+            profile_cache.delete(student_id, change_feed.seq)
+
+# ==================== SKILL WRITES ====================
+#
+# Skill lists are written with one batched statement each. Updates compare
+# the submitted list with the stored rows and only delete or upsert the
+# skills that differ, so editing one skill costs the same few statements
+# however many skills the profile holds.
+
+def insert_student_skills(cursor, student_id, skills):
+    """Insert the skill rows of a new student in one batch"""
+    rows = [
+        (student_id, skill.get('skill_id'), skill.get('proficiency_level', 'Beginner'), skill.get('years_of_experience', 0))
+        for skill in skills or []
+    ]
+    if rows:
+        cursor.executemany("""
+            INSERT INTO STUDENT_SKILLS (student_id, skill_id, proficiency_level, years_of_experience)
+            VALUES (%s, %s, %s, %s)
+        """, rows)
+
+def insert_project_skills(cursor, project_id, skills):
+    """Insert the skill requirement rows of a new project in one batch"""
+    rows = [
+        (project_id, skill.get('skill_id'), skill.get('required_proficiency_level', 'Beginner'), skill.get('is_mandatory', 'Y'))
+        for skill in skills or []
+    ]
+    if rows:
+        cursor.executemany("""
+            INSERT INTO PROJECT_SKILLS (project_id, skill_id, required_proficiency_level, is_mandatory)
+            VALUES (%s, %s, %s, %s)
+        """, rows)
+
+def sync_student_skills(cursor, student_id, skills):
+    """Make a student's STUDENT_SKILLS rows match `skills`, writing only the difference
+    
+    Returns True if any row was deleted, inserted or changed.
+    """
+    wanted = {
+        skill.get('skill_id'): (skill.get('proficiency_level', 'Beginner'), skill.get('years_of_experience', 0))
+        for skill in skills or []
+    }
+    
+    cursor.execute("""
+        SELECT skill_id, proficiency_level, years_of_experience
+        FROM STUDENT_SKILLS
+        WHERE student_id = %s
+        FOR UPDATE
+    """, (student_id,))
+    stored = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    
+    removed = [skill_id for skill_id in stored if skill_id not in wanted]
+    changed = [
+        (student_id, skill_id, proficiency_level, years_of_experience)
+        for skill_id, (proficiency_level, years_of_experience) in wanted.items()
+        if stored.get(skill_id) != (proficiency_level, years_of_experience)
+    ]
+    
+    for i in range(0, len(removed), SKILL_LOADER_BATCH_SIZE):
+        batch = removed[i:i + SKILL_LOADER_BATCH_SIZE]
+        cursor.execute(f"""
+            DELETE FROM STUDENT_SKILLS
+            WHERE student_id = %s AND skill_id IN ({id_placeholders(batch)})
+        """, (student_id, *batch))
+    
+    if changed:
+        cursor.executemany("""
+            INSERT INTO STUDENT_SKILLS (student_id, skill_id, proficiency_level, years_of_experience)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                proficiency_level = VALUES(proficiency_level),
+                years_of_experience = VALUES(years_of_experience)
+        """, changed)
+    
+    return bool(removed or changed)
+
+# ==================== AUTHENTICATION ROUTES ====================
+
+@app.route('/api/auth/signup', methods=['POST'])
+def signup():
+    """Sign up a new user with Full Name, email, and password"""
+    try:
+        data = request.json
+        name = data.get('name', '').strip()
+        email = data.get('email', '').strip().lower()
+        password = data.get('password', '').strip()
+        
+        # Validation
+        if not name or not email or not password:
+            return jsonify({'error': 'Full Name, email, and password are required'}), 400
+        
+        if len(password) < 6:
+            return jsonify({'error': 'Password must be at least 6 characters long'}), 400
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Check if email already exists
+        cursor.execute("""
+            SELECT student_id FROM STUDENTS WHERE email = %s
+        """, (email,))
+        
+        if cursor.fetchone():
+            cursor.close()
+            conn.close()
+            return jsonify({'error': 'Email already registered. Please login instead.'}), 400
+        
+        # Insert student (store password as plain text)
+        cursor.execute("""
+            INSERT INTO STUDENTS (name, email, password_hash)
+            VALUES (%s, %s, %s)
+        """, (name, email, password))
+        
+        student_id = cursor.lastrowid
+        profile = load_student_profile(cursor, student_id)
+        
+        seq = record_changes(cursor, 'student', [student_id])
+        conn.commit()
+        changes_committed(seq, 'student')
+        cursor.close()
+        conn.close()
+        
+        profile_cache.set(student_id, profile, seq)
+        
+        return jsonify({
+            'message': 'Account created successfully',
+            'student_id': student_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/auth/login', methods=['POST'])
+def login():
+    """Login with email and password"""
+    try:
+        data = request.json
+        email = data.get('email', '').strip().lower()
+        password = data.get('password', '').strip()
+        
+        # Validation
+        if not email or not password:
+            return jsonify({'error': 'Email and password are required'}), 400
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Get student by email
+        cursor.execute("""
+            SELECT student_id, name, email, password_hash
+            FROM STUDENTS
+            WHERE email = %s
+        """, (email,))
+        
+        student_row = cursor.fetchone()
+        if not student_row:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': 'Invalid email or password'}), 401
+        
+        student_id, name, db_email, stored_password = student_row
+        
+        # Verify password (plain text comparison)
+        if not stored_password or stored_password != password:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': 'Invalid email or password'}), 401
+        
+        # Get student skills
+        profile = get_student_profile(cursor, student_id)
+        skills = profile['skills'] if profile else []
+        
+        student = {
+            'student_id': student_id,
+            'name': name,
+            'email': db_email,
+            'skills': skills
+        }
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'message': 'Login successful',
+            'student': student
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== STUDENT ROUTES ====================
+
+@app.route('/api/students', methods=['POST'])
+def create_student():
+    """Create a new student profile"""
+    try:
+        data = request.json
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Insert student
+        cursor.execute("""
+            INSERT INTO STUDENTS (name, email)
+            VALUES (%s, %s)
+        """, (data.get('name'), data.get('email')))
+        
+        student_id = cursor.lastrowid
+        
+        # Insert student skills
+        insert_student_skills(cursor, student_id, data.get('skills'))
+        
+        # Keep the stored recommendation scores in step with the new skills
+        if MATERIALIZED_RECOMMENDATIONS:
+            materialize_student(cursor, student_id, {
+                skill.get('skill_id'): {'proficiency_level': skill.get('proficiency_level', 'Beginner')}
+                for skill in data.get('skills') or []
+            })
+        
+        # Re-read the profile inside the transaction for the write-through cache
+        profile = load_student_profile(cursor, student_id)
+        
+        seq = record_changes(cursor, 'student', [student_id])
+        conn.commit()
+        changes_committed(seq, 'student')
+        cursor.close()
+        conn.close()
+        
+        profile_cache.set(student_id, profile, seq)
+        
+        return jsonify({
+            'message': 'Student created successfully',
+            'student_id': student_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/students/<int:student_id>', methods=['GET'])
+def get_student(student_id):
+    """Get student profile with skills"""
+    try:
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Get student info and skills
+        student = get_student_profile(cursor, student_id)
+        
+        cursor.close()
+        conn.close()
+        
+        if not student:
+            return jsonify({'error': 'Student not found'}), 404
+        
+        return jsonify(student), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/students/<int:student_id>', methods=['PUT'])
+def update_student(student_id):
+    """Update student profile and skills"""
+    try:
+        data = request.json
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Update student info
+        cursor.execute("""
+            UPDATE STUDENTS
+            SET name = %s, email = %s
+            WHERE student_id = %s
+        """, (data.get('name'), data.get('email'), student_id))
+        
+        # Replace the skill list, touching only the rows that differ
+        skills_changed = sync_student_skills(cursor, student_id, data.get('skills'))
+        
+        # Keep the stored recommendation scores in step with the new skills
+        if MATERIALIZED_RECOMMENDATIONS and skills_changed:
+            materialize_student(cursor, student_id, {
+                skill.get('skill_id'): {'proficiency_level': skill.get('proficiency_level', 'Beginner')}
+                for skill in data.get('skills') or []
+            })
+        
+        # Re-read the profile inside the transaction for the write-through cache
+        profile = load_student_profile(cursor, student_id)
+        
+        seq = record_changes(cursor, 'student', [student_id])
+        conn.commit()
+        changes_committed(seq, 'student')
+        cursor.close()
+        conn.close()
+        
+        if profile is not None:
+            profile_cache.set(student_id, profile, seq)
+        else:
+            profile_cache.delete(student_id, seq)
+        
+        return jsonify({'message': 'Student updated successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== STREAMED RESPONSES ====================
+#
+# ?stream=true streams a JSON array and ?format=ndjson (or an
+# application/x-ndjson Accept header) streams one JSON object per line.
+# Streamed responses carry the whole remaining result instead of one page
+# (`limit` is ignored, the `after`/`cursor` key still applies) and are built
+# STREAM_BATCH_SIZE rows at a time, so memory per request stays flat and the
+# first rows go out before the last ones are read.
+
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+
+def stream_format():
+    """Requested streaming format: 'ndjson', 'json' (a streamed array) or None for a normal response"""
+    if request.args.get('format') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        return 'ndjson'
+    if request.args.get('stream', '').lower() == 'true':
+        return 'json'
+    return None
+
+def stream_response(items, fmt):
+    """Response serializing items one at a time, as NDJSON lines or as one JSON array
+    
+    The body is produced after the request context is gone, so items must not
+    touch `request` or `g`; release connections with response.call_on_close.
+    """
+    def body():
+        try:
+            if fmt == 'ndjson':
+                for item in items:
+                    yield json.dumps(item) + '\n'
+                return
+            yield '['
+            for i, item in enumerate(items):
+                yield (',' if i else '') + json.dumps(item)
+            yield ']\n'
+        except Exception as e:
+            # Headers are already sent; a truncated body is all the client can get
+            print(f"Streaming error: {str(e)}")
+    
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+    return Response(body(), mimetype=mimetype)
+
+def stream_projects(conn, skills_conn, difficulty, category, after):
+    """Yield every listed project with skills, reading rows through an unbuffered cursor
+    
+    The unbuffered cursor keeps `conn` busy until its result is read, so skills
+    are fetched on `skills_conn`.
+    """
+    query, params = project_list_query(difficulty, category, after)
+    cursor = conn.cursor(buffered=False)
+    cursor.execute(query, tuple(params))
+    skills_cursor = skills_conn.cursor()
+    
+    while True:
+        rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+        if not rows:
+            break
+        project_skills = fetch_project_skills(skills_cursor, [row[0] for row in rows])
+        for row in rows:
+            project = project_from_row(row)
+            project['skills'] = project_skills[project['project_id']]
+            yield project
+    
+    skills_cursor.close()
+    cursor.close()
+
+def stream_search_results(conn, matches):
+    """Yield search hits with skills, best match first, reading rows in batches
+    
+    `matches` is resolved against the catalog before the response starts, so
+    the body only reads project rows.
+    """
+    cursor = conn.cursor()
+    matches = iter(matches)
+    try:
+        while True:
+            batch = list(itertools.islice(matches, STREAM_BATCH_SIZE))
+            if not batch:
+                break
+            projects = search_result_rows(cursor, batch)
+            project_skills = fetch_project_skills(cursor, [project['project_id'] for project in projects])
+            for project in projects:
+                project['skills'] = project_skills[project['project_id']]
+                yield project
+    finally:
+        cursor.close()
+
+def stream_recommendations(matrix, scores, catalog_projects, requirements, after):
+    """Yield a student's recommendations for the whole catalog from their scores, best match first"""
+    rows = select_top(scores, matrix.project_ids, None, after)
+    for start in range(0, len(rows), STREAM_BATCH_SIZE):
+        batch = rows[start:start + STREAM_BATCH_SIZE]
+        page = zip(scores[batch].tolist(), matrix.project_ids[batch].tolist())
+        yield from recommendation_items(page, catalog_projects, requirements)
+
+# ==================== PROJECT ROUTES ====================
+
+@app.route('/api/projects', methods=['GET'])
+@cached_response
+def get_projects():
+    """Get projects with optional filters, newest first, one page at a time"""
+    try:
+        difficulty = request.args.get('difficulty')
+        category = request.args.get('category')
+        search = request.args.get('search', '')
+        after_arg = request.args.get('after')
+        
+        try:
+            limit = parse_limit(PROJECTS_MAX_LIMIT, default=PROJECTS_MAX_LIMIT)
+            # Search results are ordered by relevance, plain listings by recency
+            after_types = (float, int) if search else (datetime.fromisoformat, int)
+            after = decode_cursor(after_arg, *after_types) if after_arg else None
+        except ValueError:
+            return jsonify({'error': 'Invalid limit or cursor'}), 400
+        
+        fmt = stream_format()
+        if fmt:
+            # Listings stream through an unbuffered cursor, so skills need a second connection
+            conns = [get_db_connection(track=False, read_only=True) for _ in range(1 if search else 2)]
+            if not all(conns):
+                for conn in conns:
+                    if conn:
+                        conn.close()
+                return jsonify({'error': 'Database connection failed'}), 500
+            
+            try:
+                if search:
+                    cursor = conns[0].cursor()
+                    matches = search_matches(get_catalog(cursor), search, difficulty, category, after)
+                    cursor.close()
+                    items = stream_search_results(conns[0], matches)
+                else:
+                    items = stream_projects(conns[0], conns[1], difficulty, category, after)
+            except Exception:
+                for conn in conns:
+                    conn.close()
+                raise
+            response = stream_response(items, fmt)
+            for conn in conns:
+                response.call_on_close(conn.close)
+            return response, 200
+        
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        if search:
+            projects, next_cursor = search_projects(cursor, search, difficulty, category, limit, after)
+        else:
+            projects, next_cursor = list_projects(cursor, difficulty, category, limit, after)
+        
+        # Get the skills of all listed projects in one batch
+        project_skills = fetch_project_skills(cursor, [project['project_id'] for project in projects])
+        for project in projects:
+            project['skills'] = project_skills[project['project_id']]
+        
+        cursor.close()
+        conn.close()
+        
+        # Every listing is one page, PROJECTS_MAX_LIMIT projects at most without a limit
+        return jsonify({'projects': projects, 'next_cursor': next_cursor}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def project_list_query(difficulty, category, after):
+    """Query and params of the filtered project listing, newest first, continuing after an optional cursor key"""
+    # Build query with filters
+    query = """
+        SELECT DISTINCT p.project_id, p.title, p.description, 
+               p.difficulty_level, p.category, p.created_at
+        FROM PROJECTS p
+        WHERE 1=1
+    """
+    params = []
+    
+    # Text columns use a case-insensitive collation (database/migrations/001),
+    # so plain comparisons match regardless of case and can use the indexes
+    if difficulty:
+        query += " AND p.difficulty_level = %s"
+        params.append(difficulty)
+    
+    if category:
+        query += " AND p.category = %s"
+        params.append(category)
+    
+    # Keyset pagination: continue strictly after the last row of the previous page
+    if after:
+        query += " AND (p.created_at < %s OR (p.created_at = %s AND p.project_id < %s))"
+        params.extend([after[0], after[0], after[1]])
+    
+    query += " ORDER BY p.created_at DESC, p.project_id DESC"
+    return query, params
+
+def project_from_row(row):
+    """Project dict from a (project_id, title, description, difficulty_level, category, created_at) row"""
+    return {
+        'project_id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'difficulty_level': row[3],
+        'category': row[4],
+        'created_at': row[5].isoformat() if row[5] else None
+    }
+
+def list_projects(cursor, difficulty, category, limit, after):
+    """One page of projects, newest first, using keyset pagination on (created_at, project_id)"""
+    query, params = project_list_query(difficulty, category, after)
+    
+    # Fetch one extra row to know whether another page follows
+    query += " LIMIT %s"
+    params.append(limit + 1)
+    
+    cursor.execute(query, tuple(params))
+    projects = [project_from_row(row) for row in cursor.fetchall()]
+    
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        next_cursor = encode_cursor(projects[-1]['created_at'], projects[-1]['project_id'])
+    
+    return projects, next_cursor
+
+def search_matches(index, search, difficulty, category, after, limit=None):
+    """(relevance, project_id) of the best `limit` search hits after the cursor passing the filters, best first"""
+    catalog_projects = index.snapshot()[0]
+    
+    def accept(project_id):
+        project = catalog_projects.get(project_id)
+        if project is None:
+            return False
+        if difficulty and (project['difficulty_level'] or '').upper() != difficulty.upper():
+            return False
+        if category and (project['category'] or '').upper() != category.upper():
+            return False
+        return True
+    
+    return index.search.search(search, limit, after, accept)
+
+def search_result_rows(cursor, matches):
+    """Project dicts with relevance for a list of (relevance, project_id), read from the database"""
+    if not matches:
+        return []
+    
+    # Read the rows from the database so the response reflects stored data
+    placeholders = ', '.join(['%s'] * len(matches))
+    cursor.execute(f"""
+        SELECT project_id, title, description, difficulty_level, category, created_at
+        FROM PROJECTS
+        WHERE project_id IN ({placeholders})
+    """, tuple(project_id for _, project_id in matches))
+    
+    rows = {row[0]: row for row in cursor.fetchall()}
+    projects = []
+    for relevance, project_id in matches:
+        row = rows.get(project_id)
+        if row is None:
+            continue
+        project = project_from_row(row)
+        project['relevance'] = relevance
+        projects.append(project)
+    
+    return projects
+
+def search_projects(cursor, search, difficulty, category, limit, after):
+    """One page of full-text search results, best match first, paged on (relevance, project_id)"""
+    index = get_catalog(cursor)
+    matches = search_matches(index, search, difficulty, category, after, limit + 1)
+    
+    next_cursor = None
+    if len(matches) > limit:
+        matches = matches[:limit]
+        next_cursor = encode_cursor(*matches[-1])
+    
+    return search_result_rows(cursor, matches), next_cursor
+
+@app.route('/api/projects/<int:project_id>', methods=['GET'])
+def get_project(project_id):
+    """Get project details by ID"""
+    try:
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT project_id, title, description, difficulty_level, 
+                   category, created_at, created_by
+            FROM PROJECTS
+            WHERE project_id = %s
+        """, (project_id,))
+        
+        row = cursor.fetchone()
+        if not row:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': 'Project not found'}), 404
+        
+        project = {
+            'project_id': row[0],
+            'title': row[1],
+            'description': row[2],
+            'difficulty_level': row[3],
+            'category': row[4],
+            'created_at': row[5].isoformat() if row[5] else None,
+            'created_by': row[6]
+        }
+        
+        # Get project skills
+        project['skills'] = fetch_project_skills(cursor, [project_id], with_type=True)[project_id]
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(project), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/projects/<int:project_id>/similar', methods=['GET'])
+@cached_response
+def get_similar_projects(project_id):
+    """Projects whose required skills overlap most with this project's, from the MinHash/LSH index"""
+    try:
+        try:
+            limit = parse_limit(SIMILAR_PROJECTS_MAX_LIMIT, default=10)
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+        
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        index = get_catalog(cursor)
+        cursor.close()
+        conn.close()
+        
+        catalog_projects, requirements = index.projects, index.requirements
+        if project_id not in catalog_projects:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        similar = []
+        for similarity, other_id in index.similar.similar(project_id, limit):
+            project = catalog_projects.get(other_id)
+            if project is None:
+                continue
+            similar.append({
+                'project_id': other_id,
+                'title': project['title'],
+                'description': project['description'],
+                'difficulty_level': project['difficulty_level'],
+                'category': project['category'],
+                'skills': requirements.get(other_id, []),
+                'similarity': similarity
+            })
+        
+        return jsonify({
+            'project_id': project_id,
+            'similar': similar
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/projects', methods=['POST'])
+def create_project():
+    """Create a new project"""
+    try:
+        data = request.json
+        title = data.get('title', '').strip()
+        
+        if not title:
+            return jsonify({'error': 'Project title is required'}), 400
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Check if project with same title already exists
+        cursor.execute("""
+            SELECT project_id FROM PROJECTS WHERE title = %s
+        """, (title,))
+        
+        existing_project = cursor.fetchone()
+        if existing_project:
+            cursor.close()
+            conn.close()
+            return jsonify({
+                'error': 'A project with this title already exists',
+                'project_id': existing_project[0]
+            }), 409
+        
+        # Insert project
+        cursor.execute("""
+            INSERT INTO PROJECTS (title, description, difficulty_level, category, created_by)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (
+            title,
+            data.get('description'),
+            data.get('difficulty_level', 'Beginner'),
+            data.get('category'),
+            data.get('created_by', 'Admin')
+        ))
+        
+        project_id = cursor.lastrowid
+        
+        # Insert project skills
+        insert_project_skills(cursor, project_id, data.get('skills'))
+        
+        # Read back the stored row for the catalog index before committing
+        cursor.execute("""
+            SELECT project_id, title, description, difficulty_level, category, created_at
+            FROM PROJECTS
+            WHERE project_id = %s
+        """, (project_id,))
+        row = cursor.fetchone()
+        project_skills = fetch_project_skills(cursor, [project_id])[project_id]
+        
+        # Score the new project for students who hold any of its skills
+        if MATERIALIZED_RECOMMENDATIONS:
+            materialize_projects(cursor, {project_id: project_skills})
+        
+        seq = record_changes(cursor, 'project', [project_id])
+        conn.commit()
+        changes_committed(seq, 'project')
+        
+        update_catalog(cursor, [({
+            'project_id': row[0],
+            'title': row[1],
+            'description': row[2],
+            'difficulty_level': row[3],
+            'category': row[4],
+            'created_at': row[5]
+        }, project_skills)])
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'message': 'Project created successfully',
+            'project_id': project_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== BULK IMPORT ====================
+#
+# POST /api/projects/import and POST /api/students/import take an NDJSON
+# body (one object per line, same fields as the single-row routes) and read
+# it as a stream. Natural keys (lowercased title / email) are checked against
+# one preloaded set instead of one lookup per row, and rows are written in
+# chunks of IMPORT_CHUNK_SIZE with multi-row INSERTs, one transaction per
+# chunk. Each chunk re-checks its keys with one locking read in its own
+# transaction, so rows created by other requests since the preload are
+# reported as duplicates. A failing chunk is rolled back on its own and
+# reported row by row.
+
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+
+def read_ndjson(stream):
+    """Yield (line_number, record, error) for every non-blank line of an NDJSON stream"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Each line must be a JSON object'
+            continue
+        yield line_number, record, None
+
+def import_ndjson(conn, cursor, known, prepare, find_existing, insert_chunk, id_field):
+    """Run a chunked import of the request body and return the per-line report
+    
+    known maps the natural key of every existing row to its id and is updated
+    as rows are created. prepare(record) returns (key, row) or raises
+    ValueError; find_existing(cursor, keys) returns {key: id} of the keys
+    already stored, locking them until commit; insert_chunk(cursor, rows)
+    writes the rows and returns ({key: id}, committed), where committed() runs
+    once the chunk commits.
+    """
+    results = []
+    lines = read_ndjson(request.stream)
+    while True:
+        chunk = list(itertools.islice(lines, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            return results
+        
+        pending = []
+        duplicates = []
+        for line_number, record, error in chunk:
+            result = {'line': line_number}
+            results.append(result)
+            if error is None:
+                try:
+                    key, row = prepare(record)
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                result.update(status='error', error=error)
+            elif key in known:
+                result['status'] = 'duplicate'
+                duplicates.append((result, key))
+            else:
+                known[key] = None
+                pending.append((result, key, row))
+        
+        if pending:
+            try:
+                # Other requests may have created some of the keys since they were preloaded
+                existing = find_existing(cursor, [key for _, key, _ in pending])
+                rows = [row for _, key, row in pending if key not in existing]
+                ids, committed = insert_chunk(cursor, rows) if rows else ({}, None)
+                conn.commit()
+            except Exception as e:
+                # Anything that fails mid-chunk must not leave part of it behind
+                conn.rollback()
+                for result, key, _ in pending:
+                    del known[key]
+                    result.update(status='error', error=str(e))
+            else:
+                if committed is not None:
+                    committed()
+                for result, key, _ in pending:
+                    if key in existing:
+                        known[key] = existing[key]
+                        result.update({'status': 'duplicate', id_field: existing[key]})
+                    else:
+                        known[key] = ids[key]
+                        result.update({'status': 'created', id_field: ids[key]})
+        
+        for result, key in duplicates:
+            result[id_field] = known.get(key)
+
+def import_summary(results):
+    """Response body of an import: counts per status plus the per-line results"""
+    counts = {'created': 0, 'duplicate': 0, 'error': 0}
+    for result in results:
+        counts[result['status']] += 1
+    return {
+        'created': counts['created'],
+        'duplicates': counts['duplicate'],
+        'errors': counts['error'],
+        'results': results
+    }
+
+def import_skill_list(record, skill_ids):
+    """Validated skill list of an import record, one entry per skill_id (the last one wins)"""
+    skills = record.get('skills') or []
+    if not isinstance(skills, list) or not all(isinstance(skill, dict) for skill in skills):
+        raise ValueError('skills must be a list of objects')
+    
+    unique = {}
+    for skill in skills:
+        if skill.get('skill_id') not in skill_ids:
+            raise ValueError(f"Unknown skill_id: {skill.get('skill_id')}")
+        unique[skill['skill_id']] = skill
+    return list(unique.values())
+
+def prepare_project_row(record, skill_ids):
+    """(lowercased title, row) for one project import record"""
+    title = str(record.get('title') or '').strip()
+    if not title:
+        raise ValueError('Project title is required')
+    
+    return title.lower(), {
+        'title': title,
+        'description': record.get('description'),
+        'difficulty_level': record.get('difficulty_level', 'Beginner'),
+        'category': record.get('category'),
+        'created_by': record.get('created_by', 'Admin'),
+        'skills': import_skill_list(record, skill_ids)
+    }
+
+def find_project_titles(cursor, keys):
+    """{lowercased title: project_id} of the titles already stored, locked until commit"""
+    cursor.execute(f"""
+        SELECT project_id, title
+        FROM PROJECTS
+        WHERE title IN ({id_placeholders(keys)})
+        FOR UPDATE
+    """, tuple(keys))
+    return {row[1].lower(): row[0] for row in cursor.fetchall()}
+
+def insert_project_rows(cursor, rows, imported):
+    """Write one chunk of projects with their skills; (project, skills) are appended to imported once it commits"""
+    cursor.executemany("""
+        INSERT INTO PROJECTS (title, description, difficulty_level, category, created_by)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [
+        (row['title'], row['description'], row['difficulty_level'], row['category'], row['created_by'])
+        for row in rows
+    ])
+    
+    # Auto-increment ids of a multi-row INSERT are not guaranteed to be
+    # consecutive, so map titles back to ids (and fetch the catalog fields)
+    titles = [row['title'] for row in rows]
+    cursor.execute(f"""
+        SELECT project_id, title, description, difficulty_level, category, created_at
+        FROM PROJECTS
+        WHERE title IN ({id_placeholders(titles)})
+    """, tuple(titles))
+    
+    projects = {}
+    for row in cursor.fetchall():
+        key = row[1].lower()
+        if key not in projects or row[0] > projects[key]['project_id']:
+            projects[key] = {
+                'project_id': row[0],
+                'title': row[1],
+                'description': row[2],
+                'difficulty_level': row[3],
+                'category': row[4],
+                'created_at': row[5]
+            }
+    
+    skill_rows = [
+        (projects[row['title'].lower()]['project_id'], skill['skill_id'],
+         skill.get('required_proficiency_level', 'Beginner'), skill.get('is_mandatory', 'Y'))
+        for row in rows
+        for skill in row['skills']
+    ]
+    if skill_rows:
+        cursor.executemany("""
+            INSERT INTO PROJECT_SKILLS (project_id, skill_id, required_proficiency_level, is_mandatory)
+            VALUES (%s, %s, %s, %s)
+        """, skill_rows)
+    
+    project_ids = [project['project_id'] for project in projects.values()]
+    project_skills = fetch_project_skills(cursor, project_ids)
+    
+    if MATERIALIZED_RECOMMENDATIONS:
+        materialize_projects(cursor, project_skills)
+    seq = record_changes(cursor, 'project', project_ids)
+    
+    def committed():
+        changes_committed(seq, 'project')
+        imported.extend((project, project_skills[project['project_id']]) for project in projects.values())
+    
+    return {key: project['project_id'] for key, project in projects.items()}, committed
+
+@app.route('/api/projects/import', methods=['POST'])
+def import_projects():
+    """Bulk create projects from an NDJSON body, one project per line"""
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Existing titles and valid skills, loaded once for the whole import
+        cursor.execute("""
+            SELECT project_id, title FROM PROJECTS
+        """)
+        known = {row[1].lower(): row[0] for row in cursor.fetchall() if row[1]}
+        
+        cursor.execute("""
+            SELECT skill_id FROM SKILLS
+        """)
+        skill_ids = {row[0] for row in cursor.fetchall()}
+        conn.commit()
+        
+        imported = []
+        results = import_ndjson(
+            conn, cursor, known,
+            lambda record: prepare_project_row(record, skill_ids),
+            find_project_titles,
+            lambda cursor, rows: insert_project_rows(cursor, rows, imported),
+            'project_id'
+        )
+        
+        # One catalog update for the whole import
+        if imported:
+            update_catalog(cursor, imported)
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(import_summary(results)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def prepare_student_row(record, skill_ids):
+    """(lowercased email, row) for one student import record"""
+    name = str(record.get('name') or '').strip()
+    email = str(record.get('email') or '').strip().lower()
+    password = str(record.get('password') or '').strip()
+    
+    if not name or not email:
+        raise ValueError('Full Name and email are required')
+    
+    if password and len(password) < 6:
+        raise ValueError('Password must be at least 6 characters long')
+    
+    return email, {
+        'name': name,
+        'email': email,
+        'password': password or None,
+        'skills': import_skill_list(record, skill_ids)
+    }
+
+def find_student_emails(cursor, keys):
+    """{lowercased email: student_id} of the emails already stored, locked until commit"""
+    cursor.execute(f"""
+        SELECT student_id, email
+        FROM STUDENTS
+        WHERE email IN ({id_placeholders(keys)})
+        FOR UPDATE
+    """, tuple(keys))
+    return {row[1].lower(): row[0] for row in cursor.fetchall()}
+
+def insert_student_rows(cursor, rows):
+    """Write one chunk of students with their skills"""
+    cursor.executemany("""
+        INSERT INTO STUDENTS (name, email, password_hash)
+        VALUES (%s, %s, %s)
+    """, [(row['name'], row['email'], row['password']) for row in rows])
+    
+    emails = [row['email'] for row in rows]
+    cursor.execute(f"""
+        SELECT student_id, email
+        FROM STUDENTS
+        WHERE email IN ({id_placeholders(emails)})
+    """, tuple(emails))
+    
+    ids = {}
+    for student_id, email in cursor.fetchall():
+        ids[email.lower()] = max(student_id, ids.get(email.lower(), 0))
+    
+    # New students have no RECOMMENDATION_STATUS row, so they are scored on first read
+    skill_rows = [
+        (ids[row['email']], skill['skill_id'],
+         skill.get('proficiency_level', 'Beginner'), skill.get('years_of_experience', 0))
+        for row in rows
+        for skill in row['skills']
+    ]
+    if skill_rows:
+        cursor.executemany("""
+            INSERT INTO STUDENT_SKILLS (student_id, skill_id, proficiency_level, years_of_experience)
+            VALUES (%s, %s, %s, %s)
+        """, skill_rows)
+    
+    seq = record_changes(cursor, 'student', ids.values())
+    return ids, lambda: changes_committed(seq, 'student')
+
+@app.route('/api/students/import', methods=['POST'])
+def import_students():
+    """Bulk create students from an NDJSON body, one student per line"""
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Existing emails and valid skills, loaded once for the whole import
+        cursor.execute("""
+            SELECT student_id, email FROM STUDENTS
+        """)
+        known = {row[1].lower(): row[0] for row in cursor.fetchall() if row[1]}
+        
+        cursor.execute("""
+            SELECT skill_id FROM SKILLS
+        """)
+        skill_ids = {row[0] for row in cursor.fetchall()}
+        conn.commit()
+        
+        results = import_ndjson(
+            conn, cursor, known,
+            lambda record: prepare_student_row(record, skill_ids),
+            find_student_emails,
+            insert_student_rows,
+            'student_id'
+        )
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(import_summary(results)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== SKILLS ROUTES ====================
+
+@app.route('/api/skills', methods=['GET'])
+@cached_response
+def get_skills():
+    """Get all available skills"""
+    try:
+        skill_type = request.args.get('type')
+        
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        if skill_type:
+            cursor.execute("""
+                SELECT skill_id, skill_name, skill_type, description
+                FROM SKILLS
+                WHERE skill_type = %s
+                ORDER BY skill_name
+            """, (skill_type,))
+        else:
+            cursor.execute("""
+                SELECT skill_id, skill_name, skill_type, description
+                FROM SKILLS
+                ORDER BY skill_type, skill_name
+            """)
+        
+        skills = []
+        for row in cursor.fetchall():
+            skills.append({
+                'skill_id': row[0],
+                'skill_name': row[1],
+                'skill_type': row[2],
+                'description': row[3]
+            })
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(skills), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== COLLABORATIVE RECOMMENDATIONS ====================
+#
+# mode=collaborative blends each project's content match score with the
+# scores the student's nearest neighbours by skill profile ("students like
+# you") get for it. Neighbours are computed offline into STUDENT_NEIGHBOURS
+# by compute_student_neighbours.py; students without any yet get plain
+# content scores.
+
+RECOMMENDATION_MODES = ('content', 'collaborative')
+RECOMMENDATION_MODE = os.getenv('RECOMMENDATION_MODE', 'content')
+COLLABORATIVE_WEIGHT = float(os.getenv('COLLABORATIVE_WEIGHT', 0.3))
+COLLABORATIVE_NEIGHBOURS = int(os.getenv('COLLABORATIVE_NEIGHBOURS', 20))
+# Bytes of score vectors kept for reuse; neighbours recur across requests
+COLLABORATIVE_SCORE_CACHE_BYTES = int(os.getenv('COLLABORATIVE_SCORE_CACHE_BYTES', 64 * 1024 * 1024))
+
+score_cache = ScoreCache(COLLABORATIVE_SCORE_CACHE_BYTES)
+
+def skill_profile_key(student_skills):
+    """Hashable key of a skill profile: students with equal keys get equal scores"""
+    return tuple(sorted((skill_id, skill['proficiency_level']) for skill_id, skill in student_skills.items()))
+
+def profile_scores(matrix, student_skills):
+    """Scores of every project for a skill profile, reused from score_cache when it was scored before"""
+    key = skill_profile_key(student_skills)
+    scores = score_cache.get(matrix, key)
+    if scores is None:
+        scores = matrix.score(student_skills)
+        score_cache.put(matrix, key, scores)
+    return scores
+
+def fetch_student_neighbours(cursor, student_id, limit):
+    """[(neighbour_id, similarity)] of a student, most similar first"""
+    cursor.execute("""
+        SELECT neighbour_id, similarity
+        FROM STUDENT_NEIGHBOURS
+        WHERE student_id = %s
+        ORDER BY similarity DESC, neighbour_id
+        LIMIT %s
+    """, (student_id, limit))
+    return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+def collaborative_scores(cursor, matrix, student_id, student_skills):
+    """Content scores of every project blended with the scores of the student's neighbours"""
+    scores = profile_scores(matrix, student_skills)
+    neighbours = fetch_student_neighbours(cursor, student_id, COLLABORATIVE_NEIGHBOURS)
+    if not neighbours:
+        return scores
+    
+    # One query for every neighbour's skills; neighbours who since lost all
+    # their skills score nothing anywhere and are left out
+    neighbour_skills = fetch_student_skills(cursor, [neighbour_id for neighbour_id, _ in neighbours])
+    neighbours = [(neighbour_id, similarity) for neighbour_id, similarity in neighbours
+                  if neighbour_skills[neighbour_id]]
+    return blend_scores(
+        scores,
+        [profile_scores(matrix, neighbour_skills[neighbour_id]) for neighbour_id, _ in neighbours],
+        [similarity for _, similarity in neighbours],
+        COLLABORATIVE_WEIGHT
+    )
+
+# ==================== RECOMMENDATIONS ROUTE ====================
+
+@app.route('/api/recommendations/<int:student_id>', methods=['GET'])
+def get_recommendations(student_id):
+    """Get personalized project recommendations for a student"""
+    try:
+        try:
+            limit = parse_limit(RECOMMENDATIONS_MAX_LIMIT)
+            cursor_arg = request.args.get('cursor')
+            after = decode_cursor(cursor_arg, float, int) if cursor_arg else None
+        except ValueError:
+            return jsonify({'error': 'Invalid limit or cursor'}), 400
+        
+        mode = request.args.get('mode', RECOMMENDATION_MODE)
+        if mode not in RECOMMENDATION_MODES:
+            return jsonify({'error': f"mode must be one of: {', '.join(RECOMMENDATION_MODES)}"}), 400
+        collaborative = mode == 'collaborative'
+        materialized = MATERIALIZED_RECOMMENDATIONS and not collaborative
+        
+        # Stored scores are read from a replica too; only a student's first
+        # materialized read writes, on its own primary connection
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # Get student skills
+        profile = get_student_profile(cursor, student_id)
+        student_skills = {}
+        for skill in (profile['skills'] if profile else []):
+            student_skills[skill['skill_id']] = {
+                'skill_name': skill['skill_name'],
+                'proficiency_level': skill['proficiency_level']
+            }
+        
+        if not student_skills:
+            cursor.close()
+            conn.close()
+            return jsonify({
+                'message': 'No skills found. Please add skills to your profile.',
+                'recommendations': []
+            }), 200
+        
+        catalog_projects, requirements, no_requirements, matrix = get_catalog(cursor).snapshot()
+        
+        # Streams score the whole catalog in memory and emit it batch by batch
+        fmt = stream_format()
+        if fmt:
+            if collaborative:
+                scores = collaborative_scores(cursor, matrix, student_id, student_skills)
+            else:
+                scores = matrix.score(student_skills)
+            cursor.close()
+            conn.close()
+            items = stream_recommendations(matrix, scores, catalog_projects, requirements, after)
+            return stream_response(items, fmt), 200
+        
+        def rank():
+            started = time.perf_counter()
+            if collaborative:
+                scores = collaborative_scores(cursor, matrix, student_id, student_skills)
+                rows = select_top(scores, matrix.project_ids, limit, after)
+                page = list(zip(scores[rows].tolist(), matrix.project_ids[rows].tolist()))
+            elif materialized:
+                page = read_materialized_page(cursor, student_id, student_skills,
+                                              catalog_projects, no_requirements, matrix, limit, after)
+            else:
+                page = score_page(matrix, student_skills, limit, after)
+            scoring_time.observe(time.perf_counter() - started,
+                                 'collaborative' if collaborative else 'materialized' if materialized else 'live')
+            return recommendation_items(page, catalog_projects, requirements)
+        
+        # Concurrent requests for the same page share one ranking: live scores
+        # depend only on the skill profile and the catalog snapshot, stored
+        # ones and collaborative ones are read per student
+        profile_key = skill_profile_key(student_skills)
+        owner = student_id if materialized or collaborative else None
+        projects, _ = recommendation_flights.do((owner, mode, profile_key, matrix, limit, after), rank)
+        
+        # A cursor is only handed out if the page was full
+        next_cursor = None
+        if limit is not None and len(projects) == limit:
+            next_cursor = encode_cursor(projects[-1]['match_score'], projects[-1]['project_id'])
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'student_id': student_id,
+            'mode': mode,
+            'recommendations': projects,
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recommendations/batch', methods=['POST'])
+def get_batch_recommendations():
+    """Get recommendations for a whole cohort of students in one call"""
+    try:
+        data = request.json or {}
+        student_ids = data.get('student_ids')
+        
+        # Validation
+        # bool is a subclass of int, but true/false are not student ids
+        if not isinstance(student_ids, list) or not all(
+            isinstance(x, int) and not isinstance(x, bool) for x in student_ids
+        ):
+            return jsonify({'error': 'student_ids must be a list of integers'}), 400
+        
+        if len(student_ids) > BATCH_MAX_STUDENTS:
+            return jsonify({'error': f'At most {BATCH_MAX_STUDENTS} students per batch'}), 400
+        
+        try:
+            limit = max(1, min(int(data.get('limit', RECOMMENDATIONS_MAX_LIMIT)), RECOMMENDATIONS_MAX_LIMIT))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid limit'}), 400
+        
+        stream = (request.args.get('format') == 'ndjson'
+                  or 'application/x-ndjson' in request.headers.get('Accept', ''))
+        
+        conn = get_db_connection(read_only=True)
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        cursor = conn.cursor()
+        
+        # One query per batch of students, one catalog snapshot for the whole cohort
+        student_skills = fetch_student_skills(cursor, student_ids)
+        catalog_projects, requirements, _, matrix = get_catalog(cursor).snapshot()
+        
+        cursor.close()
+        conn.close()
+        
+        pages = scoring_pool.score_many(
+            matrix,
+            [(student_id, skills) for student_id, skills in student_skills.items() if skills],
+            limit
+        )
+        
+        def results():
+            for student_id, skills in student_skills.items():
+                if not skills:
+                    yield {
+                        'student_id': student_id,
+                        'message': 'No skills found. Please add skills to your profile.',
+                        'recommendations': []
+                    }
+                    continue
+                
+                _, page = next(pages)
+                projects = recommendation_items(page, catalog_projects, requirements)
+                next_cursor = None
+                if len(projects) == limit:
+                    next_cursor = encode_cursor(projects[-1]['match_score'], projects[-1]['project_id'])
+                yield {
+                    'student_id': student_id,
+                    'recommendations': projects,
+                    'next_cursor': next_cursor
+                }
+        
+        # NDJSON streams one line per student as soon as it is scored
+        if stream:
+            lines = (json.dumps(result) + '\n' for result in results())
+            return Response(lines, mimetype='application/x-ndjson'), 200
+        
+        return jsonify({'results': list(results())}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def recommendation_items(page, catalog_projects, requirements):
+    """Response rows for a page of (match_score, project_id)"""
+    projects = []
+    for match_score, project_id in page:
+        project = catalog_projects[project_id]
+        if not requirements[project_id]:
+            match_score = NO_REQUIREMENTS_SCORE
+        projects.append({
+            'project_id': project_id,
+            'title': project['title'],
+            'description': project['description'],
+            'difficulty_level': project['difficulty_level'],
+            'category': project['category'],
+            'skills': requirements[project_id],
+            'match_score': match_score
+        })
+    return projects
+
+def calculate_match_score(student_skills, project_skills):
+    """Calculate match score between student skills and project requirements"""
+    if not project_skills:
+        return NO_REQUIREMENTS_SCORE  # Default score if no skills required
+    
+    total_skills = len(project_skills)
+    matched_skills = 0
+    proficiency_bonus = 0
+    
+    proficiency_levels = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
+    
+    for project_skill in project_skills:
+        skill_id = project_skill['skill_id']
+        
+        if skill_id in student_skills:
+            matched_skills += 1
+            
+            # Check proficiency match
+            student_prof = student_skills[skill_id]['proficiency_level']
+            required_prof = project_skill.get('required_proficiency_level', 'Beginner')
+            
+            student_level = proficiency_levels.get(student_prof, 1)
+            required_level = proficiency_levels.get(required_prof, 1)
+            
+            if student_level >= required_level:
+                proficiency_bonus += 10  # Bonus for meeting or exceeding requirement
+            elif student_level >= required_level - 1:
+                proficiency_bonus += 5   # Partial bonus
+    
+    # Base score: percentage of matched skills
+    base_score = (matched_skills / total_skills) * 100
+    
+    # Add proficiency bonus (capped at 20% of total)
+    bonus = min(proficiency_bonus, total_skills * 10)
+    
+    # Final score (max 100)
+    final_score = min(base_score + bonus, 100)
+    
+    return round(final_score, 2)
+
+# ==================== MATERIALIZED RECOMMENDATIONS ====================
+#
+# RECOMMENDATIONS holds one row per (student, project) pair that shares at
+# least one skill, i.e. every pair with a non-zero score. Projects without
+# requirements (score 50) and projects without overlap (score 0) are served
+# from the catalog index. RECOMMENDATION_STATUS marks the students whose rows
+# exist; they are kept current in the same transaction as every write that
+# changes a score, and students without a status row are scored on first read.
+
+def id_placeholders(ids):
+    """Comma separated %s placeholders for an IN (...) list"""
+    return ', '.join(['%s'] * len(ids))
+
+def materialize_student(cursor, student_id, student_skills):
+    """Recompute one student's stored scores; must run inside the transaction that changed their skills"""
+    # Take the status row first so concurrent project writes wait for this refresh
+    cursor.execute("""
+        INSERT INTO RECOMMENDATION_STATUS (student_id)
+        VALUES (%s)
+        ON DUPLICATE KEY UPDATE refreshed_at = CURRENT_TIMESTAMP
+    """, (student_id,))
+    
+    # Requirements of every project sharing at least one skill with the student
+    requirements = {}
+    if student_skills:
+        skill_ids = list(student_skills)
+        cursor.execute(f"""
+            SELECT ps.project_id, ps.skill_id, ps.required_proficiency_level
+            FROM PROJECT_SKILLS ps
+            WHERE ps.project_id IN (
+                SELECT project_id FROM PROJECT_SKILLS WHERE skill_id IN ({id_placeholders(skill_ids)})
+            )
+            FOR SHARE
+        """, tuple(skill_ids))
+        for project_id, skill_id, required_level in cursor.fetchall():
+            requirements.setdefault(project_id, []).append({
+                'skill_id': skill_id,
+                'required_proficiency_level': required_level
+            })
+    
+    scores = {
+        project_id: calculate_match_score(student_skills, project_skills)
+        for project_id, project_skills in requirements.items()
+    }
+    
+    cursor.execute("""
+        SELECT project_id, match_score
+        FROM RECOMMENDATIONS
+        WHERE student_id = %s
+        FOR UPDATE
+    """, (student_id,))
+    stored = {row[0]: float(row[1]) for row in cursor.fetchall()}
+    
+    # Only touch rows whose score actually changed
+    removed = [project_id for project_id in stored if project_id not in scores]
+    changed = [
+        (student_id, project_id, score)
+        for project_id, score in scores.items()
+        if stored.get(project_id) != score
+    ]
+    
+    for i in range(0, len(removed), SKILL_LOADER_BATCH_SIZE):
+        batch = removed[i:i + SKILL_LOADER_BATCH_SIZE]
+        cursor.execute(f"""
+            DELETE FROM RECOMMENDATIONS
+            WHERE student_id = %s AND project_id IN ({id_placeholders(batch)})
+        """, (student_id, *batch))
+    
+    if changed:
+        cursor.executemany("""
+            INSERT INTO RECOMMENDATIONS (student_id, project_id, match_score)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE match_score = VALUES(match_score)
+        """, changed)
+
+def materialize_projects(cursor, project_requirements):
+    """Score new or changed projects against the materialized students holding their skills
+    
+    project_requirements maps project_id -> required skill list; must run in the
+    transaction that wrote those PROJECT_SKILLS rows.
+    """
+    skill_ids = list({
+        skill['skill_id']
+        for project_skills in project_requirements.values()
+        for skill in project_skills
+    })
+    if not skill_ids:
+        return
+    
+    cursor.execute(f"""
+        SELECT ss.student_id, ss.skill_id, ss.proficiency_level
+        FROM STUDENT_SKILLS ss
+        JOIN RECOMMENDATION_STATUS rs ON rs.student_id = ss.student_id
+        WHERE ss.skill_id IN ({id_placeholders(skill_ids)})
+        FOR SHARE
+    """, tuple(skill_ids))
+    
+    holders = {}
+    for student_id, skill_id, proficiency_level in cursor.fetchall():
+        holders.setdefault(student_id, {})[skill_id] = {'proficiency_level': proficiency_level}
+    
+    # Score every holder against all the projects at once with the catalog's
+    # engine; only projects sharing a skill with the student score above 0
+    project_ids = list(project_requirements)
+    matrix = SCORING_ENGINES[SCORING_ENGINE](project_ids, project_requirements)
+    has_requirements = (matrix.totals > 0).tolist()
+    rows = []
+    for student_id, student_skills in holders.items():
+        for project_id, score, stored in zip(project_ids, matrix.score(student_skills).tolist(), has_requirements):
+            if stored and score > 0:
+                rows.append((student_id, project_id, score))
+    
+    if rows:
+        cursor.executemany("""
+            INSERT INTO RECOMMENDATIONS (student_id, project_id, match_score)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE match_score = VALUES(match_score)
+        """, rows)
+
+def read_stored_scores(cursor, student_id, catalog_projects, limit, after):
+    """Up to limit (match_score, project_id) rows of RECOMMENDATIONS for projects still in the catalog
+    
+    Rows of deleted projects can linger until the next refresh, so a LIMIT
+    can come back short after filtering; keep reading from the last row
+    until limit rows are visible or the rows run out.
+    """
+    stored = []
+    while True:
+        query = """
+            SELECT match_score, project_id
+            FROM RECOMMENDATIONS
+            WHERE student_id = %s
+        """
+        params = [student_id]
+        if after:
+            query += " AND (match_score < %s OR (match_score = %s AND project_id < %s))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY match_score DESC, project_id DESC"
+        batch_size = None
+        if limit is not None:
+            # Over-fetch a little so a few stale rows don't cost another round trip
+            batch_size = limit - len(stored) + MATERIALIZED_OVERFETCH
+            query += " LIMIT %s"
+            params.append(batch_size)
+        
+        cursor.execute(query, tuple(params))
+        rows = [(float(row[0]), row[1]) for row in cursor.fetchall()]
+        stored.extend(row for row in rows if row[1] in catalog_projects)
+        if batch_size is None or len(rows) < batch_size:
+            return stored
+        if len(stored) >= limit:
+            return stored[:limit]
+        after = rows[-1]
+
+def is_materialized(cursor, student_id):
+    """True if the student's stored scores exist"""
+    cursor.execute("""
+        SELECT 1 FROM RECOMMENDATION_STATUS WHERE student_id = %s
+    """, (student_id,))
+    return cursor.fetchone() is not None
+
+def has_current_scores(cursor, student_id):
+    """True if the student's stored scores exist and cover every catalog change this worker serves"""
+    cursor.execute("""
+        SELECT v.version, rs.student_id
+        FROM CATALOG_VERSION v
+        LEFT JOIN RECOMMENDATION_STATUS rs ON rs.student_id = %s
+        WHERE v.id = 1
+    """, (student_id,))
+    row = cursor.fetchone()
+    return row is not None and row[1] is not None and row[0] >= catalog_floor()
+
+def read_materialized_page(cursor, student_id, student_skills, catalog_projects, no_requirements, matrix, limit, after):
+    """One page of (match_score, project_id) from RECOMMENDATIONS merged with the fixed score classes
+    
+    cursor may read a replica. If it has no stored scores for the student,
+    or is behind a catalog change this worker already serves, the page comes
+    from the primary, which first scores the student if needed.
+    """
+    if has_current_scores(cursor, student_id):
+        return merge_materialized_page(cursor, student_id, catalog_projects, no_requirements, matrix, limit, after)
+    
+    with db_connection() as conn:
+        if not conn:
+            raise RuntimeError('Database connection failed')
+        primary = conn.cursor()
+        try:
+            if not is_materialized(primary, student_id):
+                materialize_student(primary, student_id, student_skills)
+                conn.commit()
+            return merge_materialized_page(primary, student_id, catalog_projects, no_requirements, matrix,
+                                           limit, after)
+        finally:
+            primary.close()
+
+def read_zero_scores(cursor, student_id, matrix, limit, after):
+    """Up to limit ids of the projects without stored scores among those with requirements, highest first
+    
+    Matrix rows are ordered by project_id descending, so the walk starts at
+    the cursor and reads the stored ids of one id range at a time, growing
+    the range until the page is full.
+    """
+    project_ids = matrix.project_ids
+    start = 0
+    if after is not None and after[0] <= 0:
+        start = first_row_below(project_ids, after[1])
+    size = len(project_ids) if limit is None else limit + MATERIALIZED_OVERFETCH
+    
+    zero_ids = []
+    while start < len(project_ids) and (limit is None or len(zero_ids) < limit):
+        rows = slice(start, start + size)
+        chunk = project_ids[rows][matrix.totals[rows] > 0].tolist()
+        if chunk:
+            cursor.execute("""
+                SELECT project_id FROM RECOMMENDATIONS
+                WHERE student_id = %s AND project_id BETWEEN %s AND %s
+            """, (student_id, chunk[-1], chunk[0]))
+            scored_ids = {row[0] for row in cursor.fetchall()}
+            zero_ids.extend(project_id for project_id in chunk if project_id not in scored_ids)
+        start += size
+        size *= 2
+    return zero_ids if limit is None else zero_ids[:limit]
+
+def merge_materialized_page(cursor, student_id, catalog_projects, no_requirements, matrix, limit, after):
+    """Stored scores of a materialized student merged with the default and zero score classes"""
+    stored = read_stored_scores(cursor, student_id, catalog_projects, limit, after)
+    
+    # Projects without requirements all score the default
+    defaults = sorted(
+        (
+            (float(NO_REQUIREMENTS_SCORE), project_id)
+            for project_id in no_requirements
+            if after is None or (NO_REQUIREMENTS_SCORE, project_id) < after
+        ),
+        reverse=True
+    )
+    
+    page = list(heapq.merge(stored, defaults, reverse=True))
+    if limit is not None and len(page) >= limit:
+        return page[:limit]
+    
+    # The page reaches the zero tier: the remaining projects without overlap
+    zero_ids = read_zero_scores(cursor, student_id, matrix, None if limit is None else limit - len(page), after)
+    return page + [(0.0, project_id) for project_id in zero_ids]
+
+# ==================== HEALTH CHECK ====================
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    try:
+        with db_connection() as conn:
+            if conn:
+                replicas = get_replica_set()
+                return jsonify({
+                    'status': 'healthy',
+                    'database': 'connected',
+                    'pool': get_db_pool().stats(),
+                    'replicas': replicas.stats() if replicas else None
+                }), 200
+            else:
+                return jsonify({
+                    'status': 'unhealthy',
+                    'database': 'disconnected',
+                    'pool': get_db_pool().stats()
+                }), 503
+    except Exception as e:
+        return jsonify({
+            'status': 'unhealthy',
+            'error': str(e)
+        }), 503
+
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Request, database, pool and cache metrics in the Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8'), 200
+
+@app.route('/api/health/slow-queries', methods=['GET'])
+def slow_query_stats():
+    """Most recent statements slower than SLOW_QUERY_MS, newest first"""
+    return jsonify({
+        'threshold_ms': slow_query_log.threshold * 1000,
+        'queries': slow_query_log.entries()
+    }), 200
+
+@app.route('/api/health/pool', methods=['GET'])
+def pool_stats():
+    """Connection pool usage for sizing worker pools"""
+    return jsonify(get_db_pool().stats()), 200
+
+@app.route('/api/health/cache', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters of the in-process caches"""
+    return jsonify({
+        'responses': response_cache.stats(),
+        'profiles': profile_cache.stats(),
+        'scores': score_cache.stats(),
+        'coalescing': {
+            'responses': response_flights.stats(),
+            'recommendations': recommendation_flights.stats()
+        },
+        'change_feed': change_feed.stats()
+    }), 200
+
+if __name__ == '__main__':
+    warm_catalog()
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,259 @@
+"""
+Query plan regression check for the SQL that app.py issues
+
+Finds every statement passed to cursor.execute() / executemany() in app.py
+(optional filters and IN lists included), runs EXPLAIN on each against a
+database - by default the benchmark database filled by generate_data.py -
+and fails if any plan reads a large table with a full table scan (type ALL).
+Intended to run after schema or query changes, before they are merged.
+
+Usage:
+    python benchmarks/check_query_plans.py
+    python benchmarks/check_query_plans.py --database project_recommender --min-rows 500
+"""
+import argparse
+import ast
+import itertools
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+load_dotenv(os.path.join(REPO_ROOT, '.env'))
+
+APP_MODULE = os.path.join(REPO_ROOT, 'app.py')
+
+# Statements that read a whole table on purpose: (function, table) -> reason
+ALLOWED_FULL_SCANS = {
+    ('read_catalog_rows', 'PROJECTS'): 'loads the whole catalog once per catalog version',
+    ('fetch_project_skills', 'PROJECT_SKILLS'): 'project_ids=None loads every requirement with the catalog',
+    ('fetch_project_skills', 'SKILLS'): 'joined to every requirement with the catalog',
+    ('import_projects', 'PROJECTS'): 'reads every title once per import to skip duplicates',
+    ('import_students', 'STUDENTS'): 'reads every email once per import to skip duplicates',
+}
+
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN|(?<!KEY )UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|SET\b|JOIN\b|LEFT\b|INNER\b|ORDER\b|GROUP\b|LIMIT\b|VALUES\b|FOR\b)(\w+))?',
+    re.IGNORECASE
+)
+
+
+class UnsupportedQuery(Exception):
+    """Raised when a statement is built in a way the extractor cannot follow"""
+
+
+class StatementExtractor:
+    """Renders the SQL text of every execute() / executemany() call in a module
+    
+    Pieces appended with += under an if (optional filters, cursors, LIMIT)
+    give several shapes of one statement: none of them, each one alone and
+    all of them, so the plan of every common filter combination is checked.
+    """
+    
+    def __init__(self, source):
+        self.tree = ast.parse(source)
+        self.functions = {
+            node.name: node for node in self.tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+    
+    def statements(self):
+        """Yield (line, function name, SQL or None, error) for every shape of every execute call, in source order"""
+        for function in self.functions.values():
+            for node in ast.walk(function):
+                if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                        and node.func.attr in ('execute', 'executemany') and node.args):
+                    try:
+                        shapes = self.render(node.args[0], function)
+                    except UnsupportedQuery as e:
+                        yield node.lineno, function.name, None, str(e)
+                        continue
+                    for statement in shapes:
+                        yield node.lineno, function.name, statement, None
+    
+    def render(self, node, function):
+        """SQL text variants of an expression, with every placeholder list collapsed to %s"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return [node.value]
+        if isinstance(node, ast.JoinedStr):
+            return self.concatenate([
+                self.render(value.value if isinstance(value, ast.FormattedValue) else value, function)
+                for value in node.values
+            ])
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self.concatenate([self.render(node.left, function), self.render(node.right, function)])
+        if isinstance(node, ast.Call):
+            # id_placeholders(ids) and ', '.join(['%s'] * n) build IN (...) lists
+            name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, 'attr', None)
+            if name in ('id_placeholders', 'join'):
+                return ['%s']
+        if isinstance(node, ast.Name):
+            return self.render_name(node.id, function, node.lineno)
+        raise UnsupportedQuery(f'cannot follow {ast.unparse(node)[:60]}')
+    
+    @staticmethod
+    def concatenate(parts):
+        """Every combination of one variant per part, joined, without duplicates"""
+        return list(dict.fromkeys(''.join(combination) for combination in itertools.product(*parts)))
+    
+    @staticmethod
+    def conditional_nodes(function, assignment):
+        """Nodes under an if / loop of `function` that does not also contain `assignment`"""
+        nodes = set()
+        for node in ast.walk(function):
+            if isinstance(node, (ast.If, ast.For, ast.While)):
+                inside = {id(child) for child in ast.walk(node)}
+                if id(assignment) not in inside:
+                    nodes |= inside
+        return nodes
+    
+    def render_name(self, name, function, before_line):
+        """Variants of a local string variable at a line: its last assignment plus the += pieces after it"""
+        assignments = sorted(
+            (node for node in ast.walk(function)
+             if isinstance(node, (ast.Assign, ast.AugAssign)) and node.lineno < before_line),
+            key=lambda node: (node.lineno, node.col_offset)
+        )
+        base = None
+        pieces = []
+        for node in assignments:
+            if isinstance(node, ast.AugAssign):
+                if isinstance(node.target, ast.Name) and node.target.id == name and base is not None:
+                    pieces.append((node, self.render(node.value, function)))
+                continue
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == name:
+                    base, pieces = node, []
+                    variants = self.render(node.value, function)
+                elif (isinstance(target, ast.Tuple) and isinstance(node.value, ast.Call)
+                        and isinstance(node.value.func, ast.Name) and node.value.func.id in self.functions
+                        and any(isinstance(element, ast.Name) and element.id == name for element in target.elts)):
+                    # query, params = project_list_query(...): use the helper's local of the same name
+                    helper = self.functions[node.value.func.id]
+                    base, pieces = node, []
+                    variants = self.render_name(name, helper, helper.end_lineno + 1)
+        if base is None:
+            raise UnsupportedQuery(f'no string assignment to {name}')
+        
+        conditional = self.conditional_nodes(function, base)
+        optional = [index for index, (node, _) in enumerate(pieces) if id(node) in conditional]
+        # No optional piece, each one alone, and all of them
+        selections = [set()] + [{index} for index in optional] + [set(optional)]
+        shapes = []
+        for selection in selections:
+            shapes.extend(self.concatenate([variants] + [
+                piece for index, (_, piece) in enumerate(pieces)
+                if index not in optional or index in selection
+            ]))
+        return list(dict.fromkeys(shapes))
+
+
+def with_sample_params(statement):
+    """Statement with its %s placeholders replaced by literals EXPLAIN accepts"""
+    statement = re.sub(r'\bLIMIT\s+%s', 'LIMIT 10', statement, flags=re.IGNORECASE)
+    # Timestamps need a valid datetime, or MySQL compares them as strings
+    statement = re.sub(r'(\b\w+_at\s*[<>=]=?\s*)%s', r"\1'2024-01-01 00:00:00'", statement)
+    return statement.replace('%s', "'1'")
+
+
+def table_aliases(statement):
+    """Alias (or name) -> table name of every table the statement references"""
+    aliases = {}
+    for table, alias in TABLE_REFERENCE.findall(statement):
+        aliases[table.upper()] = table.upper()
+        if alias:
+            aliases[alias.upper()] = table.upper()
+    return aliases
+
+
+def table_sizes(cursor, database):
+    cursor.execute("""
+        SELECT UPPER(table_name), table_rows
+        FROM information_schema.tables
+        WHERE table_schema = %s
+    """, (database,))
+    return {name: rows or 0 for name, rows in cursor.fetchall()}
+
+
+def check_statement(cursor, statement, function, sizes, min_rows):
+    """EXPLAIN one statement; returns (plan summary, list of problems)"""
+    cursor.execute('EXPLAIN ' + with_sample_params(statement))
+    columns = [column[0].lower() for column in cursor.description]
+    plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    aliases = table_aliases(statement)
+    
+    summary = []
+    problems = []
+    for step in plan:
+        alias = str(step.get('table') or '')
+        table = aliases.get(alias.upper(), alias.upper())
+        summary.append(f"{table}:{step.get('type')}({step.get('key') or '-'})")
+        if step.get('type') != 'ALL' or sizes.get(table, 0) < min_rows:
+            continue
+        if (function, table) in ALLOWED_FULL_SCANS:
+            continue
+        problems.append(f"full scan of {table} (~{sizes[table]} rows)")
+    return ' '.join(summary), problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='EXPLAIN every statement in app.py and fail on full table scans')
+    parser.add_argument('--database', default=os.getenv('BENCH_DB_NAME', 'project_recommender_bench'),
+                        help='database to EXPLAIN against (default: %(default)s)')
+    parser.add_argument('--min-rows', type=int, default=1000,
+                        help='tables with at least this many rows count as large (default: %(default)s)')
+    parser.add_argument('--verbose', action='store_true', help='print the plan of every statement')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(APP_MODULE, encoding='utf-8') as f:
+        extractor = StatementExtractor(f.read())
+    
+    connection = mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', '@yush2004'),
+        database=args.database
+    )
+    cursor = connection.cursor()
+    sizes = table_sizes(cursor, args.database)
+    
+    checked = 0
+    failures = []
+    for line, function, statement, error in extractor.statements():
+        where = f"app.py:{line} {function}()"
+        if statement is None:
+            failures.append(f"{where}: {error}")
+            continue
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            continue
+        try:
+            summary, problems = check_statement(cursor, statement, function, sizes, args.min_rows)
+        except Error as e:
+            failures.append(f"{where}: EXPLAIN failed: {str(e)[:200]}")
+            continue
+        checked += 1
+        if args.verbose:
+            print(f"{where}: {summary}")
+        failures.extend(f"{where}: {problem}" for problem in problems)
+    
+    cursor.close()
+    connection.close()
+    
+    for failure in failures:
+        print(f"[ERROR] {failure}")
+    print(f"\n{checked} statements explained against '{args.database}', {len(failures)} problems")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Synthetic benchmark data generator for the Project Recommendation System
+
+Creates (or resets) a separate benchmark database with the same schema
+setup_mysql_database.py creates, then fills it with students, skills,
+projects and skill links. Skill popularity follows a Zipf distribution so a
+few skills are held and required far more often than the rest, like in the
+real catalog. Runs fully offline against a local MySQL server.
+
+Usage:
+    python benchmarks/generate_data.py --students 50000 --projects 20000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+import numpy as np
+from dotenv import load_dotenv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from setup_mysql_database import execute_sql_file, load_csv_files, run_migrations, write_csv
+
+load_dotenv(os.path.join(REPO_ROOT, '.env'))
+
+BENCHMARK_DATABASE = 'project_recommender_bench'
+
+# Schema files, in the order setup_mysql_database.py runs them (without sample data);
+# database/migrations is applied after them
+SCHEMA_FILES = [
+    ('mysql_schema.sql', 'Database Schema (5 Tables)'),
+]
+
+# Child tables first so foreign keys never block the reset. CHANGE_FEED_HEAD
+# keeps its row, so change sequences never go backwards
+TABLES = ['RECOMMENDATIONS', 'RECOMMENDATION_STATUS', 'STUDENT_NEIGHBOURS', 'CHANGE_FEED',
+          'STUDENT_SKILLS', 'PROJECT_SKILLS', 'STUDENTS', 'PROJECTS', 'SKILLS']
+
+SKILL_TYPES = ['frontend', 'backend', 'database', 'other']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+LEVEL_WEIGHTS = [0.5, 0.35, 0.15]
+CATEGORIES = ['Web Development', 'Mobile', 'Data Science', 'Machine Learning', 'DevOps',
+              'Security', 'Games', 'IoT', 'Cloud', 'Blockchain']
+WORDS = [
+    'analytics', 'api', 'app', 'assistant', 'automation', 'budget', 'campus', 'chat',
+    'classifier', 'cloud', 'dashboard', 'delivery', 'detector', 'energy', 'event',
+    'finance', 'fitness', 'forecast', 'game', 'garden', 'health', 'inventory', 'library',
+    'map', 'market', 'monitor', 'music', 'network', 'notes', 'planner', 'platform',
+    'portal', 'quiz', 'recipe', 'recommender', 'robot', 'scheduler', 'scraper', 'search',
+    'security', 'sensor', 'social', 'student', 'timetable', 'tracker', 'travel', 'tutor',
+    'vision', 'voice', 'weather', 'wallet', 'workflow'
+]
+
+BATCH_SIZE = 5000
+
+
+def zipf_weights(n, exponent):
+    """Probability of each of n items when popularity falls off as 1 / rank^exponent"""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -exponent
+    return weights / weights.sum()
+
+
+def sample_links(rng, n_rows, n_skills, mean, maximum, minimum, weights):
+    """Distinct skill ids (1-based) per row, popular skills drawn more often"""
+    counts = np.clip(rng.poisson(mean, n_rows), minimum, min(maximum, n_skills))
+    
+    # Draw candidates for every row at once, with headroom for duplicates
+    pool = rng.choice(n_skills, size=int(counts.sum() * 2) + 64, p=weights)
+    position = 0
+    links = []
+    for count in counts:
+        chosen = []
+        seen = set()
+        while len(chosen) < count:
+            if position >= len(pool):
+                pool = rng.choice(n_skills, size=int(counts.sum()) + 64, p=weights)
+                position = 0
+            skill = int(pool[position]) + 1
+            position += 1
+            if skill not in seen:
+                seen.add(skill)
+                chosen.append(skill)
+        links.append(chosen)
+    return links
+
+
+def insert_rows(connection, table, columns, rows):
+    """Insert rows with multi-row INSERTs of BATCH_SIZE and report throughput"""
+    started = time.monotonic()
+    placeholders = ', '.join(['%s'] * len(columns))
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    
+    cursor = connection.cursor()
+    for i in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(query, rows[i:i + BATCH_SIZE])
+    connection.commit()
+    cursor.close()
+    
+    elapsed = time.monotonic() - started
+    rate = len(rows) / elapsed if elapsed > 0 else float('inf')
+    print(f"[OK] {table}: {len(rows)} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def save_rows(connection, table, columns, rows, csv_dir=None):
+    """Insert rows now, or write them to <csv_dir>/<TABLE>.csv for load_csv_files"""
+    if csv_dir is None:
+        insert_rows(connection, table, columns, rows)
+        return
+    write_csv(os.path.join(csv_dir, f'{table}.csv'), columns, rows)
+    print(f"[OK] {table}: {len(rows)} rows written to {table}.csv")
+
+
+def create_schema(db_config, database):
+    """Create the benchmark database and its tables from the files in database/"""
+    connection = mysql.connector.connect(**db_config)
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+    cursor.close()
+    connection.close()
+    
+    connection = mysql.connector.connect(database=database, **db_config)
+    
+    # execute_sql_file reads database/<file> relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        for filename, description in SCHEMA_FILES:
+            if not execute_sql_file(connection, filename, description):
+                raise RuntimeError(f'Could not apply {filename}')
+        if not run_migrations(connection):
+            raise RuntimeError('Could not apply the migrations')
+    finally:
+        os.chdir(cwd)
+    connection.close()
+
+
+def reset_tables(connection):
+    """Empty every data table and restart the auto-increment counters"""
+    cursor = connection.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in TABLES:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    connection.commit()
+    cursor.close()
+
+
+def generate(connection, args):
+    """Generate the whole dataset and insert it (or write it as CSV files with --csv-dir)"""
+    rng = np.random.default_rng(args.seed)
+    weights = zipf_weights(args.skills, args.skew)
+    now = datetime.now().replace(microsecond=0)
+    
+    skills = [
+        (skill_id, f'Skill {skill_id}', SKILL_TYPES[skill_id % len(SKILL_TYPES)], f'Synthetic skill {skill_id}')
+        for skill_id in range(1, args.skills + 1)
+    ]
+    save_rows(connection, 'SKILLS', ['skill_id', 'skill_name', 'skill_type', 'description'], skills, args.csv_dir)
+    
+    # Plain-text passwords, like the accounts created by /api/auth/signup
+    students = [
+        (student_id, f'Student {student_id}', f'student{student_id}@bench.local', 'benchmark')
+        for student_id in range(1, args.students + 1)
+    ]
+    save_rows(connection, 'STUDENTS', ['student_id', 'name', 'email', 'password_hash'], students, args.csv_dir)
+    
+    # Categories are skewed too, and projects spread over the last two years
+    category_weights = zipf_weights(len(CATEGORIES), 1.0)
+    categories = rng.choice(len(CATEGORIES), size=args.projects, p=category_weights)
+    difficulties = rng.choice(len(LEVELS), size=args.projects, p=LEVEL_WEIGHTS)
+    ages = rng.integers(0, 730 * 24 * 3600, size=args.projects)
+    words = rng.integers(0, len(WORDS), size=(args.projects, 8))
+    projects = []
+    for i in range(args.projects):
+        title_words = [WORDS[w] for w in words[i, :3]]
+        projects.append((
+            i + 1,
+            f"{' '.join(title_words).title()} {i + 1}",
+            f"A {' '.join(WORDS[w] for w in words[i, 3:])} project",
+            LEVELS[difficulties[i]],
+            CATEGORIES[categories[i]],
+            'Benchmark',
+            now - timedelta(seconds=int(ages[i]))
+        ))
+    save_rows(connection, 'PROJECTS',
+                ['project_id', 'title', 'description', 'difficulty_level', 'category', 'created_by', 'created_at'],
+                projects, args.csv_dir)
+    
+    # A few projects require no skills at all (they get the default score)
+    project_links = sample_links(rng, args.projects, args.skills, args.skills_per_project,
+                                 args.max_skills_per_project, 0, weights)
+    levels = rng.choice(len(LEVELS), size=sum(len(links) for links in project_links), p=LEVEL_WEIGHTS)
+    rows = []
+    for project_id, links in enumerate(project_links, 1):
+        for skill_id in links:
+            rows.append((project_id, skill_id, LEVELS[levels[len(rows)]], 'Y'))
+    save_rows(connection, 'PROJECT_SKILLS',
+                ['project_id', 'skill_id', 'required_proficiency_level', 'is_mandatory'], rows, args.csv_dir)
+    
+    student_links = sample_links(rng, args.students, args.skills, args.skills_per_student,
+                                 args.max_skills_per_student, 1, weights)
+    total = sum(len(links) for links in student_links)
+    levels = rng.choice(len(LEVELS), size=total, p=LEVEL_WEIGHTS)
+    years = rng.integers(0, 6, size=total)
+    rows = []
+    for student_id, links in enumerate(student_links, 1):
+        for skill_id in links:
+            rows.append((student_id, skill_id, LEVELS[levels[len(rows)]], int(years[len(rows)])))
+    save_rows(connection, 'STUDENT_SKILLS',
+                ['student_id', 'skill_id', 'proficiency_level', 'years_of_experience'], rows, args.csv_dir)
+
+
+def bump_catalog_version(connection):
+    """Invalidate the caches of any app instance pointed at this database"""
+    cursor = connection.cursor()
+    cursor.execute("UPDATE CATALOG_VERSION SET version = version + 1 WHERE id = 1")
+    # Every project and student changed: one whole-scope entry each in the change feed
+    cursor.execute("UPDATE CHANGE_FEED_HEAD SET seq = seq + 1 WHERE id = 1")
+    cursor.execute("""
+        INSERT INTO CHANGE_FEED (seq, scope, entity_id)
+        SELECT seq, scope, NULL FROM CHANGE_FEED_HEAD, (SELECT 'catalog' AS scope UNION ALL SELECT 'student') scopes
+        WHERE id = 1
+    """)
+    connection.commit()
+    cursor.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fill a benchmark database with synthetic data')
+    parser.add_argument('--database', default=os.getenv('BENCH_DB_NAME', BENCHMARK_DATABASE),
+                        help='database to create and fill (default: %(default)s)')
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--skills', type=int, default=200)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--skills-per-student', type=float, default=6, help='mean skills per student')
+    parser.add_argument('--max-skills-per-student', type=int, default=30)
+    parser.add_argument('--skills-per-project', type=float, default=4, help='mean required skills per project')
+    parser.add_argument('--max-skills-per-project', type=int, default=12)
+    parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of skill popularity')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-schema', action='store_true', help='reuse existing tables')
+    parser.add_argument('--csv-dir', help='write the rows as <TABLE>.csv files here and load them with '
+                                          'LOAD DATA LOCAL INFILE (much faster for large datasets)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD', '@yush2004'),
+    }
+    
+    started = time.monotonic()
+    if not args.skip_schema:
+        create_schema(db_config, args.database)
+    
+    connection = mysql.connector.connect(database=args.database, allow_local_infile=args.csv_dir is not None,
+                                         **db_config)
+    reset_tables(connection)
+    if args.csv_dir is not None:
+        os.makedirs(args.csv_dir, exist_ok=True)
+    generate(connection, args)
+    if args.csv_dir is not None and not load_csv_files(connection, args.csv_dir):
+        raise SystemExit('Loading the CSV files failed')
+    bump_catalog_version(connection)
+    connection.close()
+    
+    print(f"\n[OK] Generated benchmark database '{args.database}' in {time.monotonic() - started:.1f}s")
+    print(f"Start the API against it with DB_NAME={args.database}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""
+Load harness for the Project Recommendation System API
+
+Drives every hot route at a fixed concurrency for a fixed time and prints a
+JSON report (p50/p95/p99 latency and throughput per scenario) that can be
+saved and compared across commits. Targets either a running server
+(--base-url) or the Flask app in-process (--in-process), both against the
+benchmark database filled by generate_data.py.
+
+Usage:
+    python benchmarks/run_benchmark.py --base-url http://localhost:5000 --output before.json
+    python benchmarks/run_benchmark.py --in-process --compare before.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+import mysql.connector
+from dotenv import load_dotenv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+load_dotenv(os.path.join(REPO_ROOT, '.env'))
+
+SCENARIOS = ['recommendations', 'projects', 'projects_filtered', 'projects_search', 'login', 'update_student']
+
+SEARCH_TERMS = ['dashboard', 'student', 'tracker', 'cloud api', 'music', 'chat app', 'weather', 'sec']
+
+
+class HttpClient:
+    """Keep-alive HTTP client for one worker thread"""
+    
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.connection = None
+    
+    def request(self, method, path, body=None):
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, self.prefix + path, payload, headers)
+                response = self.connection.getresponse()
+                response.read()
+                if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                    self.connection.close()
+                    self.connection = None
+                return response.status
+            except (http.client.HTTPException, OSError):
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+class InProcessClient:
+    """Flask test client, so the app can be measured without a server"""
+    
+    def __init__(self, app):
+        self.client = app.test_client()
+    
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        response.get_data()
+        response.close()
+        return response.status_code
+
+
+def load_fixtures(db_config, sample_size, seed):
+    """Ids, emails, filters and skill lists to build requests from, read once before timing"""
+    rng = random.Random(seed)
+    connection = mysql.connector.connect(**db_config)
+    cursor = connection.cursor()
+    
+    cursor.execute("SELECT student_id, email, password_hash FROM STUDENTS ORDER BY student_id")
+    students = cursor.fetchall()
+    if not students:
+        raise SystemExit('The benchmark database has no students; run benchmarks/generate_data.py first')
+    students = rng.sample(students, min(sample_size, len(students)))
+    
+    student_ids = [row[0] for row in students]
+    placeholders = ', '.join(['%s'] * len(student_ids))
+    cursor.execute(f"""
+        SELECT student_id, skill_id, proficiency_level, years_of_experience
+        FROM STUDENT_SKILLS
+        WHERE student_id IN ({placeholders})
+    """, tuple(student_ids))
+    skills = {}
+    for student_id, skill_id, level, years in cursor.fetchall():
+        skills.setdefault(student_id, []).append({
+            'skill_id': skill_id,
+            'proficiency_level': level,
+            'years_of_experience': years
+        })
+    
+    cursor.execute("SELECT DISTINCT category FROM PROJECTS WHERE category IS NOT NULL")
+    categories = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT COUNT(*) FROM PROJECTS")
+    project_count = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM STUDENTS")
+    student_count = cursor.fetchone()[0]
+    
+    cursor.close()
+    connection.close()
+    
+    return {
+        'students': [
+            {'student_id': row[0], 'email': row[1], 'password': row[2], 'skills': skills.get(row[0], [])}
+            for row in students
+        ],
+        'categories': categories or [None],
+        'project_count': project_count,
+        'student_count': student_count
+    }
+
+
+def build_request(scenario, fixtures, rng):
+    """(method, path, body) of one request for a scenario"""
+    student = rng.choice(fixtures['students'])
+    if scenario == 'recommendations':
+        return 'GET', f"/api/recommendations/{student['student_id']}?limit=20", None
+    if scenario == 'projects':
+        return 'GET', '/api/projects?limit=50', None
+    if scenario == 'projects_filtered':
+        params = {'limit': 50, 'difficulty': rng.choice(['Beginner', 'Intermediate', 'Advanced'])}
+        # Without any categorized project the scenario filters on difficulty only
+        category = rng.choice(fixtures['categories'])
+        if category is not None:
+            params['category'] = category
+        return 'GET', f"/api/projects?{urlencode(params)}", None
+    if scenario == 'projects_search':
+        return 'GET', f"/api/projects?{urlencode({'limit': 20, 'search': rng.choice(SEARCH_TERMS)})}", None
+    if scenario == 'login':
+        return 'POST', '/api/auth/login', {'email': student['email'], 'password': student['password']}
+    if scenario == 'update_student':
+        # Change one skill's proficiency, the common profile edit
+        skills = [dict(skill) for skill in student['skills']]
+        if skills:
+            skill = rng.choice(skills)
+            skill['proficiency_level'] = rng.choice(['Beginner', 'Intermediate', 'Advanced'])
+        return 'PUT', f"/api/students/{student['student_id']}", {
+            'name': f"Student {student['student_id']}",
+            'email': student['email'],
+            'skills': skills
+        }
+    raise ValueError(f'Unknown scenario: {scenario}')
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(scenario, make_client, fixtures, concurrency, duration, warmup, seed):
+    """Run one scenario with `concurrency` threads for `duration` seconds and summarize it"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    deadline = [0.0]
+    
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = make_client()
+        for _ in range(warmup):
+            try:
+                client.request(*build_request(scenario, fixtures, rng))
+            except Exception:
+                pass
+        start_barrier.wait()
+        
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline[0]:
+            method, path, body = build_request(scenario, fixtures, rng)
+            started = time.perf_counter()
+            try:
+                status = client.request(method, path, body)
+            except Exception:
+                status = None
+            local_latencies.append(time.perf_counter() - started)
+            if status is None or status >= 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+    
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # Until the real deadline is set right after the barrier, workers see none
+    deadline[0] = float('inf')
+    start_barrier.wait()
+    started = time.perf_counter()
+    deadline[0] = started + duration
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'p50': to_ms(percentile(latencies, 0.50)),
+            'p95': to_ms(percentile(latencies, 0.95)),
+            'p99': to_ms(percentile(latencies, 0.99)),
+            'mean': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+            'max': to_ms(latencies[-1]) if latencies else None
+        }
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Human-readable p95/throughput change of every scenario against a baseline report"""
+    lines = []
+    for scenario, result in report['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(scenario)
+        if not before or not before['latency_ms']['p95'] or not before['throughput_rps']:
+            continue
+        p95 = result['latency_ms']['p95'] / before['latency_ms']['p95'] - 1
+        rps = result['throughput_rps'] / before['throughput_rps'] - 1
+        lines.append(f"{scenario:20s} p95 {result['latency_ms']['p95']:9.2f} ms ({p95:+.1%})"
+                     f"  throughput {result['throughput_rps']:9.1f}/s ({rps:+.1%})")
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the API routes at fixed concurrency')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--base-url', default='http://localhost:5000', help='server to drive (default: %(default)s)')
+    target.add_argument('--in-process', action='store_true', help='drive the Flask app in this process')
+    parser.add_argument('--database', default=os.getenv('BENCH_DB_NAME', 'project_recommender_bench'))
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma separated subset of: ' + ', '.join(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--warmup', type=int, default=5, help='untimed requests per thread before each scenario')
+    parser.add_argument('--sample-students', type=int, default=1000, help='students to draw requests from')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON report to print changes against (on stderr)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+    
+    db_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD', '@yush2004'),
+        'database': args.database
+    }
+    fixtures = load_fixtures(db_config, args.sample_students, args.seed)
+    
+    if args.in_process:
+        # app.py reads its database name at import time
+        os.environ['DB_NAME'] = args.database
+        import app as app_module
+        app_module.warm_catalog()
+        make_client = lambda: InProcessClient(app_module.app)
+        target = 'in-process'
+    else:
+        make_client = lambda: HttpClient(args.base_url)
+        target = args.base_url
+    
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'target': target,
+        'database': args.database,
+        'dataset': {'students': fixtures['student_count'], 'projects': fixtures['project_count']},
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'scenarios': {}
+    }
+    for scenario in scenarios:
+        print(f"Running {scenario} ...", file=sys.stderr)
+        report['scenarios'][scenario] = run_scenario(
+            scenario, make_client, fixtures, args.concurrency, args.duration, args.warmup, args.seed
+        )
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
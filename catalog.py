@@ -0,0 +1,125 @@
+"""
+In-memory project catalog index used by the recommendation engine
+"""
+import threading
+
+from scoring import ProjectSkillMatrix
+from search_index import SearchIndex
+from similarity import SimilarityIndex
+
+
+class CatalogIndex:
+    """Projects, their skill requirements, a text search index and a skill-set similarity index"""
+    
+    def __init__(self, matrix_class=ProjectSkillMatrix, similarity_weighted=True):
+        self.projects = {}          # project_id -> project fields (without skills)
+        self.requirements = {}      # project_id -> list of required skill dicts
+        self.no_requirements = set()
+        self.search = SearchIndex()
+        self.similarity_weighted = similarity_weighted
+        self.similar = SimilarityIndex(weighted=similarity_weighted)
+        self.loaded = False
+        self.matrix_class = matrix_class    # ProjectSkillMatrix or ProjectSkillBitsets
+        self.version = None                 # CATALOG_VERSION the index was loaded at, if known
+        self._matrix = None
+        self._lock = threading.RLock()
+    
+    def load(self, projects, project_skills, version=None):
+        """Replace the whole index from project rows and their skill requirement lists read at `version`"""
+        new_projects = {}
+        new_requirements = {}
+        new_no_requirements = set()
+        
+        for project in projects:
+            project_id = project['project_id']
+            skills = project_skills.get(project_id, [])
+            new_projects[project_id] = project
+            new_requirements[project_id] = skills
+            if not skills:
+                new_no_requirements.add(project_id)
+        
+        new_search = SearchIndex()
+        new_search.add_many(
+            (project['project_id'], {'title': project['title'], 'description': project['description']})
+            for project in projects
+        )
+        new_similar = SimilarityIndex(weighted=self.similarity_weighted)
+        new_similar.add_many(new_requirements.items())
+        
+        with self._lock:
+            self.projects = new_projects
+            self.requirements = new_requirements
+            self.no_requirements = new_no_requirements
+            self.search = new_search
+            self.similar = new_similar
+            self.version = version
+            self._matrix = None
+            self.loaded = True
+    
+    def load_snapshot(self, snapshot):
+        """Replace the whole index with a memory-mapped CatalogSnapshot
+        
+        Projects, requirements and the search and similarity indexes are read
+        from the mapped file, so they are shared by every worker mapping it.
+        """
+        new_search = snapshot.search_index()
+        new_similar = snapshot.similarity_index()
+        if new_similar.params() != SimilarityIndex(weighted=self.similarity_weighted).params():
+            # Hashed with other settings: rebuild with this worker's
+            new_similar = SimilarityIndex(weighted=self.similarity_weighted)
+            new_similar.add_many(snapshot.requirements.items())
+        no_requirements = snapshot.no_requirements()
+        matrix = snapshot.matrix(self.matrix_class)
+        
+        with self._lock:
+            self.projects = snapshot.projects
+            self.requirements = snapshot.requirements
+            self.no_requirements = no_requirements
+            self.search = new_search
+            self.similar = new_similar
+            self.version = snapshot.version
+            self._matrix = matrix
+            self.loaded = True
+    
+    def add_project(self, project, skills):
+        """Insert or replace a single project (copy-on-write so readers never see a partial update)"""
+        self.add_projects([(project, skills)])
+    
+    def add_projects(self, entries):
+        """Insert or replace many (project, skills) pairs with a single copy of the index"""
+        entries = list(entries)
+        with self._lock:
+            projects = dict(self.projects)
+            requirements = dict(self.requirements)
+            no_requirements = set(self.no_requirements)
+            
+            for project, skills in entries:
+                project_id = project['project_id']
+                projects[project_id] = project
+                requirements[project_id] = skills
+                if skills:
+                    no_requirements.discard(project_id)
+                else:
+                    no_requirements.add(project_id)
+            
+            self.projects = projects
+            self.requirements = requirements
+            self.no_requirements = no_requirements
+            self._matrix = None
+            self.search.add_many(
+                (project['project_id'], {'title': project['title'], 'description': project['description']})
+                for project, _ in entries
+            )
+            self.similar.add_many((project['project_id'], skills) for project, skills in entries)
+    
+    def matrix(self):
+        """Scoring matrix with rows ordered newest (highest project_id) first, rebuilt after any change"""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = self.matrix_class(sorted(self.projects, reverse=True), self.requirements)
+            return self._matrix
+    
+    def snapshot(self):
+        """Consistent (projects, requirements, no_requirements, matrix) references for one request"""
+        with self._lock:
+            return self.projects, self.requirements, self.no_requirements, self.matrix()
@@ -0,0 +1,351 @@
+"""
+Memory-mapped catalog snapshot shared by every worker process
+
+write_snapshot() serializes the projects, their skill requirements, the
+bitset scoring matrix and the search and similarity indexes into one
+array-backed binary file. CatalogSnapshot maps
+it read-only, so prefork workers start without reading the catalog from the
+database and share its physical pages through the OS page cache. Files are
+named after the catalog version and published with an atomic rename; readers
+always switch to the newest one.
+
+File layout: 8-byte magic, u32 format version, u32 header length, a JSON
+header (catalog version, small lookup tables and the offset, dtype and shape
+of every section), then the sections, each aligned to 64 bytes.
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from scoring import ProjectSkillBitsets
+from search_index import SearchIndex
+from similarity import SimilarityIndex
+
+try:
+    import fcntl
+except ImportError:     # Windows: publishes are not serialized across processes
+    fcntl = None
+
+MAGIC = b'PRCATSNP'
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+PREAMBLE = struct.Struct('<8sII')
+
+SNAPSHOT_FILE_PATTERN = re.compile(r'^catalog-(\d{20})\.snap$')
+PUBLISH_LOCK_FILE = 'publish.lock'
+
+# Nullable text columns of PROJECTS stored in the string heap
+TEXT_FIELDS = ('title', 'description', 'difficulty_level', 'category')
+
+EPOCH = datetime(1970, 1, 1)
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+
+def snapshot_path(directory, version):
+    return os.path.join(directory, f'catalog-{version:020d}.snap')
+
+
+def latest_snapshot_path(directory):
+    """Path of the newest snapshot in directory, or None if there is none"""
+    try:
+        names = [name for name in os.listdir(directory) if SNAPSHOT_FILE_PATTERN.match(name)]
+    except FileNotFoundError:
+        return None
+    # Versions are zero-padded, so the newest file also sorts last
+    return os.path.join(directory, max(names)) if names else None
+
+
+def snapshot_version(path):
+    return int(SNAPSHOT_FILE_PATTERN.match(os.path.basename(path)).group(1))
+
+
+@contextmanager
+def publish_lock(directory):
+    """Exclusive lock on publishing into directory, held across processes where fcntl is available"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, PUBLISH_LOCK_FILE), 'ab') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        # Closing the file releases the lock
+        yield
+
+
+def _timestamp(value):
+    """Naive datetime (or ISO string) as microseconds since the epoch"""
+    if value is None:
+        return NO_TIMESTAMP
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _code(table, codes, value):
+    """Index of value in a small lookup table, added on first use"""
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(table)
+        table.append(value)
+    return code
+
+
+def write_snapshot(directory, version, projects, project_skills, keep=2, similarity_weighted=True):
+    """Write the catalog at `version` to a new snapshot file and publish it atomically; returns its path
+    
+    projects are PROJECTS rows as dicts, project_skills maps project_id to its
+    requirement dicts (skill_id, skill_name, required_proficiency_level,
+    is_mandatory). Only the newest `keep` snapshots are left in directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    projects = sorted(projects, key=lambda project: project['project_id'])
+    project_ids = np.array([project['project_id'] for project in projects], dtype=np.int64)
+    
+    heap = bytearray()
+    text_start = np.zeros((len(projects), len(TEXT_FIELDS)), dtype=np.int64)
+    text_length = np.full((len(projects), len(TEXT_FIELDS)), -1, dtype=np.int32)
+    for row, project in enumerate(projects):
+        for column, field in enumerate(TEXT_FIELDS):
+            value = project.get(field)
+            if value is not None:
+                data = str(value).encode('utf-8')
+                text_start[row, column] = len(heap)
+                text_length[row, column] = len(data)
+                heap += data
+    created_at = np.array([_timestamp(project.get('created_at')) for project in projects], dtype=np.int64)
+    
+    levels, level_codes = [], {}
+    mandatory, mandatory_codes = [], {}
+    skill_names = {}
+    indptr = [0]
+    skill_ids = []
+    level_index = []
+    mandatory_index = []
+    for project in projects:
+        for skill in project_skills.get(project['project_id'], []):
+            skill_ids.append(skill['skill_id'])
+            skill_names[skill['skill_id']] = skill.get('skill_name')
+            level_index.append(_code(levels, level_codes, skill.get('required_proficiency_level')))
+            mandatory_index.append(_code(mandatory, mandatory_codes, skill.get('is_mandatory')))
+        indptr.append(len(skill_ids))
+    
+    # Scoring matrix rows are newest (highest project_id) first, like CatalogIndex.matrix()
+    matrix = ProjectSkillBitsets(project_ids[::-1].tolist(), project_skills)
+    
+    # Search postings and similarity buckets, so readers do not re-tokenize and re-hash the catalog
+    search = SearchIndex()
+    search.add_many(
+        (project['project_id'], {'title': project.get('title'), 'description': project.get('description')})
+        for project in projects
+    )
+    terms, search_indptr, search_doc_ids, search_frequencies, length_ids, lengths = search.to_arrays()
+    search_lengths = np.zeros(len(projects), dtype=np.float64)
+    search_lengths[np.searchsorted(project_ids, length_ids)] = lengths
+    similar = SimilarityIndex(weighted=similarity_weighted)
+    similar.add_many((project['project_id'], project_skills.get(project['project_id'], [])) for project in projects)
+    similar_keys, similar_ids = similar.to_arrays()
+    
+    sections = {
+        'project_ids': project_ids,
+        'created_at': created_at,
+        'text_start': text_start,
+        'text_length': text_length,
+        'indptr': np.asarray(indptr, dtype=np.int64),
+        'skill_ids': np.asarray(skill_ids, dtype=np.int64),
+        'levels': np.asarray(level_index, dtype=np.int16),
+        'mandatory': np.asarray(mandatory_index, dtype=np.int16),
+        'bits': matrix.bits,
+        'totals': matrix.totals,
+        'heap': np.frombuffer(bytes(heap), dtype=np.uint8),
+        'search_terms': np.frombuffer('\n'.join(terms).encode('utf-8'), dtype=np.uint8),
+        'search_indptr': search_indptr,
+        'search_doc_ids': search_doc_ids,
+        'search_frequencies': search_frequencies,
+        'search_lengths': search_lengths,
+        'similar_keys': similar_keys,
+        'similar_ids': similar_ids,
+    }
+    
+    header = {
+        'catalog_version': version,
+        'levels': levels,
+        'mandatory': mandatory,
+        'skill_names': [[skill_id, name] for skill_id, name in skill_names.items()],
+        'skill_columns': list(matrix.skill_columns),
+        'similarity': similar.params(),
+        'sections': {}
+    }
+    offset = 0
+    for name, array in sections.items():
+        header['sections'][name] = [offset, array.dtype.str, list(array.shape)]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = -(-(PREAMBLE.size + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+    
+    path = snapshot_path(directory, version)
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in sections.items():
+            f.seek(data_start + header['sections'][name][0])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    
+    # Workers still mapping an older file keep their pages until they switch
+    older = sorted(name for name in os.listdir(directory) if SNAPSHOT_FILE_PATTERN.match(name))[:-keep]
+    for name in older:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    return path
+
+
+class CatalogSnapshot:
+    """Read-only memory-mapped view of one snapshot file"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(self._mmap) < PREAMBLE.size:
+            raise ValueError(f'{path} is truncated')
+        magic, format_version, header_length = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f'{path} is not a catalog snapshot (format {FORMAT_VERSION})')
+        header = json.loads(self._mmap[PREAMBLE.size:PREAMBLE.size + header_length].decode('utf-8'))
+        data_start = -(-(PREAMBLE.size + header_length) // ALIGNMENT) * ALIGNMENT
+        
+        self.version = header['catalog_version']
+        self.levels = header['levels']
+        self.mandatory = header['mandatory']
+        self.skill_names = {skill_id: name for skill_id, name in header['skill_names']}
+        self.skill_columns = header['skill_columns']
+        self.similarity_params = header['similarity']
+        
+        arrays = {}
+        for name, (offset, dtype, shape) in header['sections'].items():
+            count = int(np.prod(shape, dtype=np.int64))
+            arrays[name] = np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=count,
+                                         offset=data_start + offset).reshape(shape)
+        self.project_ids = arrays['project_ids']
+        self.created_at = arrays['created_at']
+        self.text_start = arrays['text_start']
+        self.text_length = arrays['text_length']
+        self.indptr = arrays['indptr']
+        self.skill_ids = arrays['skill_ids']
+        self.level_codes = arrays['levels']
+        self.mandatory_codes = arrays['mandatory']
+        self.bits = arrays['bits']
+        self.totals = arrays['totals']
+        self._heap_start = data_start + header['sections']['heap'][0]
+        self._search_arrays = tuple(arrays[name] for name in (
+            'search_terms', 'search_indptr', 'search_doc_ids', 'search_frequencies', 'search_lengths'))
+        self._similar_keys = arrays['similar_keys']
+        self._similar_ids = arrays['similar_ids']
+        
+        self.projects = SnapshotProjects(self)
+        self.requirements = SnapshotRequirements(self)
+    
+    def __len__(self):
+        return len(self.project_ids)
+    
+    def row_of(self, project_id):
+        """Row of a project id, raising KeyError if it is not in the snapshot"""
+        row = int(np.searchsorted(self.project_ids, project_id))
+        if row == len(self.project_ids) or self.project_ids[row] != project_id:
+            raise KeyError(project_id)
+        return row
+    
+    def _text(self, row, column):
+        length = int(self.text_length[row, column])
+        if length < 0:
+            return None
+        start = self._heap_start + int(self.text_start[row, column])
+        return self._mmap[start:start + length].decode('utf-8')
+    
+    def project(self, row):
+        created_at = int(self.created_at[row])
+        project = {'project_id': int(self.project_ids[row])}
+        for column, field in enumerate(TEXT_FIELDS):
+            project[field] = self._text(row, column)
+        project['created_at'] = None if created_at == NO_TIMESTAMP else EPOCH + timedelta(microseconds=created_at)
+        return project
+    
+    def project_requirements(self, row):
+        start, end = int(self.indptr[row]), int(self.indptr[row + 1])
+        return [
+            {
+                'skill_id': skill_id,
+                'skill_name': self.skill_names.get(skill_id),
+                'required_proficiency_level': self.levels[level],
+                'is_mandatory': self.mandatory[mandatory]
+            }
+            for skill_id, level, mandatory in zip(self.skill_ids[start:end].tolist(),
+                                                  self.level_codes[start:end].tolist(),
+                                                  self.mandatory_codes[start:end].tolist())
+        ]
+    
+    def no_requirements(self):
+        """Ids of the projects that require no skills"""
+        return set(self.project_ids[np.diff(self.indptr) == 0].tolist())
+    
+    def matrix(self, matrix_class=ProjectSkillBitsets):
+        """Scoring matrix, rows newest first; the bitset matrix is served straight from the mapped file"""
+        if matrix_class is ProjectSkillBitsets:
+            return ProjectSkillBitsets.from_arrays(self.project_ids[::-1], self.skill_columns,
+                                                   self.bits, self.totals)
+        return matrix_class(self.project_ids[::-1].tolist(), self.requirements)
+    
+    def search_index(self):
+        """Text search index over the stored postings; only the vocabulary and document lengths are copied"""
+        terms, indptr, doc_ids, frequencies, lengths = self._search_arrays
+        terms = terms.tobytes().decode('utf-8')
+        return SearchIndex.from_arrays(terms.split('\n') if terms else [], indptr, doc_ids, frequencies,
+                                       self.project_ids, lengths)
+    
+    def similarity_index(self):
+        """Read-only similarity index over the stored bucket keys, hashed with self.similarity_params"""
+        return SimilarityIndex.from_arrays(self._similar_keys, self._similar_ids, self.requirements,
+                                           **self.similarity_params)
+
+
+class SnapshotProjects(Mapping):
+    """project_id -> project dict, decoded from the snapshot on access"""
+    
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+    
+    def __getitem__(self, project_id):
+        return self._snapshot.project(self._snapshot.row_of(project_id))
+    
+    def __contains__(self, project_id):
+        try:
+            self._snapshot.row_of(project_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+    
+    def __iter__(self):
+        return iter(self._snapshot.project_ids.tolist())
+    
+    def __len__(self):
+        return len(self._snapshot)
+
+
+class SnapshotRequirements(SnapshotProjects):
+    """project_id -> list of required skill dicts, decoded from the snapshot on access"""
+    
+    def __getitem__(self, project_id):
+        return self._snapshot.project_requirements(self._snapshot.row_of(project_id))
@@ -0,0 +1,74 @@
+"""
+Change feed follower: turns new CHANGE_FEED rows into precise cache invalidations
+"""
+import threading
+
+
+class ChangeFeed:
+    """Tracks the last feed sequence a worker has applied and works out which changes it still has to apply
+    
+    The database side (reading the head and the rows after it) stays with the
+    caller; this class only decides what a batch of rows means. Sequences are
+    handed out under a row lock held until commit, so they become visible in
+    order and a worker never needs to look behind the sequence it has seen.
+    """
+    
+    def __init__(self, retention=10000, max_changes=1000):
+        self.retention = retention          # sequences the writers keep in CHANGE_FEED
+        self.max_changes = max_changes      # larger batches invalidate everything instead
+        self.seq = None                     # last sequence applied; None until the first poll
+        self._skip = set()                  # sequences written and applied by this worker
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.changes = 0
+        self.resets = 0
+    
+    def skip(self, seq):
+        """Mark a committed sequence this worker already applied, so polling does not apply it again"""
+        with self._lock:
+            if self.seq is None or seq > self.seq:
+                self._skip.add(seq)
+    
+    def behind(self, head):
+        """True if there are sequences up to head this worker has not applied"""
+        return self.seq is not None and head > self.seq
+    
+    def advance(self, head, rows=()):
+        """Move to head; returns the distinct (scope, entity_id) changes of the rows to apply
+        
+        scope is 'project', 'student' or 'catalog'; entity_id None stands for
+        every entity of the scope. rows are the (seq, scope, entity_id) rows
+        after the last sequence, at most max_changes + 1 of them. The first
+        call only records head: nothing was cached before it.
+        """
+        with self._lock:
+            self.polls += 1
+            if self.seq is None or head <= self.seq:
+                if self.seq is None:
+                    self.seq = head
+                return []
+            
+            rows = list(rows)
+            if head - self.seq > self.retention or len(rows) > self.max_changes:
+                # Rows this worker missed were pruned, or there are too many to
+                # apply one by one: start over
+                changes = [('catalog', None), ('student', None)]
+                self.resets += 1
+            else:
+                changes = list(dict.fromkeys(
+                    (scope, entity_id) for seq, scope, entity_id in rows
+                    if self.seq < seq <= head and seq not in self._skip
+                ))
+            self.seq = head
+            self._skip = {seq for seq in self._skip if seq > head}
+            self.changes += len(changes)
+        return changes
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'seq': self.seq,
+                'polls': self.polls,
+                'changes': self.changes,
+                'resets': self.resets
+            }
@@ -0,0 +1,208 @@
+"""
+"Students like you": nearest-neighbour students by skill profile, and the collaborative score blend
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from scoring import PROFICIENCY_LEVELS
+
+
+class StudentSkillMatrix:
+    """Sparse student x skill matrix (CSR layout) of proficiency levels, rows scaled to unit length
+    
+    With unit rows the dot product of two rows is the cosine similarity of the
+    two students' profiles.
+    """
+    
+    def __init__(self, student_ids, skill_ids, levels):
+        """Build from parallel (student_id, skill_id, proficiency level 1-3) entry arrays, in any order"""
+        self.student_ids, rows = np.unique(np.asarray(student_ids, dtype=np.int64), return_inverse=True)
+        self.skill_ids, columns = np.unique(np.asarray(skill_ids, dtype=np.int64), return_inverse=True)
+        levels = np.asarray(levels, dtype=np.float32)
+        
+        order = np.argsort(rows, kind='stable')
+        self.rows = rows[order].astype(np.int32)
+        self.columns = columns[order].astype(np.int32)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(self.rows, minlength=len(self.student_ids)))))
+        
+        values = levels[order]
+        norms = np.sqrt(np.bincount(self.rows, weights=values * values, minlength=len(self.student_ids)))
+        self.values = (values / norms[self.rows]).astype(np.float32)
+    
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (student_id, skill_id, proficiency_level name) rows, e.g. STUDENT_SKILLS"""
+        student_ids, skill_ids, levels = [], [], []
+        for student_id, skill_id, proficiency_level in rows:
+            student_ids.append(student_id)
+            skill_ids.append(skill_id)
+            levels.append(PROFICIENCY_LEVELS.get(proficiency_level, 1))
+        return cls(student_ids, skill_ids, levels)
+    
+    def __len__(self):
+        return len(self.student_ids)
+    
+    @property
+    def nnz(self):
+        return len(self.values)
+    
+    def dense(self, start, stop):
+        """Rows start:stop as a dense float32 block"""
+        block = np.zeros((stop - start, len(self.skill_ids)), dtype=np.float32)
+        lo, hi = self.indptr[start], self.indptr[stop]
+        block[self.rows[lo:hi] - start, self.columns[lo:hi]] = self.values[lo:hi]
+        return block
+
+
+def _top_k(rows, neighbours, similarities, k, n_rows):
+    """Best k (neighbour row, similarity) per query row: similarity descending, then neighbour row ascending
+    
+    Every query row must have at least k entries; returns two (n_rows, k) arrays.
+    """
+    order = np.lexsort((neighbours, -similarities, rows))
+    rows = rows[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, np.arange(n_rows))[rows]
+    keep = order[rank < k]
+    return neighbours[keep].reshape(n_rows, k), similarities[keep].reshape(n_rows, k)
+
+
+def nearest_neighbours(matrix, k=20, chunk_size=1024, block_size=16384, min_similarity=0.0):
+    """Yield (student_id, [(neighbour_id, similarity), ...]) for every student, most similar first
+    
+    Students are processed in chunks of chunk_size rows. Each chunk is
+    multiplied against the whole matrix one dense block of block_size rows
+    at a time, so memory stays at about chunk_size * block_size floats
+    whatever the number of students. A running top-k per student is kept,
+    and only the similarities above its current k-th best are merged into
+    it. Neighbours need a similarity above min_similarity.
+    """
+    n = len(matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        for student_id in matrix.student_ids.tolist():
+            yield student_id, []
+        return
+    
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        queries = matrix.dense(start, stop)
+        count = stop - start
+        best = np.full((count, k), -1, dtype=np.int64)
+        best_similarity = np.full((count, k), -np.inf, dtype=np.float32)
+        
+        for block_start in range(0, n, block_size):
+            block_stop = min(block_start + block_size, n)
+            similarities = queries @ matrix.dense(block_start, block_stop).T
+            
+            # A student is not their own neighbour
+            own = np.arange(max(start, block_start), min(stop, block_stop))
+            similarities[own - start, own - block_start] = -np.inf
+            
+            # Only entries beating the current k-th best can enter the top k;
+            # while that bar is still low, cut every row to its own top k first
+            threshold = best_similarity[:, -1] if block_start else np.full(count, min_similarity, dtype=np.float32)
+            rows, columns = np.divmod(np.flatnonzero(similarities > threshold[:, None]), block_stop - block_start)
+            if len(rows) > count * k * 4:
+                width = min(k, block_stop - block_start)
+                columns = np.argpartition(-similarities, width - 1, axis=1)[:, :width]
+                rows = np.repeat(np.arange(count), width)
+                columns = columns.ravel()
+            if not len(rows):
+                continue
+            
+            best, best_similarity = _top_k(
+                np.concatenate((np.repeat(np.arange(count), k), rows)),
+                np.concatenate((best.ravel(), columns + block_start)),
+                np.concatenate((best_similarity.ravel(), similarities[rows, columns])),
+                k, count
+            )
+        
+        found = (best_similarity > min_similarity).sum(axis=1).tolist()
+        neighbour_ids = matrix.student_ids[np.maximum(best, 0)].tolist()
+        similarities = np.round(best_similarity.astype(np.float64), 4).tolist()
+        for row, student_id in enumerate(matrix.student_ids[start:stop].tolist()):
+            # Rows are sorted best first, so the neighbours found come first
+            yield student_id, list(zip(neighbour_ids[row][:found[row]], similarities[row][:found[row]]))
+
+
+def blend_scores(scores, neighbour_scores, similarities, weight):
+    """Content scores blended with the similarity-weighted mean of the neighbours' scores of every project
+    
+    The blend is rounded to two decimals like the content scores, so it
+    pages with the same cursors.
+    """
+    if not neighbour_scores or weight <= 0:
+        return scores
+    collaborative = np.average(np.vstack(neighbour_scores), axis=0, weights=np.asarray(similarities, dtype=np.float64))
+    return np.round((1 - weight) * scores + weight * collaborative, 2)
+
+
+class ScoreCache:
+    """LRU cache of whole-catalog score vectors by skill profile, bounded by their total bytes
+    
+    Vectors are only valid for the scoring matrix they were computed with;
+    the cache empties itself when it is used with another one.
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._matrix = None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _switch(self, matrix):
+        if matrix is not self._matrix:
+            self._matrix = matrix
+            self._entries.clear()
+            self._bytes = 0
+    
+    def get(self, matrix, profile_key):
+        """Read-only scores of the profile against matrix, or None"""
+        with self._lock:
+            self._switch(matrix)
+            scores = self._entries.get(profile_key)
+            if scores is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(profile_key)
+            self.hits += 1
+            return scores
+    
+    def put(self, matrix, profile_key, scores):
+        if scores.nbytes > self.max_bytes:
+            return
+        # Shared between requests, so nobody may modify it in place
+        scores.flags.writeable = False
+        with self._lock:
+            self._switch(matrix)
+            old = self._entries.pop(profile_key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[profile_key] = scores
+            self._bytes += scores.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,133 @@
+"""
+Compute "students like you" neighbours offline and store them in STUDENT_NEIGHBOURS
+
+Reads every student's skills, finds each student's most similar students
+(cosine similarity of proficiency vectors, see collaborative.py) in chunked
+vectorized batches, and upserts them. Rows left over from earlier runs are
+deleted at the end. Run it periodically, e.g. nightly from cron; collaborative
+recommendations fall back to content matching for students added since.
+
+Usage:
+    python compute_student_neighbours.py
+    python compute_student_neighbours.py --neighbours 30 --chunk-size 512
+"""
+import argparse
+import os
+import sys
+import time
+
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+from collaborative import StudentSkillMatrix, nearest_neighbours
+from setup_mysql_database import Progress
+
+load_dotenv()
+
+# Rows per fetch while reading STUDENT_SKILLS
+FETCH_SIZE = 10000
+
+
+def read_student_skills(cursor):
+    """Every (student_id, skill_id, proficiency_level) row of STUDENT_SKILLS, fetched in batches"""
+    cursor.execute("SELECT student_id, skill_id, proficiency_level FROM STUDENT_SKILLS")
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        yield from rows
+
+
+def write_neighbours(connection, cursor, rows):
+    cursor.executemany("""
+        INSERT INTO STUDENT_NEIGHBOURS (student_id, neighbour_id, similarity, computed_at)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            similarity = VALUES(similarity),
+            computed_at = VALUES(computed_at)
+    """, rows)
+    connection.commit()
+
+
+def delete_older_rows(connection, cursor, computed_at, batch_size):
+    """Delete rows of earlier runs in small transactions; returns the number deleted"""
+    deleted = 0
+    while True:
+        cursor.execute("""
+            DELETE FROM STUDENT_NEIGHBOURS
+            WHERE computed_at < %s
+            LIMIT %s
+        """, (computed_at, batch_size))
+        connection.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            return deleted
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Compute every student\'s most similar students into STUDENT_NEIGHBOURS')
+    parser.add_argument('--database', default=os.getenv('DB_NAME', 'project_recommender'),
+                        help='database to read and write (default: %(default)s)')
+    parser.add_argument('--neighbours', type=int, default=20, help='neighbours kept per student (default: %(default)s)')
+    parser.add_argument('--min-similarity', type=float, default=0.0,
+                        help='keep only neighbours above this cosine similarity (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=1024,
+                        help='students compared against everyone per batch (default: %(default)s)')
+    parser.add_argument('--block-size', type=int, default=16384,
+                        help='students per dense block of a batch; memory is about '
+                             'chunk size * block size * 4 bytes (default: %(default)s)')
+    parser.add_argument('--write-batch', type=int, default=5000, help='rows per INSERT / DELETE (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        connection = mysql.connector.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 3306)),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', '@yush2004'),
+            database=args.database
+        )
+    except Error as e:
+        print(f"[ERROR] Could not connect to '{args.database}': {e}")
+        return 1
+    cursor = connection.cursor()
+    
+    # Server time, so the clean-up compares timestamps from the same clock
+    cursor.execute("SELECT NOW()")
+    computed_at = cursor.fetchone()[0]
+    
+    started = time.monotonic()
+    matrix = StudentSkillMatrix.from_rows(read_student_skills(cursor))
+    print(f"[OK] Read {matrix.nnz} skills of {len(matrix)} students in {time.monotonic() - started:.1f}s")
+    
+    progress = Progress('neighbours', total=len(matrix), unit='students')
+    batch = []
+    written = 0
+    for student_id, neighbours in nearest_neighbours(matrix, args.neighbours, args.chunk_size,
+                                                     args.block_size, args.min_similarity):
+        batch.extend((student_id, neighbour_id, similarity, computed_at)
+                     for neighbour_id, similarity in neighbours)
+        if len(batch) >= args.write_batch:
+            write_neighbours(connection, cursor, batch)
+            written += len(batch)
+            batch = []
+        progress.update()
+    if batch:
+        write_neighbours(connection, cursor, batch)
+        written += len(batch)
+    progress.finish()
+    
+    deleted = delete_older_rows(connection, cursor, computed_at, args.write_batch)
+    print(f"[OK] {written} neighbour rows written, {deleted} rows of earlier runs deleted")
+    
+    cursor.close()
+    connection.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
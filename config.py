@@ -1,24 +1,24 @@
-"""
-Configuration file for the Project Recommendation System Backend
-"""
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-class Config:
-    """Application configuration"""
-    
-    # Database Configuration
-    DB_USER = os.getenv('DB_USER', 'your_username')
-    DB_PASSWORD = os.getenv('DB_PASSWORD', 'your_password')
-    DB_DSN = os.getenv('DB_DSN', 'localhost:1521/XE')
-    
-    # Flask Configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-    DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-    
-    # API Configuration
-    API_HOST = os.getenv('API_HOST', '0.0.0.0')
-    API_PORT = int(os.getenv('API_PORT', 5000))
-
+"""
+Configuration file for the Project Recommendation System Backend
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class Config:
+    """Application configuration"""
+    
+    # Database Configuration
+    DB_USER = os.getenv('DB_USER', 'your_username')
+    DB_PASSWORD = os.getenv('DB_PASSWORD', 'your_password')
+    DB_DSN = os.getenv('DB_DSN', 'localhost:1521/XE')
+    
+    # Flask Configuration
+    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+    DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    
+    # API Configuration
+    API_HOST = os.getenv('API_HOST', '0.0.0.0')
+    API_PORT = int(os.getenv('API_PORT', 5000))
+
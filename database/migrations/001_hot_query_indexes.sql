@@ -0,0 +1,39 @@
+-- Indexes behind the hot queries, and case-insensitive collation on the
+-- text columns the API filters on so queries compare them directly instead
+-- of through UPPER(), which no index can serve.
+--
+-- utf8mb4_unicode_ci is accent-insensitive as well: 'Resume' = 'résumé'.
+-- That widens the duplicate title check, the difficulty / category / skill
+-- type filters and LIKE searches on PROJECTS and SKILLS to accent variants,
+-- which UPPER() on the old collation did not match. STUDENTS keeps its
+-- collation: emails are stored and looked up lowercased, so they need no
+-- case-insensitive comparison.
+
+ALTER TABLE PROJECTS CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+ALTER TABLE SKILLS CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- Skills of a batch of students (fetch_student_skills, profile loads)
+CREATE INDEX idx_student_skills_student ON STUDENT_SKILLS (student_id, skill_id, proficiency_level);
+
+-- Materialized students holding a skill (materialize_projects)
+CREATE INDEX idx_student_skills_skill ON STUDENT_SKILLS (skill_id, student_id, proficiency_level);
+
+-- Requirements of a batch of projects (fetch_project_skills, materialize_student)
+CREATE INDEX idx_project_skills_project ON PROJECT_SKILLS (project_id, skill_id, required_proficiency_level);
+
+-- Projects requiring a skill (materialize_student)
+CREATE INDEX idx_project_skills_skill ON PROJECT_SKILLS (skill_id, project_id);
+
+-- Newest-first listing and its keyset pagination, unfiltered and filtered
+CREATE INDEX idx_projects_created ON PROJECTS (created_at, project_id);
+CREATE INDEX idx_projects_difficulty_created ON PROJECTS (difficulty_level, created_at, project_id);
+CREATE INDEX idx_projects_category_created ON PROJECTS (category, created_at, project_id);
+
+-- Duplicate title check on create and import
+CREATE INDEX idx_projects_title ON PROJECTS (title);
+
+-- Login, signup and import duplicate checks
+CREATE INDEX idx_students_email ON STUDENTS (email);
+
+-- Skills filtered by type
+CREATE INDEX idx_skills_type ON SKILLS (skill_type, skill_name);
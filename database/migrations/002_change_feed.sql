@@ -0,0 +1,21 @@
+-- Change feed: every catalog and student write appends (seq, scope,
+-- entity_id) rows in its own transaction, so each worker process can
+-- invalidate exactly the cached projects, students or catalog that changed.
+-- CHANGE_FEED_HEAD holds the last sequence; writers bump it under its row
+-- lock, which keeps sequences in commit order.
+
+CREATE TABLE IF NOT EXISTS CHANGE_FEED_HEAD (
+    id TINYINT PRIMARY KEY,
+    seq BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO CHANGE_FEED_HEAD (id, seq) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS CHANGE_FEED (
+    change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    seq BIGINT NOT NULL,
+    scope VARCHAR(16) NOT NULL,     -- project, student or catalog
+    entity_id INT NULL,             -- NULL: every entity of the scope
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_change_feed_seq (seq)
+);
@@ -0,0 +1,18 @@
+-- "Students like you": the most similar students of every student by skill
+-- profile (cosine similarity of proficiency vectors), computed offline by
+-- compute_student_neighbours.py and read by collaborative recommendations.
+-- Each run stamps its rows with computed_at and then deletes the rows of
+-- earlier runs.
+
+CREATE TABLE IF NOT EXISTS STUDENT_NEIGHBOURS (
+    student_id INT NOT NULL,
+    neighbour_id INT NOT NULL,
+    similarity DECIMAL(5,4) NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (student_id, neighbour_id),
+    KEY idx_student_neighbours_computed (computed_at),
+    CONSTRAINT fk_student_neighbours_student FOREIGN KEY (student_id)
+        REFERENCES STUDENTS(student_id) ON DELETE CASCADE,
+    CONSTRAINT fk_student_neighbours_neighbour FOREIGN KEY (neighbour_id)
+        REFERENCES STUDENTS(student_id) ON DELETE CASCADE
+);
@@ -0,0 +1,31 @@
+-- Materialized recommendation scores
+-- One row per (student, project) pair sharing at least one skill.
+-- Rows are rewritten in the same transaction as the student or project write
+-- that changes them.
+-- Databases created before this became a migration already have the
+-- tables; CREATE TABLE IF NOT EXISTS leaves them as they are.
+
+CREATE TABLE IF NOT EXISTS RECOMMENDATIONS (
+    recommendation_id INT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    project_id INT NOT NULL,
+    match_score DECIMAL(5,2) NOT NULL,
+    recommended_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    viewed CHAR(1) DEFAULT 'N',
+    saved CHAR(1) DEFAULT 'N',
+    UNIQUE KEY uq_recommendations_student_project (student_id, project_id),
+    KEY idx_recommendations_student_score (student_id, match_score DESC, project_id DESC),
+    KEY idx_recommendations_project (project_id),
+    CONSTRAINT fk_recommendations_student FOREIGN KEY (student_id)
+        REFERENCES STUDENTS(student_id) ON DELETE CASCADE,
+    CONSTRAINT fk_recommendations_project FOREIGN KEY (project_id)
+        REFERENCES PROJECTS(project_id) ON DELETE CASCADE
+);
+
+-- Students whose RECOMMENDATIONS rows have been materialized
+CREATE TABLE IF NOT EXISTS RECOMMENDATION_STATUS (
+    student_id INT PRIMARY KEY,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT fk_recommendation_status_student FOREIGN KEY (student_id)
+        REFERENCES STUDENTS(student_id) ON DELETE CASCADE
+);
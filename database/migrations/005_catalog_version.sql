@@ -0,0 +1,13 @@
+-- Catalog version counter
+-- Bumped in the same transaction as every catalog write so that each worker
+-- process can tell when its cached catalog responses are stale.
+-- Databases created before this became a migration already have the
+-- table; IF NOT EXISTS and INSERT IGNORE leave it as it is.
+
+CREATE TABLE IF NOT EXISTS CATALOG_VERSION (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO CATALOG_VERSION (id, version) VALUES (1, 0);
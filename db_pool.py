@@ -0,0 +1,412 @@
+"""
+MySQL connection pool for the Project Recommendation System Backend
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class PoolTimeoutError(Error):
+    """Raised when no connection could be checked out before the timeout"""
+
+
+class InstrumentedCursor:
+    """Cursor proxy that reports statement timings and fetched row counts to the pool's hooks"""
+    
+    def __init__(self, cursor, on_query, on_rows):
+        self._cursor = cursor
+        self._on_query = on_query
+        self._on_rows = on_rows
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+    
+    def _timed(self, method, operation, args, kwargs):
+        started = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            if self._on_query is not None:
+                self._on_query(operation, time.perf_counter() - started)
+    
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, args, kwargs)
+    
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, args, kwargs)
+    
+    def _fetched(self, count):
+        if self._on_rows is not None and count:
+            self._on_rows(count)
+    
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._fetched(1 if row is not None else 0)
+        return row
+    
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(len(rows))
+        return rows
+    
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows))
+        return rows
+    
+    def __iter__(self):
+        count = 0
+        try:
+            for row in self._cursor:
+                count += 1
+                yield row
+        finally:
+            self._fetched(count)
+
+
+class PooledConnection:
+    """Proxy around a raw MySQL connection that returns it to the pool on close()"""
+    
+    def __init__(self, pool, raw_connection, created_at):
+        self._pool = pool
+        self._raw = raw_connection
+        self._created_at = created_at
+    
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise Error('Connection has already been returned to the pool')
+        return getattr(raw, name)
+    
+    def cursor(self, *args, **kwargs):
+        """Cursor on the raw connection, instrumented if the pool has query hooks"""
+        cursor = self.__getattr__('cursor')(*args, **kwargs)
+        if self._pool.on_query is None and self._pool.on_rows is None:
+            return cursor
+        return InstrumentedCursor(cursor, self._pool.on_query, self._pool.on_rows)
+    
+    @property
+    def closed(self):
+        return self._raw is None
+    
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)"""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw, self._created_at)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Thread-safe pool with overflow, checkout timeout, pre-ping and recycling"""
+    
+    def __init__(self, connect_args, pool_size=5, max_overflow=10, timeout=30.0,
+                 recycle=3600, pre_ping=True, on_checkout=None, on_query=None, on_rows=None):
+        self.connect_args = dict(connect_args)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        # Instrumentation hooks: on_checkout(wait_seconds) after every checkout,
+        # on_query(statement, seconds) after every statement and on_rows(count)
+        # after every fetch on this pool's cursors
+        self.on_checkout = on_checkout
+        self.on_query = on_query
+        self.on_rows = on_rows
+        self.pid = os.getpid()
+        
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+        
+        self._checkouts = 0
+        self._checkout_failures = 0
+        self._connect_errors = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+    
+    def _connect(self):
+        """Open a new raw connection"""
+        return mysql.connector.connect(**self.connect_args), time.monotonic()
+    
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Error:
+            pass
+    
+    def _is_usable(self, raw, created_at):
+        """Check a pooled connection before handing it out"""
+        if self.recycle and self.recycle > 0 and time.monotonic() - created_at > self.recycle:
+            with self._cond:
+                self._recycled += 1
+            return False
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Error:
+                with self._cond:
+                    self._ping_failures += 1
+                return False
+        return True
+    
+    def acquire(self):
+        """Check out a connection, waiting up to `timeout` seconds for one to free up"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._total < self.pool_size + self.max_overflow:
+                    raw, created_at = None, None
+                    self._total += 1
+                    self._in_use += 1
+                    break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._checkout_failures += 1
+                    raise PoolTimeoutError(
+                        f'Timed out after {self.timeout}s waiting for a database connection'
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+        
+        # Validation and connecting happen outside the lock so a slow
+        # handshake does not block other threads releasing connections
+        try:
+            if raw is not None and not self._is_usable(raw, created_at):
+                self._discard(raw)
+                raw = None
+            if raw is None:
+                raw, created_at = self._connect()
+        except Error:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._connect_errors += 1
+                self._checkout_failures += 1
+                self._cond.notify()
+            raise
+        
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        if self.on_checkout is not None:
+            self.on_checkout(waited)
+        
+        return PooledConnection(self, raw, created_at)
+    
+    def release(self, raw, created_at):
+        """Return a raw connection to the idle set, or close it if it is overflow or broken"""
+        keep = True
+        try:
+            # Never hand the next caller someone else's open transaction
+            if raw.in_transaction:
+                raw.rollback()
+        except Error:
+            keep = False
+        
+        with self._cond:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.pool_size:
+                self._idle.append((raw, created_at))
+            else:
+                self._total -= 1
+                keep = False
+            self._cond.notify()
+        
+        if not keep:
+            self._discard(raw)
+    
+    def dispose(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._total -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+    
+    def stats(self):
+        """Snapshot of pool usage counters"""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'total': self._total,
+                'overflow': max(self._total - self.pool_size, 0),
+                'waiting': self._waiting,
+                'checkouts': checkouts,
+                'checkout_failures': self._checkout_failures,
+                'connect_errors': self._connect_errors,
+                'recycled': self._recycled,
+                'ping_failures': self._ping_failures,
+                'wait_time_total_ms': round(self._wait_time_total * 1000, 3),
+                'wait_time_avg_ms': round(self._wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                'wait_time_max_ms': round(self._wait_time_max * 1000, 3)
+            }
+
+
+class ReplicaSet:
+    """Read replicas, each with its own ConnectionPool, handed out round-robin while healthy
+    
+    A replica that fails a checkout is taken out of rotation at once; a
+    background health check puts it back once it answers again and its
+    replication lag is within max_lag seconds. When no replica is usable,
+    acquire() returns None and the caller reads from the primary instead.
+    """
+    
+    def __init__(self, pools, check_interval=5.0, max_lag=30.0):
+        self.pools = list(pools)            # (name, ConnectionPool) per replica
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.pid = os.getpid()
+        
+        self._healthy = [True] * len(self.pools)
+        self._lag = [None] * len(self.pools)
+        self._errors = [None] * len(self.pools)
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor = None
+        
+        self.fallbacks = 0
+        self.failures = 0
+    
+    def acquire(self, prefer=None):
+        """(index, connection) of a healthy replica, trying `prefer` first; (None, None) if none can be reached"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.pools)
+        order = [(start + offset) % len(self.pools) for offset in range(len(self.pools))]
+        if prefer is not None:
+            order.remove(prefer)
+            order.insert(0, prefer)
+        
+        for index in order:
+            if not self._healthy[index]:
+                continue
+            try:
+                return index, self.pools[index][1].acquire()
+            except Error as e:
+                self.mark_down(index, e)
+        
+        with self._lock:
+            self.fallbacks += 1
+        return None, None
+    
+    def mark_down(self, index, error):
+        """Take a replica out of rotation until the next successful health check"""
+        with self._lock:
+            if self._healthy[index]:
+                self.failures += 1
+            self._healthy[index] = False
+            self._errors[index] = str(error)
+    
+    def replication_lag(self, cursor):
+        """Seconds the replica is behind its source; 0 if it is not replicating, None if replication is broken"""
+        for statement in ('SHOW REPLICA STATUS', 'SHOW SLAVE STATUS'):
+            try:
+                cursor.execute(statement)
+            except Error:
+                continue
+            row = cursor.fetchone()
+            if row is None:
+                # A standalone server (e.g. a local stand-in) has no source to lag behind
+                return 0
+            status = dict(zip([column[0] for column in cursor.description], row))
+            return status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        # No privilege to read the replication status: judge by reachability only
+        return 0
+    
+    def check(self, index):
+        """Health-check one replica: it must answer and lag at most max_lag seconds"""
+        name, pool = self.pools[index]
+        try:
+            conn = pool.acquire()
+            try:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                cursor.fetchall()
+                lag = self.replication_lag(cursor)
+                cursor.close()
+            finally:
+                conn.close()
+        except Error as e:
+            self.mark_down(index, e)
+            return False
+        
+        healthy = lag is not None and (self.max_lag is None or lag <= self.max_lag)
+        with self._lock:
+            if self._healthy[index] and not healthy:
+                self.failures += 1
+            self._healthy[index] = healthy
+            self._lag[index] = lag
+            self._errors[index] = None if healthy else (
+                'replication stopped' if lag is None else f'{lag}s behind'
+            )
+        return healthy
+    
+    def check_all(self):
+        for index in range(len(self.pools)):
+            self.check(index)
+    
+    def start_monitor(self):
+        """Run check_all() every check_interval seconds in a daemon thread"""
+        def run():
+            while not self._stop.wait(self.check_interval):
+                self.check_all()
+        
+        self._monitor = threading.Thread(target=run, name='replica-health', daemon=True)
+        self._monitor.start()
+    
+    def close(self):
+        self._stop.set()
+        for _, pool in self.pools:
+            pool.dispose()
+    
+    def stats(self):
+        with self._lock:
+            replicas = [
+                {
+                    'name': name,
+                    'healthy': self._healthy[index],
+                    'lag_seconds': self._lag[index],
+                    'last_error': self._errors[index],
+                    'pool': pool.stats()
+                }
+                for index, (name, pool) in enumerate(self.pools)
+            ]
+            return {
+                'replicas': replicas,
+                'healthy': sum(self._healthy),
+                'failures': self.failures,
+                'fallbacks': self.fallbacks
+            }
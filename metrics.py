@@ -0,0 +1,200 @@
+"""
+In-process metrics (counters, histograms, gauges) rendered in the Prometheus text format
+"""
+import bisect
+import threading
+import time
+from collections import deque
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for per-request query counts and fetched rows
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    
+    kind = 'counter'
+    
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+    
+    def collect(self):
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in sorted(values):
+            yield f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # label values -> [bucket counts (last one is +Inf), sum, count]
+        self._lock = threading.Lock()
+    
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def collect(self):
+        with self._lock:
+            series = [(label_values, list(counts), total, count)
+                      for label_values, (counts, total, count) in self._series.items()]
+        for label_values, counts, total, count in sorted(series):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, label_values, ('le', _format_value(float(bound))))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labels, label_values)
+            yield f'{self.name}_sum{labels} {_format_value(total)}'
+            yield f'{self.name}_count{labels} {count}'
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time; the callback returns {label values tuple: value}"""
+    
+    kind = 'gauge'
+    
+    def __init__(self, name, help, callback, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.callback = callback
+    
+    def collect(self):
+        for label_values, value in sorted(self.callback().items()):
+            yield f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}'
+
+
+class CallbackCounter(Gauge):
+    """Counter read from a callback at scrape time, for totals another object keeps (e.g. cache hit counts)"""
+    
+    kind = 'counter'
+
+
+class MetricsRegistry:
+    """Named set of metrics rendered together on the metrics endpoint"""
+    
+    def __init__(self):
+        self._metrics = []
+    
+    def counter(self, name, help, labels=()):
+        return self._register(Counter(name, help, labels))
+    
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labels, buckets))
+    
+    def gauge(self, name, help, callback, labels=()):
+        return self._register(Gauge(name, help, callback, labels))
+    
+    def callback_counter(self, name, help, callback, labels=()):
+        return self._register(CallbackCounter(name, help, callback, labels))
+    
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            try:
+                lines.extend(metric.collect())
+            except Exception as e:
+                # One failing gauge callback must not break the whole scrape
+                print(f"Metrics collection error for {metric.name}: {str(e)}")
+        return '\n'.join(lines) + '\n'
+
+
+class SlowQueryLog:
+    """Bounded log of statements that ran longer than a threshold
+    
+    Every slow statement is kept in entries(), but at most one is printed per
+    print_interval seconds (0 prints them all), so a burst of slow queries
+    cannot flood stdout.
+    """
+    
+    def __init__(self, threshold_ms=200, max_entries=100, print_interval=60.0):
+        self.threshold = threshold_ms / 1000.0
+        self.print_interval = print_interval
+        self._entries = deque(maxlen=max_entries)
+        self._next_print = None
+        self._suppressed = 0
+        self._lock = threading.Lock()
+    
+    def record(self, statement, seconds, route):
+        """Keep the statement if it was slow; returns True if it was logged"""
+        if seconds < self.threshold:
+            return False
+        entry = {
+            'at': time.time(),
+            'duration_ms': round(seconds * 1000, 3),
+            'route': route,
+            'statement': ' '.join(str(statement).split())
+        }
+        now = time.monotonic()
+        with self._lock:
+            self._entries.append(entry)
+            report = self._next_print is None or now >= self._next_print
+            if report:
+                self._next_print = now + self.print_interval
+                suppressed, self._suppressed = self._suppressed, 0
+            else:
+                self._suppressed += 1
+        if report:
+            more = f' ({suppressed} more since the last one printed)' if suppressed else ''
+            print(f"Slow query ({entry['duration_ms']} ms) on {route}: {entry['statement']}{more}")
+        return True
+    
+    def entries(self):
+        """Logged statements, newest first"""
+        with self._lock:
+            return list(reversed(self._entries))
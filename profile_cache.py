@@ -0,0 +1,227 @@
+"""
+Student profile cache (student row plus skills) with TTL and LRU eviction
+
+Entries can carry a version, the change feed sequence the profile was read
+at. A set with an older version than the entry holds is ignored, so a
+reader that loaded a profile before a concurrent write cannot replace the
+writer's write-through with the older row. Deletes leave their version
+behind for the same reason.
+"""
+import abc
+import importlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class ProfileCache(abc.ABC):
+    """Interface of a profile cache backend; subclasses store JSON-serializable profile dicts"""
+    
+    shared = False      # True if every worker reads the same entries
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+    
+    def _count(self, hit):
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    @abc.abstractmethod
+    def get(self, student_id):
+        """The cached profile dict, or None on a miss; counts the hit or miss"""
+    
+    @abc.abstractmethod
+    def set(self, student_id, profile, version=None):
+        """Store a profile, unless the entry holds a newer version"""
+    
+    @abc.abstractmethod
+    def delete(self, student_id, version=None):
+        """Drop one student's profile; sets older than version are ignored afterwards"""
+    
+    @abc.abstractmethod
+    def clear(self):
+        """Drop every profile"""
+    
+    def stats(self):
+        with self._counter_lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class NullProfileCache(ProfileCache):
+    """Backend that never stores anything (PROFILE_CACHE_BACKEND=none)"""
+    
+    def get(self, student_id):
+        self._count(False)
+        return None
+    
+    def set(self, student_id, profile, version=None):
+        pass
+    
+    def delete(self, student_id, version=None):
+        pass
+    
+    def clear(self):
+        pass
+
+
+class LocalProfileCache(ProfileCache):
+    """In-process backend: one LRU per worker, entries expire after `ttl` seconds"""
+    
+    def __init__(self, max_entries=10000, ttl=300):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _live(self, student_id):
+        """(expires, version, profile) of a student, None if absent or expired; call with the lock held"""
+        entry = self._entries.get(student_id)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[student_id]
+            self.expirations += 1
+            entry = None
+        return entry
+    
+    def get(self, student_id):
+        with self._lock:
+            entry = self._live(student_id)
+            # Deleted entries stay behind as their version without a profile
+            profile = entry[2] if entry is not None else None
+            if profile is not None:
+                self._entries.move_to_end(student_id)
+        self._count(profile is not None)
+        return profile
+    
+    def _store(self, student_id, profile, version):
+        with self._lock:
+            entry = self._live(student_id)
+            if entry is not None and entry[1] is not None and version is not None and version < entry[1]:
+                return
+            self._entries.pop(student_id, None)
+            self._entries[student_id] = (time.monotonic() + self.ttl, version, profile)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def set(self, student_id, profile, version=None):
+        self._store(student_id, profile, version)
+    
+    def delete(self, student_id, version=None):
+        if version is None:
+            with self._lock:
+                self._entries.pop(student_id, None)
+        else:
+            self._store(student_id, None, version)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats.update({
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            })
+        return stats
+
+
+class RedisProfileCache(ProfileCache):
+    """Shared backend so all workers see the same entries; Redis handles TTL and LRU (maxmemory-policy)"""
+    
+    shared = True
+    
+    # KEYS: profile key, version key; ARGV: profile JSON ('' to delete), version, ttl
+    STORE_SCRIPT = """
+        local current = redis.call('GET', KEYS[2])
+        if current and tonumber(current) > tonumber(ARGV[2]) then
+            return 0
+        end
+        redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+        if ARGV[1] == '' then
+            redis.call('DEL', KEYS[1])
+        else
+            redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+        end
+        return 1
+    """
+    
+    def __init__(self, url, ttl=300, prefix='profile:'):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('PROFILE_CACHE_BACKEND=redis requires the redis package (pip install redis)')
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._store = self.client.register_script(self.STORE_SCRIPT)
+    
+    def _key(self, student_id):
+        return f'{self.prefix}{student_id}'
+    
+    def _version_key(self, student_id):
+        return f'{self.prefix}version:{student_id}'
+    
+    def get(self, student_id):
+        raw = self.client.get(self._key(student_id))
+        self._count(raw is not None)
+        return json.loads(raw) if raw is not None else None
+    
+    def set(self, student_id, profile, version=None):
+        if version is None:
+            self.client.set(self._key(student_id), json.dumps(profile), ex=self.ttl)
+        else:
+            self._store(keys=[self._key(student_id), self._version_key(student_id)],
+                        args=[json.dumps(profile), version, self.ttl])
+    
+    def delete(self, student_id, version=None):
+        if version is None:
+            self.client.delete(self._key(student_id))
+        else:
+            self._store(keys=[self._key(student_id), self._version_key(student_id)], args=['', version, self.ttl])
+    
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+    
+    def stats(self):
+        stats = super().stats()
+        stats['ttl'] = self.ttl
+        return stats
+
+
+def create_profile_cache(backend='local', url=None, ttl=300, max_entries=10000):
+    """Build the configured backend: 'local', 'redis', 'none' or a 'module:ClassName' ProfileCache subclass"""
+    if ':' in backend:
+        module_name, class_name = backend.split(':', 1)
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        if not (isinstance(backend_class, type) and issubclass(backend_class, ProfileCache)):
+            raise ValueError(f'{backend} is not a ProfileCache subclass')
+        return backend_class(url=url, ttl=ttl)
+    if backend == 'none':
+        return NullProfileCache()
+    if backend == 'redis':
+        return RedisProfileCache(url, ttl=ttl)
+    if backend == 'local':
+        return LocalProfileCache(max_entries=max_entries, ttl=ttl)
+    raise ValueError(f'Unknown profile cache backend: {backend}')
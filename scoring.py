@@ -0,0 +1,411 @@
+"""
+Vectorized match scoring of students against the whole project catalog
+"""
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+import numpy as np
+
+PROFICIENCY_LEVELS = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
+
+# Default score of projects that do not require any skills
+NO_REQUIREMENTS_SCORE = 50
+
+
+class ProjectSkillMatrix:
+    """Sparse project x skill matrix (CSR layout) of required proficiency levels 1-3"""
+    
+    def __init__(self, project_ids, requirements):
+        """Build from project ids (row order) and a project_id -> required skill list mapping"""
+        self.project_ids = np.asarray(project_ids, dtype=np.int64)
+        self.skill_columns = {}
+        
+        indptr = [0]
+        columns = []
+        levels = []
+        for project_id in project_ids:
+            for skill in requirements.get(project_id, []):
+                column = self.skill_columns.setdefault(skill['skill_id'], len(self.skill_columns))
+                columns.append(column)
+                levels.append(PROFICIENCY_LEVELS.get(skill.get('required_proficiency_level', 'Beginner'), 1))
+            indptr.append(len(columns))
+        
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.columns = np.asarray(columns, dtype=np.int32)
+        self.levels = np.asarray(levels, dtype=np.int8)
+        self.totals = np.diff(self.indptr)
+        # Row index of every stored entry, used to sum per-skill terms per project
+        self.rows = np.repeat(np.arange(len(self.project_ids), dtype=np.int32), self.totals)
+    
+    def __len__(self):
+        return len(self.project_ids)
+    
+    def student_vector(self, student_skills):
+        """Dense proficiency vector over the matrix columns (0 = skill not held)"""
+        vector = np.zeros(len(self.skill_columns), dtype=np.int8)
+        for skill_id, skill in student_skills.items():
+            column = self.skill_columns.get(skill_id)
+            if column is not None:
+                vector[column] = PROFICIENCY_LEVELS.get(skill['proficiency_level'], 1)
+        return vector
+    
+    def score(self, student_skills):
+        """Match score of every project, with the same semantics as calculate_match_score"""
+        n_projects = len(self.project_ids)
+        student_levels = self.student_vector(student_skills)[self.columns]
+        matched = student_levels > 0
+        
+        # 10 points for meeting the requirement, 5 for being one level short
+        bonus = np.where(student_levels >= self.levels, 10,
+                         np.where(student_levels >= self.levels - 1, 5, 0))
+        bonus[~matched] = 0
+        
+        matched_skills = np.bincount(self.rows, weights=matched, minlength=n_projects)
+        proficiency_bonus = np.bincount(self.rows, weights=bonus, minlength=n_projects)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            base_score = (matched_skills / self.totals) * 100
+        bonus_score = np.minimum(proficiency_bonus, self.totals * 10)
+        final_score = np.round(np.minimum(base_score + bonus_score, 100), 2)
+        
+        # Projects without requirements get the default score
+        final_score[self.totals == 0] = NO_REQUIREMENTS_SCORE
+        return final_score
+
+
+def popcount(words):
+    """Number of set bits of every element of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    # SWAR popcount for NumPy < 2.0 (no bitwise_count ufunc)
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((words * np.uint64(0x0101010101010101)) >> np.uint64(56)).view(np.int64)
+
+
+class ProjectSkillBitsets:
+    """Project requirements packed into fixed-width skill bitsets, one per proficiency threshold
+    
+    bits[t, w, i] is word w of project i's bitset of skills required at level
+    >= t + 1 (bit c = the skill of column c), so a project costs
+    3 * ceil(skills / 64) words plus its requirement count, and scoring is AND
+    plus popcount over the few words where the student holds skills. Same
+    interface and scores as ProjectSkillMatrix.
+    """
+    
+    def __init__(self, project_ids, requirements):
+        """Build from project ids (row order) and a project_id -> required skill list mapping"""
+        self.project_ids = np.asarray(project_ids, dtype=np.int64)
+        self.skill_columns = {}
+        
+        rows = []
+        columns = []
+        levels = []
+        for row, project_id in enumerate(project_ids):
+            for skill in requirements.get(project_id, []):
+                rows.append(row)
+                columns.append(self.skill_columns.setdefault(skill['skill_id'], len(self.skill_columns)))
+                levels.append(PROFICIENCY_LEVELS.get(skill.get('required_proficiency_level', 'Beginner'), 1))
+        
+        self.words = max(1, -(-len(self.skill_columns) // 64))
+        self.bits = np.zeros((3, self.words, len(self.project_ids)), dtype=np.uint64)
+        if rows:
+            rows = np.asarray(rows, dtype=np.intp)
+            columns = np.asarray(columns, dtype=np.uint64)
+            levels = np.asarray(levels, dtype=np.intp)
+            words = (columns // np.uint64(64)).astype(np.intp)
+            masks = np.left_shift(np.uint64(1), columns % np.uint64(64))
+            for threshold in range(3):
+                selected = levels > threshold
+                np.bitwise_or.at(self.bits, (threshold, words[selected], rows[selected]), masks[selected])
+        # Requirement count per project (a project lists each skill once)
+        self.totals = np.bincount(np.asarray(rows, dtype=np.intp),
+                                  minlength=len(self.project_ids)).astype(np.int32)
+    
+    @classmethod
+    def from_arrays(cls, project_ids, skill_ids, bits, totals):
+        """Wrap prebuilt arrays (e.g. memory-mapped from a catalog snapshot) without copying them
+        
+        skill_ids lists the skill of each bit column in order.
+        """
+        matrix = cls.__new__(cls)
+        matrix.project_ids = project_ids
+        matrix.skill_columns = {int(skill_id): column for column, skill_id in enumerate(skill_ids)}
+        matrix.words = bits.shape[1]
+        matrix.bits = bits
+        matrix.totals = totals
+        return matrix
+    
+    def __len__(self):
+        return len(self.project_ids)
+    
+    @property
+    def nbytes(self):
+        return self.bits.nbytes + self.totals.nbytes + self.project_ids.nbytes
+    
+    def student_bits(self, student_skills):
+        """(3, words) bitsets to AND with each project: skills held, held below level 2, held below level 3"""
+        held = np.zeros((3, self.words), dtype=np.uint64)
+        for skill_id, skill in student_skills.items():
+            column = self.skill_columns.get(skill_id)
+            if column is not None:
+                bit = np.uint64(1) << np.uint64(column % 64)
+                held[0, column // 64] |= bit
+                level = PROFICIENCY_LEVELS.get(skill['proficiency_level'], 1)
+                for threshold in range(level, 3):
+                    held[threshold, column // 64] |= bit
+        return held
+    
+    def score(self, student_skills):
+        """Match score of every project, with the same semantics as calculate_match_score"""
+        held = self.student_bits(student_skills)
+        
+        # Only the words where the student has bits can contribute
+        counts = np.zeros((3, len(self.project_ids)), dtype=np.int64)
+        for threshold, word in zip(*np.nonzero(held)):
+            counts[threshold] += popcount(self.bits[threshold, word] & held[threshold, word])
+        matched_skills = counts[0]
+        
+        # A held requirement earns 10 points minus 5 per level the student is
+        # short (10 / 5 / 0); they are short of level t on every held
+        # requirement of level >= t that they hold below t
+        proficiency_bonus = 10 * matched_skills - 5 * (counts[1] + counts[2])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            base_score = (matched_skills / self.totals) * 100
+        bonus_score = np.minimum(proficiency_bonus, self.totals * 10)
+        final_score = np.round(np.minimum(base_score + bonus_score, 100), 2)
+        
+        # Projects without requirements get the default score
+        final_score[self.totals == 0] = NO_REQUIREMENTS_SCORE
+        return final_score
+
+
+# Scoring engines selectable with SCORING_ENGINE
+SCORING_ENGINES = {
+    'matrix': ProjectSkillMatrix,
+    'bitset': ProjectSkillBitsets,
+}
+
+
+def select_top(scores, project_ids, limit=None, after=None):
+    """Row indices of the best `limit` projects ordered by (score, project_id) descending
+    
+    `after` is the (score, project_id) of the last row of the previous page;
+    only rows strictly below it in that order are considered. Uses a partial
+    selection so only the returned rows are fully sorted.
+    """
+    # Scores have two decimals and are at most 100, so (score, project_id)
+    # packs losslessly into one integer key
+    id_span = int(project_ids.max()) + 1 if len(project_ids) else 1
+    if after is not None:
+        after_score, after_id = after
+        id_span = max(id_span, after_id + 1)
+    keys = np.rint(scores * 100).astype(np.int64) * id_span + project_ids
+    
+    candidates = np.arange(len(keys))
+    if after is not None:
+        after_key = int(round(after_score * 100)) * id_span + after_id
+        candidates = np.flatnonzero(keys < after_key)
+    
+    if limit is not None and limit < len(candidates):
+        top = np.argpartition(-keys[candidates], limit - 1)[:limit]
+        candidates = candidates[top]
+    
+    return candidates[np.argsort(-keys[candidates], kind='stable')]
+
+
+def first_row_below(project_ids, project_id):
+    """Index of the first id below project_id in project_ids, which must be ordered descending"""
+    return len(project_ids) - int(np.searchsorted(project_ids[::-1], project_id))
+
+
+def score_page(matrix, student_skills, limit=None, after=None):
+    """Score one student against every project and return one page of (match_score, project_id)"""
+    scores = matrix.score(student_skills)
+    rows = select_top(scores, matrix.project_ids, limit, after)
+    return list(zip(scores[rows].tolist(), matrix.project_ids[rows].tolist()))
+
+
+# Matrix loaded in each pool worker and the version it belongs to. A worker
+# reloads it from the version's file on its first task for a newer version,
+# so a catalog change costs one file write instead of a new process pool
+_worker_matrix = None
+_worker_version = None
+
+
+def _load_matrix(version, path):
+    global _worker_matrix, _worker_version
+    if _worker_version != version:
+        with open(path, 'rb') as f:
+            _worker_matrix = pickle.load(f)
+        _worker_version = version
+
+
+def _score_chunk(version, path, students, limit):
+    _load_matrix(version, path)
+    return [(student_id, score_page(_worker_matrix, skills, limit)) for student_id, skills in students]
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _MatrixVersion:
+    """One matrix shipped to the workers through a pickle file; the file is removed once retired and idle"""
+    
+    def __init__(self, number, matrix, path):
+        self.number = number
+        self.matrix = matrix
+        self.path = path
+        self.users = 0
+        self.retired = False
+    
+    def remove(self):
+        _remove_file(self.path)
+
+
+class ScoringPool:
+    """Process pool that scores many students against one shared matrix
+    
+    The worker processes are started once and kept. When the catalog changes,
+    the new matrix is written to a file and loaded by the workers in a
+    background thread while batches are scored in-process; the old file is
+    removed once the batches using it finish.
+    """
+    
+    def __init__(self, workers, min_parallel=64, mp_context='spawn'):
+        self.workers = workers
+        self.min_parallel = min_parallel
+        self.mp_context = mp_context
+        self._executor = None
+        self._current = None
+        self._building = None
+        self._versions = 0
+        self._closed = False
+        self._lock = threading.Lock()
+    
+    def _acquire(self, matrix):
+        """(version, executor) whose workers can load `matrix`, or None (and start preparing it) if not ready yet"""
+        with self._lock:
+            current = self._current
+            if current is not None and current.matrix is matrix:
+                current.users += 1
+                return current, self._executor
+            if self._building is None and not self._closed:
+                self._building = matrix
+                threading.Thread(target=self._build, args=(matrix,), daemon=True).start()
+            return None
+    
+    def _release(self, version):
+        with self._lock:
+            version.users -= 1
+            idle = version.retired and version.users == 0
+        if idle:
+            version.remove()
+    
+    def _retire(self, new=None):
+        """Make `new` the current version and remove the old one's file once no batch uses it"""
+        with self._lock:
+            old, self._current = self._current, new
+            if old is not None:
+                # Batches still mapping on the old version remove it when they finish
+                old.retired = True
+                if old.users:
+                    old = None
+        if old is not None:
+            old.remove()
+    
+    def _build(self, matrix):
+        path = None
+        try:
+            with self._lock:
+                if self._closed:
+                    self._building = None
+                    return
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self.mp_context)
+                    )
+                executor = self._executor
+                self._versions += 1
+                number = self._versions
+            
+            fd, path = tempfile.mkstemp(prefix='scoring-matrix-', suffix='.pickle')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(matrix, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Start the workers (the first time) and load the matrix now rather than on the first batch
+            list(executor.map(_load_matrix, [number] * self.workers, [path] * self.workers))
+        except Exception as e:
+            print(f"[WARN] Could not load the matrix into the scoring pool: {e}")
+            if path is not None:
+                _remove_file(path)
+            with self._lock:
+                self._building = None
+            return
+        
+        version = _MatrixVersion(number, matrix, path)
+        with self._lock:
+            self._building = None
+            closed = self._closed
+        if closed:
+            version.remove()
+        else:
+            self._retire(version)
+    
+    def _discard_executor(self, executor):
+        """Drop a pool whose workers died; the next batch starts a new one"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        self._retire()
+        executor.shutdown(wait=False)
+    
+    def score_many(self, matrix, students, limit=None):
+        """Yield (student_id, page) for each (student_id, student_skills) pair, in input order"""
+        students = list(students)
+        acquired = None
+        if self.workers > 1 and len(students) >= self.min_parallel:
+            acquired = self._acquire(matrix)
+        if acquired is None:
+            for student_id, skills in students:
+                yield student_id, score_page(matrix, skills, limit)
+            return
+        
+        version, executor = acquired
+        done = 0
+        try:
+            # A few chunks per worker keeps them busy without per-student IPC
+            chunk_size = max(1, -(-len(students) // (self.workers * 4)))
+            chunks = [students[i:i + chunk_size] for i in range(0, len(students), chunk_size)]
+            n = len(chunks)
+            for results in executor.map(_score_chunk, [version.number] * n, [version.path] * n, chunks, [limit] * n):
+                for result in results:
+                    yield result
+                    done += 1
+        except BrokenProcessPool as e:
+            print(f"[WARN] Scoring pool workers died, scoring in-process: {e}")
+            self._discard_executor(executor)
+            for student_id, skills in students[done:]:
+                yield student_id, score_page(matrix, skills, limit)
+        finally:
+            self._release(version)
+    
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        self._retire()
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,266 @@
+"""
+In-process full-text search index over project titles and descriptions
+"""
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Title matches count more than description matches
+FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A query term matching a longer word by prefix scores a bit lower than an exact hit
+PREFIX_MATCH_WEIGHT = 0.8
+
+# Bounds on prefix expansion so a one-letter prefix costs the same as a full word
+PREFIX_SCAN_LIMIT = 512
+PREFIX_EXPANSION_LIMIT = 32
+
+
+def tokenize(text):
+    """Lowercased alphanumeric tokens of a string"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class ArrayPostings(Mapping):
+    """term -> posting list over CSR arrays (terms sorted, one row of doc ids and frequencies per term)"""
+    
+    def __init__(self, terms, indptr, doc_ids, frequencies):
+        self._terms = terms
+        self._indptr = indptr
+        self._doc_ids = doc_ids
+        self._frequencies = frequencies
+    
+    def __getitem__(self, term):
+        row = bisect.bisect_left(self._terms, term)
+        if row == len(self._terms) or self._terms[row] != term:
+            raise KeyError(term)
+        start, end = int(self._indptr[row]), int(self._indptr[row + 1])
+        return PostingList(self._doc_ids[start:end], self._frequencies[start:end])
+    
+    def __iter__(self):
+        return iter(self._terms)
+    
+    def __len__(self):
+        return len(self._terms)
+
+
+class PostingList(Mapping):
+    """doc_id -> weighted term frequency of one term, over doc-id-sorted arrays"""
+    
+    def __init__(self, doc_ids, frequencies):
+        self._doc_ids = doc_ids
+        self._frequencies = frequencies
+    
+    def __getitem__(self, doc_id):
+        row = int(np.searchsorted(self._doc_ids, doc_id))
+        if row == len(self._doc_ids) or self._doc_ids[row] != doc_id:
+            raise KeyError(doc_id)
+        return float(self._frequencies[row])
+    
+    def __iter__(self):
+        return iter(self._doc_ids.tolist())
+    
+    def __len__(self):
+        return len(self._doc_ids)
+    
+    def items(self):
+        return zip(self._doc_ids.tolist(), self._frequencies.tolist())
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking, multi-term AND queries and prefix matching
+    
+    An index can also be served from prebuilt posting arrays (from_arrays,
+    e.g. mapped from a catalog snapshot); it is converted to dicts on its
+    first edit.
+    """
+    
+    def __init__(self):
+        self.postings = {}      # term -> {doc_id: weighted term frequency}
+        self.doc_terms = {}     # doc_id -> {term: weighted term frequency}; None while array-backed
+        self.doc_lengths = {}   # doc_id -> weighted document length
+        self.vocabulary = []    # sorted terms, for prefix range lookups
+        self.total_length = 0.0
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def from_arrays(cls, terms, indptr, doc_ids, frequencies, length_ids, lengths):
+        """Index over to_arrays() output without building per-term dicts
+        
+        terms is the sorted vocabulary; postings of terms[i] are
+        doc_ids[indptr[i]:indptr[i + 1]] (ascending) with their frequencies;
+        length_ids / lengths give every document's weighted length.
+        """
+        index = cls()
+        index.vocabulary = terms
+        index.postings = ArrayPostings(terms, indptr, doc_ids, frequencies)
+        index.doc_terms = None
+        index.doc_lengths = dict(zip(length_ids.tolist(), lengths.tolist()))
+        index.total_length = float(sum(index.doc_lengths.values()))
+        return index
+    
+    def to_arrays(self):
+        """(terms, indptr, doc_ids, frequencies, length_ids, lengths) for from_arrays()"""
+        with self._lock:
+            terms = list(self.vocabulary)
+            doc_ids, frequencies = [], []
+            indptr = [0]
+            for term in terms:
+                for doc_id, frequency in sorted(self.postings[term].items()):
+                    doc_ids.append(doc_id)
+                    frequencies.append(frequency)
+                indptr.append(len(doc_ids))
+            return (
+                terms,
+                np.asarray(indptr, dtype=np.int64),
+                np.asarray(doc_ids, dtype=np.int64),
+                np.asarray(frequencies, dtype=np.float64),
+                np.fromiter(self.doc_lengths, dtype=np.int64, count=len(self.doc_lengths)),
+                np.fromiter(self.doc_lengths.values(), dtype=np.float64, count=len(self.doc_lengths)),
+            )
+    
+    def _thaw(self):
+        """Convert an array-backed index to the editable dict form"""
+        if self.doc_terms is not None:
+            return
+        postings = {term: dict(self.postings[term].items()) for term in self.vocabulary}
+        doc_terms = {doc_id: {} for doc_id in self.doc_lengths}
+        for term, documents in postings.items():
+            for doc_id, frequency in documents.items():
+                doc_terms[doc_id][term] = frequency
+        self.postings = postings
+        self.doc_terms = doc_terms
+        self.vocabulary = list(self.vocabulary)
+    
+    def __len__(self):
+        return len(self.doc_lengths)
+    
+    def _remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+    
+    def _index(self, doc_id, fields, new_terms):
+        terms = {}
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+        
+        self._remove(doc_id)
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+        for term, frequency in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                new_terms.append(term)
+            postings[doc_id] = frequency
+    
+    def add(self, doc_id, **fields):
+        """Index (or re-index) a document from named text fields, e.g. title=..., description=..."""
+        with self._lock:
+            self._thaw()
+            new_terms = []
+            self._index(doc_id, fields, new_terms)
+            for term in new_terms:
+                bisect.insort(self.vocabulary, term)
+    
+    def add_many(self, documents):
+        """Index many (doc_id, fields) pairs, sorting the vocabulary once at the end"""
+        with self._lock:
+            self._thaw()
+            new_terms = []
+            for doc_id, fields in documents:
+                self._index(doc_id, fields, new_terms)
+            if new_terms:
+                self.vocabulary = sorted(self.postings)
+    
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        with self._lock:
+            self._thaw()
+            self._remove(doc_id)
+    
+    def _expand(self, token):
+        """Indexed terms matching a query token exactly or by prefix, with their match weight"""
+        start = bisect.bisect_left(self.vocabulary, token)
+        scan_end = min(start + PREFIX_SCAN_LIMIT, len(self.vocabulary))
+        end = bisect.bisect_right(self.vocabulary, token + '\uffff', start, scan_end)
+        matches = self.vocabulary[start:end]
+        if len(matches) > PREFIX_EXPANSION_LIMIT:
+            # Keep the most common completions
+            matches = heapq.nlargest(PREFIX_EXPANSION_LIMIT, matches,
+                                     key=lambda term: len(self.postings[term]))
+        return [(term, 1.0 if term == token else PREFIX_MATCH_WEIGHT) for term in matches]
+    
+    def search(self, query, limit=None, after=None, accept=None):
+        """Rank documents matching every query term; returns [(score, doc_id)] best first
+        
+        Results at or above the (score, doc_id) cursor `after` and documents
+        rejected by accept(doc_id) are dropped before the best `limit` are
+        picked, so one page costs a partial selection, not a full sort.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        
+        with self._lock:
+            n_docs = len(self.doc_lengths)
+            if not n_docs:
+                return []
+            avg_length = self.total_length / n_docs
+            
+            # Per query token, the best score each document earns from any matching term
+            token_scores = []
+            for token in tokens:
+                scores = {}
+                for term, match_weight in self._expand(token):
+                    postings = self.postings[term]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, frequency in postings.items():
+                        norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / avg_length)
+                        score = match_weight * idf * frequency * (K1 + 1) / (frequency + norm)
+                        if score > scores.get(doc_id, 0.0):
+                            scores[doc_id] = score
+                if not scores:
+                    return []
+                token_scores.append(scores)
+        
+        # AND semantics: intersect starting from the most selective token
+        token_scores.sort(key=len)
+        results = []
+        for doc_id, score in token_scores[0].items():
+            for scores in token_scores[1:]:
+                other = scores.get(doc_id)
+                if other is None:
+                    break
+                score += other
+            else:
+                result = (round(score, 6), doc_id)
+                if (after is None or result < after) and (accept is None or accept(doc_id)):
+                    results.append(result)
+        
+        if limit is not None:
+            return heapq.nlargest(limit, results)
+        results.sort(reverse=True)
+        return results
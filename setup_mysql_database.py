@@ -1,145 +1,529 @@
-"""
-Setup MySQL Database - Create tables and insert sample data
-Run this script to set up your database
-"""
-import mysql.connector
-from mysql.connector import Error
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-def read_sql_file(filename):
-    """Read SQL file"""
-    filepath = os.path.join('database', filename)
-    if not os.path.exists(filepath):
-        print(f"[ERROR] File not found: {filepath}")
-        return None
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
-
-def execute_sql_file(connection, filename, description):
-    """Execute SQL file"""
-    print(f"\n{'='*60}")
-    print(f"Executing: {description}")
-    print(f"{'='*60}")
-    
-    sql_content = read_sql_file(filename)
-    if not sql_content:
-        return False
-    
-    cursor = connection.cursor()
-    
-    # Split by semicolon and execute each statement
-    # Remove comments and empty lines
-    lines = sql_content.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        line = line.strip()
-        if line and not line.startswith('--'):
-            cleaned_lines.append(line)
-    
-    # Join and split by semicolon
-    full_text = ' '.join(cleaned_lines)
-    statements = [s.strip() for s in full_text.split(';') if s.strip()]
-    
-    success_count = 0
-    error_count = 0
-    
-    for i, statement in enumerate(statements, 1):
-        try:
-            if statement:
-                cursor.execute(statement)
-                success_count += 1
-                print(f"[OK] Statement {i}/{len(statements)} executed")
-        except Error as e:
-            error_count += 1
-            print(f"[ERROR] Error in statement {i}: {str(e)[:100]}")
-            print(f"      Statement: {statement[:50]}...")
-    
-    connection.commit()
-    cursor.close()
-    
-    print(f"\nResults: {success_count} successful, {error_count} errors")
-    return error_count == 0
-
-def setup_database():
-    """Main setup function"""
-    print("=" * 60)
-    print("Project Recommendation System - MySQL Database Setup")
-    print("=" * 60)
-    
-    # Database configuration
-    db_config = {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'port': int(os.getenv('DB_PORT', 3306)),
-        'user': os.getenv('DB_USER', 'root'),
-        'password': os.getenv('DB_PASSWORD', '@yush2004'),
-    }
-    
-    print(f"\nConnecting to MySQL...")
-    print(f"  Host: {db_config['host']}")
-    print(f"  Port: {db_config['port']}")
-    print(f"  User: {db_config['user']}")
-    
-    try:
-        # First connect without database to create it
-        connection = mysql.connector.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            user=db_config['user'],
-            password=db_config['password']
-        )
-        
-        print("[OK] Connected to MySQL server!\n")
-        
-        # Create database if not exists
-        cursor = connection.cursor()
-        cursor.execute("CREATE DATABASE IF NOT EXISTS project_recommender")
-        cursor.execute("USE project_recommender")
-        cursor.close()
-        connection.close()
-        
-        print("[OK] Database 'project_recommender' created/selected\n")
-        
-        # Reconnect with database
-        db_config['database'] = 'project_recommender'
-        connection = mysql.connector.connect(**db_config)
-        
-        # Execute schema
-        schema_success = execute_sql_file(connection, 'mysql_schema.sql', 'Database Schema (5 Tables)')
-        
-        if schema_success:
-            # Execute sample data
-            execute_sql_file(connection, 'mysql_sample_data.sql', 'Sample Data')
-        
-        connection.close()
-        
-        print("\n" + "=" * 60)
-        print("[OK] Database setup completed!")
-        print("=" * 60)
-        print("\nCreated 5 tables:")
-        print("  1. STUDENTS")
-        print("  2. SKILLS")
-        print("  3. STUDENT_SKILLS")
-        print("  4. PROJECTS")
-        print("  5. PROJECT_SKILLS")
-        print("\nNext steps:")
-        print("  1. Update backend/.env with your credentials")
-        print("  2. Start backend: python app.py")
-        print("  3. Test API: curl http://localhost:5000/api/health")
-        
-        return True
-        
-    except Error as e:
-        print(f"\n[ERROR] Error: {str(e)}")
-        print("\nPlease check:")
-        print("  1. MySQL is running")
-        print("  2. Credentials are correct")
-        print("  3. You have necessary permissions")
-        return False
-
-if __name__ == '__main__':
-    setup_database()
-
+"""
+Setup MySQL Database - Create tables and insert sample data
+Run this script to set up your database
+"""
+import mysql.connector
+from mysql.connector import Error, errorcode
+import argparse
+import hashlib
+import os
+import re
+import time
+from datetime import date, datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Upper bound on the size of one merged multi-row INSERT in bulk mode
+# (well below the server's default max_allowed_packet of 64MB)
+BULK_BATCH_BYTES = 4 * 1024 * 1024
+
+# CSV files are loaded parents first; any other <TABLE>.csv follows alphabetically
+CSV_LOAD_ORDER = ['SKILLS', 'STUDENTS', 'PROJECTS', 'STUDENT_SKILLS', 'PROJECT_SKILLS']
+
+# Tables a full setup creates: the base schema (mysql_schema.sql), then the migrations
+BASE_TABLES = ['STUDENTS', 'SKILLS', 'STUDENT_SKILLS', 'PROJECTS', 'PROJECT_SKILLS']
+MIGRATION_TABLES = ['RECOMMENDATIONS', 'RECOMMENDATION_STATUS', 'CATALOG_VERSION',
+                    'CHANGE_FEED_HEAD', 'CHANGE_FEED', 'STUDENT_NEIGHBOURS', 'SCHEMA_MIGRATIONS']
+
+# Versioned migrations: database/migrations/<version>_<name>.sql, applied in version order
+MIGRATIONS_DIR = os.path.join('database', 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+DELIMITER_PATTERN = re.compile(r'[ \t]*DELIMITER[ \t]+(\S+)[ \t]*(?:\r?\n|$)', re.IGNORECASE)
+INSERT_VALUES_PATTERN = re.compile(
+    r'(INSERT\s+(?:IGNORE\s+)?INTO\s+[`\w.]+\s*(?:\([^()]*\))?\s*VALUES)\s*(\(.*\))',
+    re.IGNORECASE | re.DOTALL
+)
+
+class Progress:
+    """Prints progress and throughput at most every `interval` seconds"""
+    
+    def __init__(self, label, total=None, unit='statements', interval=2.0):
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+    
+    def update(self, count=1):
+        self.done += count
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._report(now)
+    
+    def _report(self, now, prefix='...'):
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        of_total = f"/{self.total}" if self.total is not None else ''
+        print(f"{prefix} {self.label}: {self.done}{of_total} {self.unit} in {elapsed:.1f}s ({rate:,.0f} {self.unit}/s)")
+    
+    def finish(self):
+        """Print the final throughput line and return the elapsed seconds"""
+        now = time.monotonic()
+        self._report(now, prefix='[OK]')
+        return now - self.started
+
+def split_sql_statements(sql_content):
+    """Split a SQL script into statements
+    
+    Semicolons inside quoted strings, quoted identifiers and comments do not end
+    a statement. --, # and /* */ comments are dropped (MySQL /*! */ hints are
+    kept), and DELIMITER lines switch the statement terminator like the mysql
+    client does.
+    """
+    statements = []
+    current = []
+    delimiter = ';'
+    special = re.compile('[\'"`#/\n-]|' + re.escape(delimiter))
+    i = 0
+    length = len(sql_content)
+    at_line_start = True
+    
+    def flush():
+        statement = ''.join(current).strip()
+        current.clear()
+        if statement:
+            statements.append(statement)
+    
+    while i < length:
+        if at_line_start:
+            match = DELIMITER_PATTERN.match(sql_content, i)
+            if match:
+                flush()
+                delimiter = match.group(1)
+                special = re.compile('[\'"`#/\n-]|' + re.escape(delimiter))
+                i = match.end()
+                continue
+        at_line_start = False
+        
+        # Copy plain text up to the next character that may matter
+        match = special.search(sql_content, i)
+        if match is None:
+            current.append(sql_content[i:])
+            break
+        start = match.start()
+        current.append(sql_content[i:start])
+        i = start
+        char = sql_content[i]
+        
+        if sql_content.startswith(delimiter, i):
+            flush()
+            i += len(delimiter)
+        elif char in '\'"`':
+            # Quoted string or identifier; backslash escapes and doubled quotes stay inside
+            end = i + 1
+            while end < length:
+                if sql_content[end] == '\\' and char != '`':
+                    end += 2
+                elif sql_content[end] == char:
+                    if sql_content.startswith(char, end + 1):
+                        end += 2
+                    else:
+                        break
+                else:
+                    end += 1
+            current.append(sql_content[i:end + 1])
+            i = end + 1
+        elif char == '#' or (sql_content.startswith('--', i) and sql_content[i + 2:i + 3] in ('', ' ', '\t', '\r', '\n')):
+            end = sql_content.find('\n', i)
+            i = length if end < 0 else end
+        elif sql_content.startswith('/*!', i):
+            # Version hint: kept whole, as the server reads it, up to the closing */
+            end = sql_content.find('*/', i + 3)
+            end = length if end < 0 else end + 2
+            current.append(sql_content[i:end])
+            i = end
+        elif sql_content.startswith('/*', i):
+            end = sql_content.find('*/', i + 2)
+            current.append(' ')
+            i = length if end < 0 else end + 2
+        else:
+            current.append(char)
+            at_line_start = char == '\n'
+            i += 1
+    
+    flush()
+    return statements
+
+def batch_inserts(statements, max_bytes=BULK_BATCH_BYTES):
+    """Merge runs of INSERT ... VALUES statements into the same table into multi-row INSERTs
+    
+    Yields (statement, number of source statements it replaces).
+    """
+    prefix = None
+    key = None
+    values = []
+    size = 0
+    
+    for statement in statements:
+        match = INSERT_VALUES_PATTERN.fullmatch(statement)
+        if match and 'ON DUPLICATE' not in statement.upper():
+            statement_key = ' '.join(match.group(1).split())
+            if values and (statement_key != key or size + len(match.group(2)) > max_bytes):
+                yield f"{prefix} {', '.join(values)}", len(values)
+                values = []
+            if not values:
+                prefix, key, size = match.group(1), statement_key, len(match.group(1))
+            values.append(match.group(2))
+            size += len(match.group(2)) + 2
+            continue
+        
+        if values:
+            yield f"{prefix} {', '.join(values)}", len(values)
+            values = []
+        yield statement, 1
+    
+    if values:
+        yield f"{prefix} {', '.join(values)}", len(values)
+
+def read_sql_file(filename):
+    """Read SQL file"""
+    filepath = os.path.join('database', filename)
+    if not os.path.exists(filepath):
+        print(f"[ERROR] File not found: {filepath}")
+        return None
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def execute_sql_file(connection, filename, description, bulk=False, verbose=False):
+    """Execute SQL file
+    
+    By default every statement runs on its own and errors are reported and
+    skipped. bulk=True merges consecutive INSERTs into multi-row statements
+    and runs the whole file as one transaction with foreign key and unique
+    checks off, stopping at the first error.
+    """
+    print(f"\n{'='*60}")
+    print(f"Executing: {description}")
+    print(f"{'='*60}")
+    
+    sql_content = read_sql_file(filename)
+    if not sql_content:
+        return False
+    
+    statements = split_sql_statements(sql_content)
+    if bulk:
+        return execute_statements_bulk(connection, statements, description)
+    
+    cursor = connection.cursor()
+    progress = Progress(description, total=len(statements))
+    
+    success_count = 0
+    error_count = 0
+    
+    for i, statement in enumerate(statements, 1):
+        try:
+            cursor.execute(statement)
+            success_count += 1
+            if verbose:
+                print(f"[OK] Statement {i}/{len(statements)} executed")
+        except Error as e:
+            error_count += 1
+            print(f"[ERROR] Error in statement {i}: {str(e)[:100]}")
+            print(f"      Statement: {statement[:50]}...")
+        progress.update()
+    
+    connection.commit()
+    cursor.close()
+    progress.finish()
+    
+    print(f"\nResults: {success_count} successful, {error_count} errors")
+    return error_count == 0
+
+def execute_statements_bulk(connection, statements, description):
+    """Run statements as one transaction with merged INSERTs and deferred constraint checks"""
+    cursor = connection.cursor()
+    progress = Progress(description, total=len(statements))
+    
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+    try:
+        for statement, count in batch_inserts(statements):
+            cursor.execute(statement)
+            progress.update(count)
+        connection.commit()
+    except Error as e:
+        connection.rollback()
+        print(f"[ERROR] Bulk load stopped after {progress.done} statements: {str(e)[:200]}")
+        print(f"      Statement: {statement[:50]}...")
+        return False
+    finally:
+        cursor.execute("SET UNIQUE_CHECKS = 1")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    
+    progress.finish()
+    return True
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    """(version, name, path) of every migration file, oldest first"""
+    migrations = []
+    for filename in os.listdir(directory) if os.path.isdir(directory) else []:
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return sorted(migrations)
+
+def run_migrations(connection, directory=MIGRATIONS_DIR, verbose=False):
+    """Apply every migration not yet recorded in SCHEMA_MIGRATIONS, in version order
+    
+    Indexes that already exist are skipped, so a migration can be applied to a
+    database that was partly set up by hand. Stops at the first failing
+    migration (MySQL DDL is not transactional; fix it and run again).
+    """
+    print(f"\n{'='*60}")
+    print("Applying migrations")
+    print(f"{'='*60}")
+    
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+            version INT PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version, checksum FROM SCHEMA_MIGRATIONS")
+    applied = dict(cursor.fetchall())
+    
+    pending = 0
+    for version, name, path in list_migrations(directory):
+        with open(path, 'r', encoding='utf-8') as f:
+            sql_content = f.read()
+        checksum = hashlib.sha256(sql_content.encode('utf-8')).hexdigest()
+        
+        if version in applied:
+            if applied[version] != checksum:
+                print(f"[WARN] Migration {version} ({name}) changed after it was applied")
+            continue
+        
+        pending += 1
+        progress = Progress(f"Migration {version} ({name})")
+        for statement in split_sql_statements(sql_content):
+            try:
+                cursor.execute(statement)
+                if verbose:
+                    print(f"[OK] {statement[:70]}")
+            except Error as e:
+                if e.errno == errorcode.ER_DUP_KEYNAME:
+                    print(f"[SKIP] Index already exists: {statement[:70]}")
+                else:
+                    print(f"[ERROR] Migration {version} ({name}) failed: {str(e)[:200]}")
+                    print(f"      Statement: {statement[:70]}...")
+                    cursor.close()
+                    return False
+            progress.update()
+        
+        cursor.execute(
+            "INSERT INTO SCHEMA_MIGRATIONS (version, name, checksum) VALUES (%s, %s, %s)",
+            (version, name, checksum)
+        )
+        connection.commit()
+        progress.finish()
+    
+    cursor.close()
+    if not pending:
+        print("[OK] Schema is up to date")
+    return True
+
+def csv_value(value):
+    """One CSV field as LOAD_CSV_OPTIONS reads it: NULL unquoted, strings quoted with doubled quotes"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return f'"{value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()}"'
+    return '"' + str(value).replace('"', '""') + '"'
+
+def write_csv(path, columns, rows):
+    """Write rows to a CSV file that load_csv_files can load (header row = column names)"""
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(','.join(columns) + '\n')
+        for row in rows:
+            f.write(','.join(csv_value(value) for value in row) + '\n')
+
+def load_csv_files(connection, csv_dir):
+    """LOAD DATA LOCAL INFILE every <TABLE>.csv in csv_dir in one transaction
+    
+    The first line of each file names the columns. The connection must be
+    opened with allow_local_infile=True.
+    """
+    files = {
+        os.path.splitext(name)[0].upper(): os.path.join(csv_dir, name)
+        for name in os.listdir(csv_dir)
+        if name.lower().endswith('.csv')
+    }
+    tables = [table for table in CSV_LOAD_ORDER if table in files]
+    tables += sorted(table for table in files if table not in CSV_LOAD_ORDER)
+    
+    print(f"\n{'='*60}")
+    print(f"Loading CSV files from: {csv_dir}")
+    print(f"{'='*60}")
+    
+    cursor = connection.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+    total = Progress('CSV load', unit='rows')
+    try:
+        for table in tables:
+            path = os.path.abspath(files[table])
+            with open(path, encoding='utf-8') as f:
+                columns = f.readline().strip().split(',')
+            
+            progress = Progress(table, unit='rows')
+            cursor.execute(f"""
+                LOAD DATA LOCAL INFILE %s INTO TABLE `{table}`
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+                LINES TERMINATED BY '\\n'
+                IGNORE 1 LINES
+                ({', '.join(f'`{column}`' for column in columns)})
+            """, (path,))
+            progress.update(cursor.rowcount)
+            total.update(cursor.rowcount)
+            progress.finish()
+        connection.commit()
+    except Error as e:
+        connection.rollback()
+        print(f"[ERROR] CSV load failed: {str(e)[:200]}")
+        return False
+    finally:
+        cursor.execute("SET UNIQUE_CHECKS = 1")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    
+    total.finish()
+    return True
+
+def get_db_config():
+    """Server connection settings from the environment (no database selected)"""
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD', '@yush2004'),
+    }
+
+def migrate_database(database='project_recommender', verbose=False):
+    """Apply pending migrations to an existing database"""
+    try:
+        connection = mysql.connector.connect(database=database, **get_db_config())
+        success = run_migrations(connection, verbose=verbose)
+        connection.close()
+        return success
+    except Error as e:
+        print(f"\n[ERROR] Error: {str(e)}")
+        return False
+
+def setup_database(database='project_recommender', bulk=False, csv_dir=None, sample_data=True, verbose=False):
+    """Main setup function"""
+    print("=" * 60)
+    print("Project Recommendation System - MySQL Database Setup")
+    print("=" * 60)
+    
+    # Database configuration
+    db_config = get_db_config()
+    
+    print(f"\nConnecting to MySQL...")
+    print(f"  Host: {db_config['host']}")
+    print(f"  Port: {db_config['port']}")
+    print(f"  User: {db_config['user']}")
+    
+    try:
+        # First connect without database to create it
+        connection = mysql.connector.connect(
+            host=db_config['host'],
+            port=db_config['port'],
+            user=db_config['user'],
+            password=db_config['password'],
+            allow_local_infile=csv_dir is not None
+        )
+        
+        print("[OK] Connected to MySQL server!\n")
+        
+        # Create database if not exists
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+        cursor.execute(f"USE `{database}`")
+        cursor.close()
+        connection.close()
+        
+        print(f"[OK] Database '{database}' created/selected\n")
+        
+        # Reconnect with database
+        db_config['database'] = database
+        connection = mysql.connector.connect(allow_local_infile=csv_dir is not None, **db_config)
+        
+        # Execute schema
+        schema_success = execute_sql_file(connection, 'mysql_schema.sql', f'Database Schema ({len(BASE_TABLES)} Tables)',
+                                          verbose=verbose)
+        
+        if schema_success:
+            # Execute sample data
+            if sample_data:
+                execute_sql_file(connection, 'mysql_sample_data.sql', 'Sample Data', bulk=bulk, verbose=verbose)
+            
+            # Indexes, column changes and the tables added since the base schema
+            # (recommendations, catalog version, change feed, neighbours)
+            run_migrations(connection, verbose=verbose)
+            
+            # Seed rows exported as <TABLE>.csv files
+            if csv_dir is not None:
+                load_csv_files(connection, csv_dir)
+        
+        connection.close()
+        
+        print("\n" + "=" * 60)
+        print("[OK] Database setup completed!")
+        print("=" * 60)
+        tables = BASE_TABLES + MIGRATION_TABLES
+        print(f"\nCreated {len(tables)} tables:")
+        for number, table in enumerate(tables, 1):
+            print(f"  {number}. {table}")
+        print("\nNext steps:")
+        print("  1. Update backend/.env with your credentials")
+        print("  2. Start backend: python app.py")
+        print("  3. Test API: curl http://localhost:5000/api/health")
+        
+        return True
+        
+    except Error as e:
+        print(f"\n[ERROR] Error: {str(e)}")
+        print("\nPlease check:")
+        print("  1. MySQL is running")
+        print("  2. Credentials are correct")
+        print("  3. You have necessary permissions")
+        return False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Create the MySQL database, its tables and seed data')
+    parser.add_argument('--database', default=os.getenv('DB_NAME', 'project_recommender'),
+                        help='database to create (default: %(default)s)')
+    parser.add_argument('--bulk', action='store_true',
+                        help='load sample data as merged multi-row INSERTs in one transaction with '
+                             'foreign key checks off (stops at the first error)')
+    parser.add_argument('--csv-dir',
+                        help='after the schema, LOAD DATA LOCAL INFILE every <TABLE>.csv in this '
+                             'directory (first line = column names, unquoted NULL = NULL)')
+    parser.add_argument('--migrate', action='store_true',
+                        help='only apply pending database/migrations to an existing database')
+    parser.add_argument('--skip-sample-data', action='store_true', help='create the tables only')
+    parser.add_argument('--verbose', action='store_true', help='print every executed statement')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.migrate:
+        raise SystemExit(0 if migrate_database(args.database, verbose=args.verbose) else 1)
+    setup_database(args.database, bulk=args.bulk, csv_dir=args.csv_dir,
+                   sample_data=not args.skip_sample_data, verbose=args.verbose)
+
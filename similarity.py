@@ -0,0 +1,200 @@
+"""
+MinHash + LSH index over project skill sets, for "projects like this one"
+"""
+import itertools
+import threading
+
+import numpy as np
+
+from scoring import PROFICIENCY_LEVELS
+
+# Mersenne prime 2^31 - 1: (a * x + b) stays well inside int64 for x < 2^31
+HASH_PRIME = (1 << 31) - 1
+
+# Odd 64-bit multiplier folding a band's rows into one bucket key (arithmetic wraps modulo 2^64)
+BAND_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Tokens per skill: one per proficiency level up to the required one
+MAX_LEVEL = max(PROFICIENCY_LEVELS.values())
+
+
+def skill_tokens(skills, weighted=True):
+    """Token ids of a requirement list
+    
+    Weighted, a skill required at level n yields n tokens, so the Jaccard
+    similarity of two token sets is the weighted Jaccard of the skill sets
+    with the required levels as weights.
+    """
+    tokens = set()
+    for skill in skills:
+        level = PROFICIENCY_LEVELS.get(skill.get('required_proficiency_level', 'Beginner'), 1) if weighted else 1
+        for rank in range(level):
+            tokens.add(skill['skill_id'] * MAX_LEVEL + rank)
+    return tokens
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class SimilarityIndex:
+    """Projects hashed into LSH buckets by the MinHash signature of their skill tokens
+    
+    Signatures have bands * rows hash values; two projects share a bucket when
+    one band of their signatures is identical, which happens with probability
+    1 - (1 - J^rows)^bands for Jaccard similarity J. A lookup only ranks the
+    projects sharing a bucket, so its cost follows the number of similar
+    projects rather than the catalog size.
+    
+    An index can also be served read-only from per-band sorted key arrays
+    (from_arrays, e.g. mapped from a catalog snapshot); it is converted to
+    the dict form on its first edit.
+    """
+    
+    def __init__(self, bands=32, rows=3, weighted=True, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.weighted = weighted
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, HASH_PRIME, size=bands * rows, dtype=np.int64)
+        self._b = rng.integers(0, HASH_PRIME, size=bands * rows, dtype=np.int64)
+        self.tokens = {}        # project_id -> frozenset of skill tokens
+        self.band_keys = {}     # project_id -> bucket key per band
+        self.buckets = [{} for _ in range(bands)]   # per band: key -> set of project_ids
+        self._arrays = None     # (sorted keys, project ids, requirements) of a read-only index
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def from_arrays(cls, keys, project_ids, requirements, bands=32, rows=3, weighted=True, seed=1):
+        """Read-only index over prebuilt arrays without copying them
+        
+        keys[band] holds the band's bucket keys sorted ascending and
+        project_ids[band] the project of each key; requirements maps
+        project_id -> required skill list, for the exact similarity.
+        """
+        index = cls(bands, rows, weighted, seed)
+        index._arrays = (keys, project_ids, requirements)
+        return index
+    
+    def params(self):
+        """Hashing parameters; indexes with equal parameters give projects the same keys"""
+        return {'bands': self.bands, 'rows': self.rows, 'weighted': self.weighted, 'seed': self.seed}
+    
+    def __len__(self):
+        if self._arrays is not None:
+            return self._arrays[0].shape[1]
+        return len(self.tokens)
+    
+    def signature(self, tokens):
+        """MinHash signature (bands * rows values) of a non-empty token set"""
+        x = np.fromiter(tokens, dtype=np.int64, count=len(tokens))
+        return ((self._a[:, None] * x[None, :] + self._b[:, None]) % HASH_PRIME).min(axis=1)
+    
+    def _band_keys(self, signatures):
+        """(n, bands) uint64 bucket keys of (n, bands * rows) signatures: each band's rows hashed into one integer"""
+        signatures = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.zeros(signatures.shape[:2], dtype=np.uint64)
+        for row in range(self.rows):
+            keys = keys * BAND_HASH_MULTIPLIER + signatures[:, :, row]
+        return keys
+    
+    def keys_many(self, token_sets, chunk_size=2048):
+        """(n, bands) bucket keys of many non-empty token sets, hashed in vectorized chunks"""
+        keys = np.empty((len(token_sets), self.bands), dtype=np.uint64)
+        for start in range(0, len(token_sets), chunk_size):
+            chunk = token_sets[start:start + chunk_size]
+            lengths = np.fromiter((len(tokens) for tokens in chunk), dtype=np.int64, count=len(chunk))
+            x = np.fromiter(itertools.chain.from_iterable(chunk), dtype=np.int64, count=int(lengths.sum()))
+            values = (self._a[:, None] * x[None, :] + self._b[:, None]) % HASH_PRIME
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            keys[start:start + len(chunk)] = self._band_keys(np.minimum.reduceat(values, offsets, axis=1).T)
+        return keys
+    
+    def _thaw(self):
+        """Convert a read-only array index to the editable dict form"""
+        if self._arrays is not None:
+            requirements = self._arrays[2]
+            self._arrays = None
+            self.add_many(requirements.items())
+    
+    def _remove(self, project_id):
+        self.tokens.pop(project_id, None)
+        for band, key in enumerate(self.band_keys.pop(project_id, ())):
+            bucket = self.buckets[band][key]
+            bucket.discard(project_id)
+            if not bucket:
+                del self.buckets[band][key]
+    
+    def add_many(self, entries):
+        """Insert or replace (project_id, required skill list) pairs; projects without skills are not indexed"""
+        with self._lock:
+            self._thaw()
+            indexed = []
+            for project_id, skills in entries:
+                self._remove(project_id)
+                tokens = skill_tokens(skills, self.weighted)
+                if tokens:
+                    indexed.append((project_id, frozenset(tokens)))
+            if not indexed:
+                return
+            keys = self.keys_many([tokens for _, tokens in indexed]).tolist()
+            for (project_id, tokens), project_keys in zip(indexed, keys):
+                self.tokens[project_id] = tokens
+                self.band_keys[project_id] = project_keys
+                for band, key in enumerate(project_keys):
+                    self.buckets[band].setdefault(key, set()).add(project_id)
+    
+    def add(self, project_id, skills):
+        self.add_many([(project_id, skills)])
+    
+    def to_arrays(self):
+        """(keys, project_ids): per band, the bucket keys sorted ascending and the project of each key"""
+        with self._lock:
+            project_ids = np.fromiter(self.band_keys, dtype=np.int64, count=len(self.band_keys))
+            keys = np.array(list(self.band_keys.values()), dtype=np.uint64).reshape(len(project_ids), self.bands).T
+            order = np.argsort(keys, axis=1, kind='stable')
+            return np.take_along_axis(keys, order, axis=1), project_ids[order]
+    
+    def _candidates(self, project_id):
+        """Token set of project_id and the ids sharing a bucket with it, or (None, None) if it is not indexed"""
+        if self._arrays is None:
+            tokens = self.tokens.get(project_id)
+            if tokens is None:
+                return None, None
+            candidates = set()
+            for band, key in enumerate(self.band_keys[project_id]):
+                candidates.update(self.buckets[band].get(key, ()))
+            return tokens, candidates
+        
+        sorted_keys, project_ids, requirements = self._arrays
+        tokens = skill_tokens(requirements.get(project_id, ()), self.weighted)
+        if not tokens:
+            return None, None
+        keys = self._band_keys(self.signature(tokens)[None, :])[0]
+        candidates = set()
+        for band in range(self.bands):
+            start = np.searchsorted(sorted_keys[band], keys[band], side='left')
+            end = np.searchsorted(sorted_keys[band], keys[band], side='right')
+            candidates.update(project_ids[band, start:end].tolist())
+        return tokens, candidates
+    
+    def _tokens_of(self, project_id):
+        if self._arrays is None:
+            return self.tokens[project_id]
+        return skill_tokens(self._arrays[2][project_id], self.weighted)
+    
+    def similar(self, project_id, limit=10):
+        """[(similarity, project_id)] of the projects most like project_id, best first
+        
+        Similarity is the exact (weighted) Jaccard of the skill sets, computed
+        for the LSH candidates only.
+        """
+        with self._lock:
+            tokens, candidates = self._candidates(project_id)
+            if tokens is None:
+                return []
+            candidates.discard(project_id)
+            scored = [(round(jaccard(tokens, self._tokens_of(other)), 4), other) for other in candidates]
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return scored[:limit]
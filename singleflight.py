@@ -0,0 +1,77 @@
+"""
+Request coalescing: concurrent calls with the same key share one execution
+"""
+import threading
+
+
+class _Call:
+    """One in-flight execution and the callers waiting for it"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs a function once per key at a time; callers arriving while it runs wait and get its result
+    
+    Only concurrent callers are coalesced - nothing is cached once the call
+    returns. Works across the threads of one process.
+    """
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+    
+    def do(self, key, function):
+        """Return (result, shared): function()'s result, and whether another caller's run produced it
+        
+        If the shared run raised, every waiter raises the same exception.
+        """
+        if not self.enabled:
+            return function(), False
+        
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+    
+    def stats(self):
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                'enabled': self.enabled,
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'coalesced_ratio': round(self.coalesced / total, 4) if total else 0.0
+            }
@@ -0,0 +1,172 @@
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+# Tests import the backend modules (app, scoring, ...) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The tables app.py uses, in SQLite
+SCHEMA = """
+CREATE TABLE STUDENTS (student_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT COLLATE NOCASE,
+    email TEXT COLLATE NOCASE, password_hash TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE SKILLS (skill_id INTEGER PRIMARY KEY AUTOINCREMENT, skill_name TEXT COLLATE NOCASE,
+    skill_type TEXT COLLATE NOCASE, description TEXT);
+CREATE TABLE STUDENT_SKILLS (student_id INT, skill_id INT, proficiency_level TEXT, years_of_experience INT,
+    PRIMARY KEY (student_id, skill_id));
+CREATE TABLE PROJECTS (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT COLLATE NOCASE, description TEXT,
+    difficulty_level TEXT COLLATE NOCASE, category TEXT COLLATE NOCASE, created_by TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP);
+CREATE TABLE PROJECT_SKILLS (project_id INT, skill_id INT, required_proficiency_level TEXT, is_mandatory TEXT,
+    PRIMARY KEY (project_id, skill_id));
+CREATE TABLE RECOMMENDATIONS (recommendation_id INTEGER PRIMARY KEY AUTOINCREMENT, student_id INT, project_id INT,
+    match_score REAL, recommended_at TIMESTAMP, viewed TEXT DEFAULT 'N', saved TEXT DEFAULT 'N',
+    UNIQUE (student_id, project_id));
+CREATE TABLE RECOMMENDATION_STATUS (student_id INTEGER PRIMARY KEY, refreshed_at TIMESTAMP);
+CREATE TABLE CATALOG_VERSION (id INTEGER PRIMARY KEY, version INT, updated_at TIMESTAMP);
+INSERT INTO CATALOG_VERSION VALUES (1, 0, NULL);
+CREATE TABLE CHANGE_FEED_HEAD (id INTEGER PRIMARY KEY, seq INT NOT NULL DEFAULT 0);
+INSERT INTO CHANGE_FEED_HEAD VALUES (1, 0);
+CREATE TABLE CHANGE_FEED (change_id INTEGER PRIMARY KEY AUTOINCREMENT, seq INT NOT NULL, scope TEXT NOT NULL,
+    entity_id INT, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE STUDENT_NEIGHBOURS (student_id INT NOT NULL, neighbour_id INT NOT NULL, similarity REAL NOT NULL,
+    computed_at TIMESTAMP NOT NULL, PRIMARY KEY (student_id, neighbour_id));
+"""
+
+TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d')
+
+
+def to_sqlite(statement):
+    """The MySQL statement in SQLite syntax, for the subset app.py uses"""
+    statement = statement.replace('%s', '?')
+    statement = re.sub(r'FOR (SHARE|UPDATE)', '', statement)
+    statement = statement.replace('ON DUPLICATE KEY UPDATE', 'ON CONFLICT DO UPDATE SET')
+    return re.sub(r'VALUES\((\w+)\)', r'excluded.\1', statement)
+
+
+class FakeCursor:
+    """mysql.connector-like cursor over SQLite; DATETIME strings come back as datetimes"""
+    
+    def __init__(self, cursor):
+        self._cursor = cursor
+    
+    def execute(self, statement, params=()):
+        self._cursor.execute(to_sqlite(statement), params)
+    
+    def executemany(self, statement, rows):
+        self._cursor.executemany(to_sqlite(statement), rows)
+    
+    @staticmethod
+    def _row(row):
+        return tuple(datetime.fromisoformat(value) if isinstance(value, str) and TIMESTAMP_PATTERN.match(value)
+                     else value for value in row)
+    
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._row(row) if row is not None else None
+    
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+    
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+    
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+    
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+    
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+    
+    def close(self):
+        pass
+
+
+class Database(sqlite3.Connection):
+    """SQLite connection that also keeps the statements the app ran"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = []
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self._database = database
+    
+    @property
+    def in_transaction(self):
+        return self._database.in_transaction
+    
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self._database.cursor())
+    
+    def commit(self):
+        self._database.commit()
+    
+    def rollback(self):
+        self._database.rollback()
+    
+    def start_transaction(self, **kwargs):
+        pass
+    
+    def ping(self, reconnect=False):
+        pass
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """In-memory SQLite database behind the app's connection pool, with fresh per-process caches
+    
+    Every statement the app runs is appended to statements through the
+    pool's instrumentation hook.
+    """
+    import app
+    from catalog import CatalogIndex
+    from change_feed import ChangeFeed
+    from collaborative import ScoreCache
+    from response_cache import ResponseCache
+    from scoring import SCORING_ENGINES
+    
+    database = sqlite3.connect(':memory:', check_same_thread=False, factory=Database)
+    database.executescript(SCHEMA)
+    
+    monkeypatch.setattr(app, '_pool', None)
+    pool = app.get_db_pool()
+    monkeypatch.setattr(pool, '_connect', lambda: (FakeConnection(database), time.monotonic()))
+    on_query = pool.on_query
+    
+    def record(statement, seconds):
+        database.statements.append(statement)
+        if on_query is not None:
+            on_query(statement, seconds)
+    monkeypatch.setattr(pool, 'on_query', record)
+    
+    monkeypatch.setattr(app, 'catalog', CatalogIndex(SCORING_ENGINES[app.SCORING_ENGINE], app.SIMILAR_PROJECTS_WEIGHTED))
+    monkeypatch.setattr(app, 'change_feed', ChangeFeed(app.CHANGE_FEED_RETENTION, app.CHANGE_FEED_MAX_IDS))
+    monkeypatch.setattr(app, 'response_cache', ResponseCache(app.RESPONSE_CACHE_MAX_ENTRIES, app.RESPONSE_CACHE_MAX_BYTES))
+    monkeypatch.setattr(app, 'score_cache', ScoreCache(app.COLLABORATIVE_SCORE_CACHE_BYTES))
+    monkeypatch.setattr(app, '_catalog_floor', {'version': 0})
+    monkeypatch.setattr(app, '_catalog_synced', {'version': 0})
+    app.profile_cache.clear()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def client(fake_db):
+    import app
+    return app.app.test_client()
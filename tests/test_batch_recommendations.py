@@ -0,0 +1,76 @@
+import random
+import time
+
+import pytest
+
+import app
+from scoring import ScoringPool
+
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+
+@pytest.mark.parametrize('student_ids', [[True, 2], [1, False], 'x', [1.0], None])
+def test_batch_rejects_non_integer_student_ids(client, student_ids):
+    response = client.post('/api/recommendations/batch', json={'student_ids': student_ids})
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def cohort(fake_db):
+    """120 projects and 70 students over 12 skills, some students without skills"""
+    rng = random.Random(9)
+    fake_db.executemany("INSERT INTO SKILLS (skill_id, skill_name) VALUES (?, ?)",
+                        [(skill_id, f'Skill {skill_id}') for skill_id in range(1, 13)])
+    for project_id in range(1, 121):
+        fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)", (project_id, f'Project {project_id}'))
+        fake_db.executemany("INSERT INTO PROJECT_SKILLS VALUES (?, ?, ?, 'Y')",
+                            [(project_id, skill_id, rng.choice(LEVELS)) for skill_id in rng.sample(range(1, 13), rng.randint(0, 3))])
+    for student_id in range(1, 71):
+        fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (?, 'S', ?)", (student_id, f's{student_id}@example.com'))
+        fake_db.executemany("INSERT INTO STUDENT_SKILLS VALUES (?, ?, ?, 1)",
+                            [(student_id, skill_id, rng.choice(LEVELS)) for skill_id in rng.sample(range(1, 13), rng.randint(0, 5))])
+    fake_db.commit()
+    return list(range(1, 71))
+
+
+def assert_batch_matches_single_requests(client, student_ids, limit):
+    results = client.post('/api/recommendations/batch', json={'student_ids': student_ids, 'limit': limit}).get_json()['results']
+    assert [result['student_id'] for result in results] == student_ids
+    for result in results:
+        single = client.get(f"/api/recommendations/{result['student_id']}?limit={limit}").get_json()
+        # Same projects, scores and order
+        assert result['recommendations'] == single['recommendations']
+        assert result.get('next_cursor') == single.get('next_cursor')
+    return results
+
+
+def wait_for_workers(pool, timeout=60):
+    deadline = time.monotonic() + timeout
+    while pool._current is None or pool._current.matrix is not app.catalog.snapshot()[3]:
+        assert time.monotonic() < deadline, 'scoring pool did not load the catalog'
+        time.sleep(0.05)
+
+
+@pytest.mark.parametrize('materialized', [True, False])
+def test_batch_ranks_like_the_single_student_endpoint(client, cohort, monkeypatch, materialized):
+    monkeypatch.setattr(app, 'MATERIALIZED_RECOMMENDATIONS', materialized)
+    pool = ScoringPool(2, min_parallel=1)
+    monkeypatch.setattr(app, 'scoring_pool', pool)
+    try:
+        # In-process while the workers start, then on the workers
+        assert_batch_matches_single_requests(client, cohort, 8)
+        wait_for_workers(pool)
+        executor = pool._executor
+        assert_batch_matches_single_requests(client, cohort, 8)
+        
+        # A new project that students holding skills 1 and 2 match fully
+        created = client.post('/api/projects', json={'title': 'New', 'skills': [
+            {'skill_id': 1, 'required_proficiency_level': 'Beginner'},
+            {'skill_id': 2, 'required_proficiency_level': 'Beginner'}]}).get_json()['project_id']
+        assert_batch_matches_single_requests(client, cohort, 8)
+        wait_for_workers(pool)
+        results = assert_batch_matches_single_requests(client, cohort, 8)
+        assert any(project['project_id'] == created for result in results for project in result['recommendations'])
+        assert pool._executor is executor
+    finally:
+        pool.shutdown()
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+import app
+from catalog_snapshot import latest_snapshot_path, snapshot_version, write_snapshot
+from conftest import FakeCursor
+
+
+@pytest.fixture
+def snapshot_dir(fake_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'CATALOG_SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(app, 'CATALOG_SNAPSHOT_CHECK_INTERVAL', 0.0)
+    monkeypatch.setattr(app, '_snapshot_check', {'checked_at': 0.0, 'behind_since': None})
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python')")
+    fake_db.commit()
+    return str(tmp_path)
+
+
+def other_worker_creates(fake_db, project_id):
+    """A project written by another worker, which has not published its snapshot (yet)"""
+    fake_db.execute("INSERT INTO PROJECTS (project_id, title, description) VALUES (?, ?, 'x')",
+                    (project_id, f'Project {project_id}'))
+    fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (?, 1, 'Beginner', 'Y')", (project_id,))
+    app.record_changes(FakeCursor(fake_db.cursor()), 'project', [project_id])
+    fake_db.commit()
+
+
+def other_worker_publishes(fake_db, snapshot_dir):
+    cursor = FakeCursor(fake_db.cursor())
+    write_snapshot(snapshot_dir, app.read_catalog_version(cursor), *app.read_catalog_rows(cursor))
+
+
+def listed_ids(client):
+    """Ids found by a search, which is answered from the catalog index"""
+    return sorted(project['project_id'] for project in client.get('/api/projects?search=project').get_json()['projects'])
+
+
+def test_responses_rendered_from_an_older_snapshot_are_not_served_after_it(client, fake_db, snapshot_dir, monkeypatch):
+    monkeypatch.setattr(app, 'CATALOG_SNAPSHOT_MAX_DELAY', 3600.0)
+    other_worker_creates(fake_db, 1)
+    assert listed_ids(client) == [1]
+    
+    # The change reaches this worker through the feed before the writer's snapshot exists
+    other_worker_creates(fake_db, 2)
+    assert listed_ids(client) == [1]
+    
+    other_worker_publishes(fake_db, snapshot_dir)
+    assert listed_ids(client) == [1, 2]
+    assert listed_ids(client) == [1, 2]
+
+
+def test_workers_recover_when_the_writer_never_publishes(client, fake_db, snapshot_dir, monkeypatch):
+    monkeypatch.setattr(app, 'CATALOG_SNAPSHOT_MAX_DELAY', 0.0)
+    other_worker_creates(fake_db, 1)
+    assert listed_ids(client) == [1]
+    
+    other_worker_creates(fake_db, 2)
+    assert listed_ids(client) == [1, 2]
+    assert snapshot_version(latest_snapshot_path(snapshot_dir)) == app.catalog.version == 2
+    
+    # Publishing fails as well: the catalog is loaded from the database instead
+    monkeypatch.setattr(app, 'write_snapshot', lambda *args, **kwargs: (_ for _ in ()).throw(OSError('disk full')))
+    other_worker_creates(fake_db, 3)
+    assert listed_ids(client) == [1, 2, 3]
+    assert app.catalog.version == 3
+
+
+def test_unreadable_snapshot_keeps_the_current_catalog(client, fake_db, snapshot_dir, monkeypatch):
+    monkeypatch.setattr(app, 'CATALOG_SNAPSHOT_MAX_DELAY', 3600.0)
+    other_worker_creates(fake_db, 1)
+    assert listed_ids(client) == [1]
+    
+    with open(os.path.join(snapshot_dir, f'catalog-{5:020d}.snap'), 'wb') as f:
+        f.write(b'truncated')
+    assert listed_ids(client) == [1]
+    assert app.catalog.version == 1
+
+
+def test_publish_is_skipped_when_the_latest_snapshot_is_current(fake_db, snapshot_dir, monkeypatch):
+    other_worker_creates(fake_db, 1)
+    other_worker_publishes(fake_db, snapshot_dir)
+    
+    monkeypatch.setattr(app, 'write_snapshot', lambda *args, **kwargs: pytest.fail('published twice'))
+    app.publish_catalog_snapshot(FakeCursor(fake_db.cursor()))
+    assert app.catalog.version == 1
+
+
+def test_snapshot_indexes_answer_like_rebuilt_ones(fake_db, snapshot_dir):
+    for project_id in range(1, 30):
+        other_worker_creates(fake_db, project_id)
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (2, 'SQL')")
+    fake_db.execute("INSERT INTO PROJECT_SKILLS SELECT project_id, 2, 'Advanced', 'N' FROM PROJECTS WHERE project_id % 3 = 0")
+    fake_db.commit()
+    other_worker_publishes(fake_db, snapshot_dir)
+    
+    rebuilt = app.CatalogIndex()
+    rebuilt.load(*app.read_catalog_rows(FakeCursor(fake_db.cursor())))
+    assert app.map_newest_snapshot()
+    for terms in ('project', 'project 12', 'x', 'missing'):
+        assert app.catalog.search.search(terms) == rebuilt.search.search(terms)
+    for project_id in range(1, 30):
+        assert app.catalog.similar.similar(project_id, 5) == rebuilt.similar.similar(project_id, 5)
@@ -0,0 +1,116 @@
+import pytest
+
+import app
+from change_feed import ChangeFeed
+
+
+def test_first_poll_only_records_the_head():
+    feed = ChangeFeed(retention=100, max_changes=10)
+    assert not feed.behind(5)
+    assert feed.advance(5, [(5, 'project', 1)]) == []
+    assert feed.seq == 5 and not feed.behind(5) and feed.behind(6)
+
+
+def test_advance_returns_distinct_changes_and_skips_own_writes():
+    feed = ChangeFeed(retention=100, max_changes=10)
+    feed.advance(0)
+    feed.skip(2)
+    rows = [(1, 'project', 7), (1, 'project', 8), (2, 'project', 9), (3, 'student', 4), (3, 'project', 7)]
+    assert feed.advance(3, rows) == [('project', 7), ('project', 8), ('student', 4)]
+    assert feed.seq == 3
+    # Rows at or before the applied sequence are not applied again
+    assert feed.advance(4, rows + [(4, 'catalog', None)]) == [('catalog', None)]
+    assert feed.stats()['changes'] == 4
+
+
+@pytest.mark.parametrize('head, rows', [
+    (250, []),                                              # further behind than the feed keeps
+    (2, [(1, 'project', project_id) for project_id in range(11)]),   # more rows than max_changes
+])
+def test_advance_resets_when_changes_cannot_be_applied_one_by_one(head, rows):
+    feed = ChangeFeed(retention=100, max_changes=10)
+    feed.advance(0)
+    assert feed.advance(head, rows) == [('catalog', None), ('student', None)]
+    assert feed.seq == head and feed.stats()['resets'] == 1
+
+
+@pytest.fixture
+def catalog_rows(fake_db):
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python')")
+    fake_db.executemany("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)",
+                        [(1, 'Data pipeline'), (2, 'Web shop')])
+    fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (1, 1, 'Beginner', 'Y')")
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (1, 'Ada', 'ada@example.com')")
+    fake_db.execute("INSERT INTO STUDENT_SKILLS VALUES (1, 1, 'Beginner', 1)")
+    fake_db.commit()
+
+
+def other_worker_writes(fake_db, scope, entity_ids, feed=True):
+    """Record a write the way another worker's record_changes would"""
+    if scope != 'student':
+        fake_db.execute("UPDATE CATALOG_VERSION SET version = version + 1 WHERE id = 1")
+    if feed:
+        fake_db.execute("UPDATE CHANGE_FEED_HEAD SET seq = seq + 1 WHERE id = 1")
+        seq = fake_db.execute("SELECT seq FROM CHANGE_FEED_HEAD WHERE id = 1").fetchone()[0]
+        fake_db.executemany("INSERT INTO CHANGE_FEED (seq, scope, entity_id) VALUES (?, ?, ?)",
+                            [(seq, scope, entity_id) for entity_id in entity_ids])
+    fake_db.commit()
+
+
+def search_ids(client, query):
+    return [project['project_id'] for project in client.get(f'/api/projects?search={query}').get_json()['projects']]
+
+
+def skill_levels(client):
+    return [skill['proficiency_level'] for skill in client.get('/api/students/1').get_json()['skills']]
+
+
+def test_poll_applies_project_and_student_changes_of_other_workers(client, fake_db, catalog_rows):
+    assert search_ids(client, 'pipeline') == [1]
+    assert skill_levels(client) == ['Beginner']
+    
+    fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (3, 'Pipeline monitor')")
+    fake_db.execute("UPDATE PROJECTS SET title = 'Web pipeline' WHERE project_id = 2")
+    other_worker_writes(fake_db, 'project', [2, 3])
+    fake_db.execute("UPDATE STUDENT_SKILLS SET proficiency_level = 'Advanced' WHERE student_id = 1")
+    other_worker_writes(fake_db, 'student', [1])
+    
+    assert sorted(search_ids(client, 'pipeline')) == [1, 2, 3]
+    assert skill_levels(client) == ['Advanced']
+    assert app.change_feed.seq == 2 and app.change_feed.stats()['resets'] == 0
+
+
+def test_poll_resets_everything_when_too_far_behind(client, fake_db, catalog_rows, monkeypatch):
+    monkeypatch.setattr(app, 'CHANGE_FEED_RETENTION', 2)
+    monkeypatch.setattr(app.change_feed, 'retention', 2)
+    assert search_ids(client, 'pipeline') == [1]
+    assert skill_levels(client) == ['Beginner']
+    
+    fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (3, 'Pipeline monitor')")
+    fake_db.execute("UPDATE STUDENT_SKILLS SET proficiency_level = 'Advanced' WHERE student_id = 1")
+    for _ in range(3):
+        other_worker_writes(fake_db, 'project', [3])
+    # The rows this worker missed are gone
+    fake_db.execute("DELETE FROM CHANGE_FEED")
+    fake_db.commit()
+    
+    assert sorted(search_ids(client, 'pipeline')) == [1, 3]
+    assert skill_levels(client) == ['Advanced']
+    assert app.change_feed.stats()['resets'] == 1
+
+
+def test_catalog_follows_catalog_version_without_the_feed(client, fake_db, catalog_rows, monkeypatch):
+    monkeypatch.setattr(app, 'CHANGE_FEED', False)
+    assert search_ids(client, 'pipeline') == [1]
+    
+    # Rows written without a version bump are not noticed
+    fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (3, 'Pipeline monitor')")
+    fake_db.commit()
+    assert search_ids(client, 'pipeline') == [1]
+    
+    other_worker_writes(fake_db, 'project', [3], feed=False)
+    assert sorted(search_ids(client, 'pipeline')) == [1, 3]
+    
+    # This worker's own writes show up at once
+    assert client.post('/api/projects', json={'title': 'Pipeline tests'}).status_code == 201
+    assert len(search_ids(client, 'pipeline')) == 3
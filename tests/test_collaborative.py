@@ -0,0 +1,51 @@
+import numpy as np
+
+import app
+from collaborative import ScoreCache, blend_scores
+
+
+def test_score_cache_is_bounded_and_follows_the_matrix():
+    cache = ScoreCache(max_bytes=2 * 8 * 10)
+    first, second = object(), object()
+    for key in range(3):
+        cache.put(first, key, np.full(10, float(key)))
+    assert cache.get(first, 0) is None
+    assert cache.get(first, 2).tolist() == [2.0] * 10
+    assert not cache.get(first, 2).flags.writeable
+    
+    # Vectors of another catalog are never served
+    assert cache.get(second, 2) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_collaborative_scores_reuse_neighbour_vectors(client, fake_db, monkeypatch):
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python'), (2, 'SQL')")
+    for project_id, skill_id, level in [(1, 1, 'Beginner'), (2, 2, 'Advanced'), (3, 1, 'Advanced')]:
+        fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)", (project_id, f'Project {project_id}'))
+        fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (?, ?, ?, 'Y')", (project_id, skill_id, level))
+    skills = {1: [(1, 'Beginner')], 2: [(1, 'Advanced'), (2, 'Advanced')], 3: [(2, 'Intermediate')]}
+    for student_id, rows in skills.items():
+        fake_db.execute("INSERT INTO STUDENTS (student_id, name) VALUES (?, 'x')", (student_id,))
+        fake_db.executemany("INSERT INTO STUDENT_SKILLS VALUES (?, ?, ?, 1)",
+                            [(student_id, skill_id, level) for skill_id, level in rows])
+    fake_db.execute("INSERT INTO STUDENT_NEIGHBOURS VALUES (1, 2, 0.9, '2026-01-01 00:00:00'), "
+                    "(1, 3, 0.4, '2026-01-01 00:00:00'), (2, 1, 0.9, '2026-01-01 00:00:00')")
+    fake_db.commit()
+    
+    def scores_of(student_id):
+        response = client.get(f'/api/recommendations/{student_id}?mode=collaborative')
+        return {project['project_id']: project['match_score'] for project in response.get_json()['recommendations']}
+    
+    first = scores_of(1)
+    matrix = app.catalog.matrix()
+    profiles = {student_id: {skill_id: {'proficiency_level': level} for skill_id, level in rows}
+                for student_id, rows in skills.items()}
+    expected = blend_scores(matrix.score(profiles[1]), [matrix.score(profiles[2]), matrix.score(profiles[3])],
+                            [0.9, 0.4], app.COLLABORATIVE_WEIGHT)
+    assert first == dict(zip(matrix.project_ids.tolist(), expected.tolist()))
+    
+    # Student 2 and their neighbour were both scored for student 1's request
+    misses = app.score_cache.stats()['misses']
+    scores_of(2)
+    assert app.score_cache.stats()['misses'] == misses
+    assert scores_of(1) == first
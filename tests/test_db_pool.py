@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from conftest import FakeConnection
+from db_pool import ConnectionPool, PoolTimeoutError
+
+
+class TrackedConnection(FakeConnection):
+    def __init__(self, database):
+        super().__init__(database)
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool of 2 connections plus 1 overflow over an in-memory SQLite database"""
+    database = sqlite3.connect(':memory:', check_same_thread=False)
+    database.execute('CREATE TABLE T (x INT)')
+    pool = ConnectionPool({}, pool_size=2, max_overflow=1, timeout=0.2)
+    pool.opened = []
+    
+    def connect():
+        connection = TrackedConnection(database)
+        pool.opened.append(connection)
+        return connection, time.monotonic()
+    monkeypatch.setattr(pool, '_connect', connect)
+    yield pool
+    database.close()
+
+
+def test_released_connections_are_reused(pool):
+    first = pool.acquire()
+    raw = first._raw
+    first.close()
+    first.close()
+    assert first.closed
+    
+    second = pool.acquire()
+    assert second._raw is raw
+    assert len(pool.opened) == 1
+    assert pool.stats()['in_use'] == 1
+    second.close()
+    assert pool.stats()['in_use'] == 0 and pool.stats()['idle'] == 1
+
+
+def test_release_rolls_back_an_open_transaction(pool):
+    connection = pool.acquire()
+    cursor = connection.cursor()
+    cursor.execute('INSERT INTO T VALUES (1)')
+    assert connection.in_transaction
+    connection.close()
+    
+    connection = pool.acquire()
+    cursor = connection.cursor()
+    cursor.execute('SELECT COUNT(*) FROM T')
+    assert cursor.fetchone() == (0,)
+    connection.close()
+
+
+def test_overflow_connections_are_closed_on_release(pool):
+    connections = [pool.acquire() for _ in range(3)]
+    assert len(pool.opened) == 3
+    for connection in connections:
+        connection.close()
+    
+    assert [connection.closed for connection in pool.opened] == [False, False, True]
+    assert pool.stats()['idle'] == 2
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted(pool):
+    connections = [pool.acquire() for _ in range(3)]
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.2
+    assert pool.stats()['checkout_failures'] == 1
+    
+    # A waiting checkout gets the connection released while it waits
+    raw = connections[0]._raw
+    threading.Timer(0.05, connections[0].close).start()
+    connection = pool.acquire()
+    assert connection._raw is raw
+    assert len(pool.opened) == 3
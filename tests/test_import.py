@@ -0,0 +1,80 @@
+import json
+
+import app
+
+
+def ndjson(records):
+    return '\n'.join(json.dumps(record) for record in records)
+
+
+def test_project_import_materializes_scores_and_updates_the_catalog(client, fake_db, monkeypatch):
+    monkeypatch.setattr(app, 'IMPORT_CHUNK_SIZE', 2)
+    fake_db.executemany("INSERT INTO SKILLS (skill_id, skill_name) VALUES (?, ?)",
+                        [(skill_id, f'Skill {skill_id}') for skill_id in range(1, 6)])
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (1, 'Ada', 'ada@example.com')")
+    fake_db.executemany("INSERT INTO STUDENT_SKILLS VALUES (1, ?, ?, 1)", [(1, 'Advanced'), (2, 'Beginner')])
+    fake_db.execute("INSERT INTO RECOMMENDATION_STATUS (student_id) VALUES (1)")
+    fake_db.commit()
+    # Load the (empty) catalog before the import
+    assert client.get('/api/projects').get_json()['projects'] == []
+    
+    requirements = [
+        [{'skill_id': 1, 'required_proficiency_level': 'Intermediate'}],
+        [{'skill_id': 2, 'required_proficiency_level': 'Advanced'}, {'skill_id': 3}],
+        [{'skill_id': 4}],
+        [],
+        [{'skill_id': 1}, {'skill_id': 2, 'required_proficiency_level': 'Intermediate'}, {'skill_id': 5}],
+    ]
+    body = ndjson({'title': f'Project {i}', 'skills': skills} for i, skills in enumerate(requirements))
+    summary = client.post('/api/projects/import', data=body).get_json()
+    assert summary['created'] == len(requirements)
+    
+    student_skills = {1: {'proficiency_level': 'Advanced'}, 2: {'proficiency_level': 'Beginner'}}
+    expected = {}
+    for result, skills in zip(summary['results'], requirements):
+        if any(skill['skill_id'] in student_skills for skill in skills):
+            expected[result['project_id']] = app.calculate_match_score(student_skills, skills)
+    stored = dict(fake_db.execute("SELECT project_id, match_score FROM RECOMMENDATIONS WHERE student_id = 1"))
+    assert stored == expected
+    
+    listed = client.get('/api/projects').get_json()['projects']
+    assert sorted(project['project_id'] for project in listed) == sorted(r['project_id'] for r in summary['results'])
+
+
+def test_import_rechecks_titles_created_after_the_preload(client, fake_db, monkeypatch):
+    monkeypatch.setattr(app, 'IMPORT_CHUNK_SIZE', 2)
+    insert_project_rows = app.insert_project_rows
+    
+    def insert_and_race(cursor, rows, imported):
+        result = insert_project_rows(cursor, rows, imported)
+        if rows[0]['title'] == 'Project 0':
+            # Another request creates a title of the next chunk
+            fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (100, 'PROJECT 2')")
+        return result
+    monkeypatch.setattr(app, 'insert_project_rows', insert_and_race)
+    
+    summary = client.post('/api/projects/import', data=ndjson({'title': f'Project {i}'} for i in range(4))).get_json()
+    assert [result['status'] for result in summary['results']] == ['created', 'created', 'duplicate', 'created']
+    assert summary['results'][2]['project_id'] == 100
+    assert fake_db.execute("SELECT COUNT(*) FROM PROJECTS WHERE title LIKE 'project 2'").fetchone()[0] == 1
+
+
+def test_import_rolls_back_a_chunk_on_any_error(client, fake_db, monkeypatch):
+    monkeypatch.setattr(app, 'IMPORT_CHUNK_SIZE', 2)
+    insert_student_rows = app.insert_student_rows
+    
+    def insert_then_fail(cursor, rows):
+        result = insert_student_rows(cursor, rows)
+        if rows[0]['email'] == 's2@example.com':
+            raise KeyError('skill_id')
+        return result
+    monkeypatch.setattr(app, 'insert_student_rows', insert_then_fail)
+    
+    body = ndjson({'name': f'S{i}', 'email': f's{i}@example.com'} for i in range(6))
+    response = client.post('/api/students/import', data=body)
+    assert response.status_code == 200
+    assert [result['status'] for result in response.get_json()['results']] == [
+        'created', 'created', 'error', 'error', 'created', 'created']
+    emails = [row[0] for row in fake_db.execute("SELECT email FROM STUDENTS ORDER BY email")]
+    assert emails == ['s0@example.com', 's1@example.com', 's4@example.com', 's5@example.com']
+    assert app.get_db_pool().stats()['in_use'] == 0
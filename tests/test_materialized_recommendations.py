@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+import app
+from conftest import FakeConnection, FakeCursor
+
+
+@pytest.mark.parametrize('overfetch', [0, 3, 10])
+def test_stored_scores_skip_deleted_projects_without_shortening_the_page(fake_db, monkeypatch, overfetch):
+    monkeypatch.setattr(app, 'MATERIALIZED_OVERFETCH', overfetch)
+    # Projects 1-30 scored 0.99 down to 0.70; every other one has left the catalog
+    fake_db.executemany("INSERT INTO RECOMMENDATIONS (student_id, project_id, match_score) VALUES (1, ?, ?)",
+                        [(project_id, round(1 - project_id / 100, 2)) for project_id in range(1, 31)])
+    catalog_projects = {project_id: {} for project_id in range(2, 31, 2)}
+    cursor = FakeCursor(fake_db.cursor())
+    
+    page = app.read_stored_scores(cursor, 1, catalog_projects, 5, None)
+    assert page == [(0.98, 2), (0.96, 4), (0.94, 6), (0.92, 8), (0.9, 10)]
+    
+    page = app.read_stored_scores(cursor, 1, catalog_projects, 5, page[-1])
+    assert page == [(0.88, 12), (0.86, 14), (0.84, 16), (0.82, 18), (0.8, 20)]
+    
+    assert len(app.read_stored_scores(cursor, 1, catalog_projects, 100, None)) == 15
+    assert len(app.read_stored_scores(cursor, 1, catalog_projects, None, None)) == 15
+
+
+def test_recommendations_read_the_replica_and_score_new_students_on_the_primary(client, fake_db, monkeypatch):
+    monkeypatch.setattr(app, 'MATERIALIZED_RECOMMENDATIONS', True)
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python')")
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name) VALUES (1, 'Ada')")
+    fake_db.execute("INSERT INTO STUDENT_SKILLS VALUES (1, 1, 'Advanced', 3)")
+    for project_id in range(1, 4):
+        fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)", (project_id, f'Project {project_id}'))
+    fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (1, 1, 'Beginner', 'Y'), (2, 1, 'Advanced', 'Y')")
+    fake_db.commit()
+    
+    replica = sqlite3.connect(':memory:', check_same_thread=False)
+    fake_db.backup(replica)
+    monkeypatch.setattr(app, 'acquire_replica_connection', lambda: FakeConnection(replica))
+    
+    # The student has no stored scores yet: they are written and read on the primary
+    first = client.get('/api/recommendations/1').get_json()['recommendations']
+    assert fake_db.execute('SELECT COUNT(*) FROM RECOMMENDATION_STATUS').fetchone() == (1,)
+    assert replica.execute('SELECT COUNT(*) FROM RECOMMENDATION_STATUS').fetchone() == (0,)
+    
+    # Once the replica has caught up, the primary is not queried at all
+    fake_db.backup(replica)
+    fake_db.statements.clear()
+    assert client.get('/api/recommendations/1').get_json()['recommendations'] == first
+    assert fake_db.statements == []
+    assert [project['project_id'] for project in first] == [2, 1, 3]
+    
+    # A project this worker created is not in the replica's stored scores yet
+    response = client.post('/api/projects', json={
+        'title': 'Project 4', 'skills': [{'skill_id': 1, 'required_proficiency_level': 'Advanced'}]
+    })
+    assert response.status_code == 201
+    fake_db.statements.clear()
+    recommendations = client.get('/api/recommendations/1').get_json()['recommendations']
+    assert [(project['project_id'], project['match_score']) for project in recommendations][:2] == [(4, 100.0), (2, 100.0)]
+    assert fake_db.statements
+    
+    fake_db.backup(replica)
+    fake_db.statements.clear()
+    assert client.get('/api/recommendations/1').get_json()['recommendations'] == recommendations
+    assert fake_db.statements == []
+
+
+def test_materialized_pages_walk_every_tier_like_live_scoring(client, fake_db, monkeypatch):
+    monkeypatch.setattr(app, 'MATERIALIZED_RECOMMENDATIONS', True)
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python'), (2, 'SQL')")
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name) VALUES (1, 'Ada')")
+    fake_db.execute("INSERT INTO STUDENT_SKILLS VALUES (1, 1, 'Intermediate', 3)")
+    for project_id in range(1, 61):
+        fake_db.execute("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)", (project_id, f'Project {project_id}'))
+        # Every fifth project matches, every seventh has no requirements, the rest score 0
+        if project_id % 7:
+            skill_id = 1 if project_id % 5 == 0 else 2
+            fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (?, ?, ?, 'Y')",
+                            (project_id, skill_id, ['Beginner', 'Advanced'][project_id % 2]))
+    fake_db.commit()
+    
+    pages, cursor = [], None
+    while True:
+        response = client.get('/api/recommendations/1?limit=7' + (f'&cursor={cursor}' if cursor else ''))
+        body = response.get_json()
+        pages.append([(project['match_score'], project['project_id']) for project in body['recommendations']])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    
+    matrix = app.catalog.matrix()
+    expected = app.score_page(matrix, {1: {'proficiency_level': 'Intermediate'}})
+    assert [row for page in pages for row in page] == expected
+    assert all(len(page) == 7 for page in pages[:-1])
+    # The zero tier reads stored ids one id range at a time
+    zero_reads = [statement for statement in fake_db.statements
+                  if ' '.join(statement.split()).startswith('SELECT project_id FROM RECOMMENDATIONS')]
+    assert zero_reads and all('BETWEEN' in statement for statement in zero_reads)
@@ -0,0 +1,95 @@
+import re
+
+import pytest
+
+import app
+import metrics
+from metrics import MetricsRegistry, SlowQueryLog
+
+
+def sample(text, name, **labels):
+    """Value of one series in a Prometheus text exposition, None if it is absent"""
+    label_text = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    series = f'{name}{{{label_text}}}' if labels else name
+    match = re.search(rf'^{re.escape(series)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_registry_renders_every_kind():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    registry.gauge('connections', 'Connections', lambda: {('idle',): 2}, ('state',))
+    registry.callback_counter('lookups_total', 'Lookups', lambda: {('hit',): 7}, ('result',))
+    registry.gauge('broken', 'Fails at scrape time', lambda: 1 / 0)
+    
+    requests.inc('/a')
+    requests.inc('/a', amount=2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    
+    text = registry.render()
+    assert sample(text, 'requests_total', route='/a') == 3
+    assert [sample(text, 'latency_seconds_bucket', le=le) for le in ('0.1', '1', '+Inf')] == [1, 2, 3]
+    assert sample(text, 'latency_seconds_sum') == 5.55
+    assert sample(text, 'latency_seconds_count') == 3
+    assert sample(text, 'connections', state='idle') == 2
+    assert '# TYPE connections gauge' in text
+    assert '# TYPE lookups_total counter' in text
+    assert sample(text, 'lookups_total', result='hit') == 7
+    # The failing callback drops its own series only
+    assert '# TYPE broken gauge' in text
+
+
+def test_slow_query_log_prints_at_most_once_per_interval(monkeypatch, capsys):
+    now = [1000.0]
+    monkeypatch.setattr(metrics.time, 'monotonic', lambda: now[0])
+    log = SlowQueryLog(threshold_ms=100, max_entries=3, print_interval=60)
+    
+    assert not log.record('SELECT 1', 0.05, '/fast')
+    for i in range(5):
+        assert log.record(f'SELECT {i}', 0.2, '/slow')
+    printed = capsys.readouterr().out.splitlines()
+    assert printed == ['Slow query (200.0 ms) on /slow: SELECT 0']
+    # Every slow statement is still kept, up to max_entries
+    assert [entry['statement'] for entry in log.entries()] == ['SELECT 4', 'SELECT 3', 'SELECT 2']
+    
+    now[0] += 60
+    log.record('SELECT 5', 0.3, '/slow')
+    assert capsys.readouterr().out.splitlines() == [
+        'Slow query (300.0 ms) on /slow: SELECT 5 (4 more since the last one printed)']
+
+
+def test_slow_query_log_without_interval_prints_every_statement(capsys):
+    log = SlowQueryLog(threshold_ms=0, print_interval=0)
+    for i in range(3):
+        log.record(f'SELECT {i}', 0.001, '/a')
+    assert len(capsys.readouterr().out.splitlines()) == 3
+
+
+@pytest.fixture
+def projects(fake_db):
+    fake_db.executemany("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)",
+                        [(project_id, f'Project {project_id}') for project_id in range(1, 4)])
+    fake_db.commit()
+
+
+def test_metrics_endpoint_counts_cache_lookups_and_slow_queries(client, projects, monkeypatch, capsys):
+    monkeypatch.setattr(app, 'slow_query_log', SlowQueryLog(threshold_ms=0, print_interval=60))
+    before = client.get('/api/metrics').get_data(as_text=True)
+    slow_before = sample(before, 'db_slow_queries_total', route='/api/projects') or 0
+    
+    assert client.get('/api/projects').status_code == 200
+    assert client.get('/api/projects').status_code == 200
+    
+    text = client.get('/api/metrics').get_data(as_text=True)
+    assert '# TYPE cache_lookups_total counter' in text
+    assert '# TYPE coalesced_requests_total counter' in text
+    assert sample(text, 'cache_lookups_total', cache='responses', result='miss') == 1
+    assert sample(text, 'cache_lookups_total', cache='responses', result='hit') == 1
+    assert sample(text, 'db_slow_queries_total', route='/api/projects') > slow_before
+    
+    # Every statement counted as slow, but stdout got a single line
+    assert sum(line.startswith('Slow query') for line in capsys.readouterr().out.splitlines()) == 1
+    assert sample(text, 'http_request_duration_seconds_count', method='GET', route='/api/projects', status='200') >= 2
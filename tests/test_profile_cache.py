@@ -0,0 +1,66 @@
+import pytest
+
+from profile_cache import LocalProfileCache, ProfileCache, create_profile_cache
+
+
+class IncompleteProfileCache(ProfileCache):
+    def get(self, student_id):
+        return None
+
+
+def test_backends_must_implement_every_operation():
+    with pytest.raises(TypeError):
+        ProfileCache()
+    with pytest.raises(TypeError):
+        IncompleteProfileCache()
+
+
+def test_plugin_backend_must_be_a_profile_cache():
+    with pytest.raises(ValueError):
+        create_profile_cache('collections:OrderedDict')
+
+
+def test_local_cache_round_trip_and_counts():
+    cache = create_profile_cache('local', ttl=300, max_entries=2)
+    assert isinstance(cache, LocalProfileCache)
+    assert cache.get(1) is None
+    cache.set(1, {'student_id': 1})
+    assert cache.get(1) == {'student_id': 1}
+    cache.delete(1)
+    assert cache.get(1) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_local_cache_keeps_the_newest_version():
+    cache = LocalProfileCache(max_entries=10, ttl=300)
+    cache.set(1, {'name': 'new'}, version=5)
+    cache.set(1, {'name': 'old'}, version=4)
+    assert cache.get(1) == {'name': 'new'}
+    
+    # A delete leaves its version behind: older reads are still refused, newer ones stored
+    cache.delete(1, version=7)
+    cache.set(1, {'name': 'old'}, version=6)
+    assert cache.get(1) is None
+    cache.set(1, {'name': 'newer'}, version=7)
+    assert cache.get(1) == {'name': 'newer'}
+
+
+def test_profile_read_before_a_write_does_not_replace_its_write_through(client, fake_db, monkeypatch):
+    import app
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python')")
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (1, 'Old', 'ada@example.com')")
+    fake_db.commit()
+    load = app.load_student_profile
+    
+    def load_then_write(cursor, student_id):
+        # Another request updates the student after this one read the row
+        profile = load(cursor, student_id)
+        monkeypatch.setattr(app, 'load_student_profile', load)
+        response = client.put('/api/students/1', json={'name': 'New', 'email': 'ada@example.com', 'skills': []})
+        assert response.status_code == 200
+        return profile
+    monkeypatch.setattr(app, 'load_student_profile', load_then_write)
+    
+    assert client.get('/api/students/1').get_json()['name'] == 'Old'
+    assert app.profile_cache.get(1)['name'] == 'New'
+    assert client.get('/api/students/1').get_json()['name'] == 'New'
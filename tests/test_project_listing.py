@@ -0,0 +1,163 @@
+import json
+import random
+
+import pytest
+from flask import has_request_context
+
+import app
+
+
+@pytest.fixture
+def catalog_rows(fake_db):
+    """600 projects with one to four required skills each"""
+    rng = random.Random(0)
+    fake_db.executemany("INSERT INTO SKILLS (skill_id, skill_name, skill_type) VALUES (?, ?, 'Technical')",
+                        [(skill_id, f'Skill {skill_id}') for skill_id in range(1, 21)])
+    for project_id in range(1, 601):
+        fake_db.execute(
+            "INSERT INTO PROJECTS (project_id, title, description, difficulty_level, category, created_at) "
+            "VALUES (?, ?, 'A data pipeline project', ?, ?, datetime('2024-01-01', ?))",
+            (project_id, f'Project {project_id}', rng.choice(['Beginner', 'Intermediate']),
+             rng.choice(['Web', 'Data']), f'+{project_id} minutes'))
+        for skill_id in rng.sample(range(1, 21), rng.randint(1, 4)):
+            fake_db.execute("INSERT INTO PROJECT_SKILLS VALUES (?, ?, 'Intermediate', 'Y')", (project_id, skill_id))
+    fake_db.commit()
+
+
+def count_queries(client, fake_db, query):
+    del fake_db.statements[:]
+    response = client.get('/api/projects?' + query)
+    assert response.status_code == 200
+    return len(fake_db.statements), response.get_json()['projects']
+
+
+@pytest.mark.parametrize('filters', ['', 'category=Data', 'difficulty=Beginner&category=Web', 'search=pipeline'])
+def test_listing_query_count_does_not_grow_with_page_size(client, fake_db, catalog_rows, filters):
+    # The first request also loads the catalog and change feed position
+    count_queries(client, fake_db, filters + '&limit=2')
+    counts = {}
+    for limit in (1, 20, 100):
+        counts[limit], projects = count_queries(client, fake_db, f'{filters}&limit={limit}')
+        assert len(projects) == limit
+        assert all(project['skills'] for project in projects)
+    assert counts[1] == counts[20] == counts[100]
+
+
+def walk_pages(client, query, limit):
+    """Every page of a listing, following next_cursor until it runs out"""
+    pages, after = [], None
+    while True:
+        args = dict(query, limit=limit, **({'after': after} if after else {}))
+        body = client.get('/api/projects', query_string=args).get_json()
+        pages.append(body['projects'])
+        after = body['next_cursor']
+        if after is None:
+            return pages
+
+
+def test_unpaged_listing_is_the_first_page(client, catalog_rows):
+    body = client.get('/api/projects').get_json()
+    assert len(body['projects']) == app.PROJECTS_MAX_LIMIT
+    assert body['next_cursor'] == client.get('/api/projects?limit=100').get_json()['next_cursor']
+
+
+@pytest.mark.parametrize('limit', [1, 7, 50])
+def test_listing_pages_have_no_gaps_or_duplicates_when_timestamps_tie(client, fake_db, limit):
+    # Three projects per timestamp
+    fake_db.executemany(
+        "INSERT INTO PROJECTS (project_id, title, difficulty_level, created_at) "
+        "VALUES (?, ?, ?, datetime('2024-01-01', ?))",
+        [(project_id, f'Project {project_id}', ['Beginner', 'Advanced'][project_id % 2], f'+{project_id // 3} hours')
+         for project_id in range(1, 61)])
+    fake_db.commit()
+    
+    pages = walk_pages(client, {}, limit)
+    listed = [(project['created_at'], project['project_id']) for page in pages for project in page]
+    assert listed == sorted(listed, reverse=True)
+    assert [project_id for _, project_id in listed] == sorted(range(1, 61), key=lambda i: (i // 3, i), reverse=True)
+    assert all(len(page) == limit for page in pages[:-1])
+    
+    beginner = [project['project_id'] for page in walk_pages(client, {'difficulty': 'beginner'}, limit) for project in page]
+    assert beginner == [project_id for _, project_id in listed if project_id % 2 == 0]
+
+
+@pytest.mark.parametrize('limit', [1, 4, 25])
+def test_search_pages_have_no_gaps_or_duplicates_when_scores_tie(client, fake_db, limit):
+    # Equal titles and descriptions score the same; every third one matches twice
+    fake_db.executemany(
+        "INSERT INTO PROJECTS (project_id, title, description, category) VALUES (?, ?, 'A pipeline', ?)",
+        [(project_id, 'Data pipeline' if project_id % 3 else 'Data pipeline pipeline', ['Web', 'Data'][project_id % 2])
+         for project_id in range(1, 41)])
+    fake_db.commit()
+    
+    pages = walk_pages(client, {'search': 'pipeline'}, limit)
+    listed = [(project['relevance'], project['project_id']) for page in pages for project in page]
+    assert listed == sorted(listed, reverse=True)
+    assert sorted(project_id for _, project_id in listed) == list(range(1, 41))
+    assert len({relevance for relevance, _ in listed}) == 2
+    
+    data = [project['project_id'] for page in walk_pages(client, {'search': 'pipeline', 'category': 'Data'}, limit)
+            for project in page]
+    assert data == [project_id for _, project_id in listed if project_id % 2]
+
+
+def read_stream(client, query, fmt):
+    """Projects of a streamed listing, after the response (and its connections) are closed"""
+    args = dict(query, **({'format': 'ndjson'} if fmt == 'ndjson' else {'stream': 'true'}))
+    response = client.get('/api/projects', query_string=args)
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    response.close()
+    if fmt == 'ndjson':
+        return [json.loads(line) for line in body.splitlines()]
+    return json.loads(body)
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'json'])
+@pytest.mark.parametrize('query', [{}, {'category': 'Data'}, {'search': 'pipeline'}, {'search': 'project 1', 'difficulty': 'Beginner'}])
+def test_streamed_listing_matches_the_pages_and_releases_its_connections(client, catalog_rows, monkeypatch, query, fmt):
+    monkeypatch.setattr(app, 'STREAM_BATCH_SIZE', 64)
+    paged = [project for page in walk_pages(client, query, 100) for project in page]
+    assert paged
+    
+    assert read_stream(client, query, fmt) == paged
+    assert app.get_db_pool().stats()['in_use'] == 0
+    
+    # The cursor key still applies to a stream
+    first = client.get('/api/projects', query_string=dict(query, limit=10)).get_json()
+    assert read_stream(client, dict(query, after=first['next_cursor']), fmt) == paged[10:]
+    assert app.get_db_pool().stats()['in_use'] == 0
+
+
+def test_streamed_search_reads_the_catalog_inside_the_request(client, catalog_rows, monkeypatch):
+    get_catalog = app.get_catalog
+    
+    def checked_get_catalog(cursor):
+        assert has_request_context()
+        return get_catalog(cursor)
+    monkeypatch.setattr(app, 'get_catalog', checked_get_catalog)
+    
+    assert len(read_stream(client, {'search': 'pipeline'}, 'ndjson')) == 600
+
+
+def test_abandoned_stream_releases_its_connections(client, catalog_rows, monkeypatch):
+    monkeypatch.setattr(app, 'STREAM_BATCH_SIZE', 16)
+    for query in ({}, {'search': 'pipeline'}):
+        response = client.get('/api/projects', query_string=dict(query, format='ndjson'))
+        assert json.loads(next(response.response))['project_id']
+        assert app.get_db_pool().stats()['in_use'] > 0
+        response.close()
+        assert app.get_db_pool().stats()['in_use'] == 0
+
+
+def test_filters_and_duplicate_titles_ignore_case(client, catalog_rows):
+    # The fake schema's NOCASE columns stand in for the case-insensitive collation of migration 001
+    data = [project['project_id'] for page in walk_pages(client, {'category': 'data'}, 100) for project in page]
+    assert data == [project['project_id'] for page in walk_pages(client, {'category': 'Data'}, 100) for project in page]
+    assert data
+    
+    created = client.post('/api/projects', json={'title': 'Case Study'})
+    assert created.status_code == 201
+    duplicate = client.post('/api/projects', json={'title': 'CASE study'})
+    assert duplicate.status_code == 409
+    assert duplicate.get_json()['project_id'] == created.get_json()['project_id']
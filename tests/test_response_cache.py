@@ -0,0 +1,66 @@
+import pytest
+
+import app
+from response_cache import CacheEntry, ResponseCache
+
+
+@pytest.fixture
+def catalog_rows(fake_db):
+    fake_db.execute("INSERT INTO SKILLS (skill_id, skill_name) VALUES (1, 'Python')")
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (1, 'Ada', 'ada@example.com')")
+    fake_db.executemany("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)",
+                        [(project_id, f'Project {project_id}') for project_id in range(1, 6)])
+    fake_db.commit()
+
+
+@pytest.fixture(params=[True, False], ids=['change-feed', 'catalog-version'])
+def invalidation(request, monkeypatch):
+    monkeypatch.setattr(app, 'CHANGE_FEED', request.param)
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    cache.put('a', CacheEntry(b'12345', 'a', {}, 1))
+    cache.put('b', CacheEntry(b'12345', 'b', {}, 1))
+    cache.put('c', CacheEntry(b'1', 'c', {}, 1))
+    assert cache.get('a', 1) is None
+    assert cache.get('b', 1).etag == 'b'
+    assert cache.get('b', 2) is None
+
+
+def test_matching_etag_gets_304(client, catalog_rows, invalidation):
+    first = client.get('/api/projects?limit=3')
+    assert first.status_code == 200 and first.headers['ETag']
+    
+    again = client.get('/api/projects?limit=3', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert client.get('/api/projects?limit=3', headers={'If-None-Match': '"other"'}).data == first.data
+    # Argument order does not matter
+    assert (client.get('/api/projects?limit=3&category=').headers['ETag']
+            == client.get('/api/projects?category=&limit=3').headers['ETag'])
+
+
+def test_create_project_changes_the_etag(client, fake_db, catalog_rows, invalidation):
+    etag = client.get('/api/projects').headers['ETag']
+    assert client.post('/api/projects', json={'title': 'Project 6'}).status_code == 201
+    
+    response = client.get('/api/projects', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['projects'][0]['title'] == 'Project 6'
+
+
+def test_update_student_is_served_fresh_and_keeps_catalog_etags(client, catalog_rows, invalidation):
+    etag = client.get('/api/projects').headers['ETag']
+    assert client.get('/api/students/1').get_json()['name'] == 'Ada'
+    
+    response = client.put('/api/students/1', json={'name': 'Ada L', 'email': 'ada@example.com', 'skills': [
+        {'skill_id': 1, 'proficiency_level': 'Advanced'}
+    ]})
+    assert response.status_code == 200
+    student = client.get('/api/students/1').get_json()
+    assert student['name'] == 'Ada L'
+    assert [skill['skill_id'] for skill in student['skills']] == [1]
+    # Student writes do not touch the project listings
+    assert client.get('/api/projects', headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,207 @@
+"""
+The vectorized scoring engines must give exactly the scores of calculate_match_score
+"""
+import itertools
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+from app import calculate_match_score
+from scoring import SCORING_ENGINES, ScoringPool, score_page, select_top
+
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+
+def random_catalog(rng, n_projects, n_skills):
+    """project_id -> requirement list, including unknown and missing levels and projects without skills"""
+    requirements = {}
+    for project_id in rng.sample(range(1, n_projects * 3), n_projects):
+        skills = []
+        for skill_id in rng.sample(range(1, n_skills + 1), rng.randint(0, min(12, n_skills))):
+            skill = {'skill_id': skill_id}
+            if rng.random() < 0.9:
+                skill['required_proficiency_level'] = rng.choice(LEVELS + ['Expert'])
+            skills.append(skill)
+        requirements[project_id] = skills
+    return requirements
+
+
+def random_student(rng, n_skills):
+    return {
+        skill_id: {'proficiency_level': rng.choice(LEVELS + ['Unknown'])}
+        for skill_id in rng.sample(range(1, n_skills + 1), rng.randint(1, min(20, n_skills)))
+    }
+
+
+@pytest.mark.parametrize('engine', sorted(SCORING_ENGINES))
+@pytest.mark.parametrize('seed', range(5))
+def test_engine_matches_calculate_match_score(engine, seed):
+    rng = random.Random(seed)
+    # More than 64 skills so the bitset engine spans several words
+    n_skills = rng.choice([5, 40, 150])
+    requirements = random_catalog(rng, 300, n_skills)
+    project_ids = sorted(requirements, reverse=True)
+    matrix = SCORING_ENGINES[engine](project_ids, requirements)
+    
+    for _ in range(20):
+        student = random_student(rng, n_skills)
+        expected = [calculate_match_score(student, requirements[project_id]) for project_id in project_ids]
+        assert matrix.score(student).tolist() == expected
+
+
+@pytest.mark.parametrize('engine', sorted(SCORING_ENGINES))
+def test_engine_matches_calculate_match_score_on_every_level_combination(engine):
+    # Every project of up to three skills over every required level, against every
+    # student holding those skills at any level or not at all
+    requirement_levels = LEVELS + ['Expert', None]
+    requirements = {}
+    for size in range(1, 4):
+        for levels in itertools.product(requirement_levels, repeat=size):
+            requirements[len(requirements) + 1] = [
+                {'skill_id': skill_id, 'required_proficiency_level': level} if level else {'skill_id': skill_id}
+                for skill_id, level in enumerate(levels, start=1)
+            ]
+    requirements[len(requirements) + 1] = []
+    project_ids = sorted(requirements, reverse=True)
+    matrix = SCORING_ENGINES[engine](project_ids, requirements)
+    
+    for held in itertools.product(LEVELS + ['Unknown', None], repeat=3):
+        student = {skill_id: {'proficiency_level': level} for skill_id, level in enumerate(held, start=1) if level}
+        expected = [calculate_match_score(student, requirements[project_id]) for project_id in project_ids]
+        assert matrix.score(student).tolist() == expected
+
+
+@pytest.mark.parametrize('engine', sorted(SCORING_ENGINES))
+def test_engine_pages_like_sorted_calculate_match_score(engine):
+    rng = random.Random(11)
+    requirements = random_catalog(rng, 150, 20)
+    project_ids = sorted(requirements, reverse=True)
+    matrix = SCORING_ENGINES[engine](project_ids, requirements)
+    student = random_student(rng, 20)
+    
+    expected = sorted(((calculate_match_score(student, requirements[project_id]), project_id)
+                       for project_id in project_ids), reverse=True)
+    pages, after = [], None
+    while True:
+        page = score_page(matrix, student, 40, after)
+        if not page:
+            break
+        pages += page
+        after = page[-1]
+    assert pages == expected
+
+
+@pytest.mark.parametrize('engine', sorted(SCORING_ENGINES))
+def test_engine_ranks_like_sorted_scores(engine):
+    rng = random.Random(7)
+    requirements = random_catalog(rng, 200, 30)
+    project_ids = sorted(requirements, reverse=True)
+    matrix = SCORING_ENGINES[engine](project_ids, requirements)
+    student = random_student(rng, 30)
+    
+    scores = matrix.score(student)
+    expected = sorted(zip(scores.tolist(), matrix.project_ids.tolist()), reverse=True)[:25]
+    rows = select_top(scores, matrix.project_ids, 25)
+    assert list(zip(scores[rows].tolist(), matrix.project_ids[rows].tolist())) == expected
+    assert np.all(np.diff(scores[rows]) <= 0)
+
+
+def wait_for_pool(pool, matrix, timeout=60):
+    deadline = time.monotonic() + timeout
+    while pool._current is None or pool._current.matrix is not matrix:
+        assert time.monotonic() < deadline, 'scoring pool did not start'
+        time.sleep(0.05)
+
+
+def test_pool_swaps_catalogs_without_failing_running_batches():
+    rng = random.Random(3)
+    requirements = random_catalog(rng, 200, 30)
+    project_ids = sorted(requirements, reverse=True)
+    first = SCORING_ENGINES['matrix'](project_ids, requirements)
+    second = SCORING_ENGINES['matrix'](project_ids[1:], requirements)
+    students = [(student_id, random_student(rng, 30)) for student_id in range(40)]
+    
+    pool = ScoringPool(2, min_parallel=1)
+    try:
+        # Batches score in-process while the pool starts in the background
+        assert list(pool.score_many(first, students, 5)) == [
+            (student_id, score_page(first, skills, 5)) for student_id, skills in students
+        ]
+        wait_for_pool(pool, first)
+        old = pool._current
+        executor = pool._executor
+        
+        running = pool.score_many(first, students, 5)
+        results = [next(running)]
+        
+        # The catalog changes while the first batch is still being read
+        assert list(pool.score_many(second, students, 5))[0][1] == score_page(second, students[0][1], 5)
+        wait_for_pool(pool, second)
+        assert old.retired and old.users == 1
+        assert os.path.exists(old.path)
+        
+        results.extend(running)
+        assert results == [(student_id, score_page(first, skills, 5)) for student_id, skills in students]
+        assert old.users == 0
+        assert not os.path.exists(old.path)
+        assert list(pool.score_many(second, students, 5)) == [
+            (student_id, score_page(second, skills, 5)) for student_id, skills in students
+        ]
+        # The same workers reloaded the matrix instead of a new pool being started
+        assert pool._executor is executor
+        current = pool._current
+    finally:
+        pool.shutdown()
+    assert not os.path.exists(current.path)
+
+
+def test_pool_scores_in_process_when_its_workers_die():
+    rng = random.Random(5)
+    requirements = random_catalog(rng, 100, 20)
+    matrix = SCORING_ENGINES['bitset'](sorted(requirements, reverse=True), requirements)
+    students = [(student_id, random_student(rng, 20)) for student_id in range(20)]
+    expected = [(student_id, score_page(matrix, skills, 3)) for student_id, skills in students]
+    
+    pool = ScoringPool(2, min_parallel=1)
+    try:
+        list(pool.score_many(matrix, students, 3))
+        wait_for_pool(pool, matrix)
+        dead = pool._executor
+        for process in list(dead._processes.values()):
+            process.kill()
+            process.join()
+        
+        assert list(pool.score_many(matrix, students, 3)) == expected
+        assert pool._executor is None and pool._current is None
+        # The next batch starts a new pool
+        assert list(pool.score_many(matrix, students, 3)) == expected
+        wait_for_pool(pool, matrix)
+        assert pool._executor is not dead
+        assert list(pool.score_many(matrix, students, 3)) == expected
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize('limit', [1, 6, 40])
+def test_select_top_pages_have_no_gaps_or_duplicates_when_scores_tie(limit):
+    rng = random.Random(11)
+    # Few distinct requirement lists, so most scores tie
+    shapes = [[{'skill_id': 1, 'required_proficiency_level': 'Beginner'}],
+              [{'skill_id': 2, 'required_proficiency_level': 'Advanced'}], []]
+    requirements = {project_id: rng.choice(shapes) for project_id in rng.sample(range(1, 500), 120)}
+    matrix = SCORING_ENGINES['matrix'](sorted(requirements, reverse=True), requirements)
+    student = {1: {'proficiency_level': 'Beginner'}, 2: {'proficiency_level': 'Intermediate'}}
+    
+    pages, after = [], None
+    while True:
+        page = score_page(matrix, student, limit, after)
+        pages.append(page)
+        if len(page) < limit:
+            break
+        after = page[-1]
+    walked = [row for page in pages for row in page]
+    assert walked == sorted(score_page(matrix, student), reverse=True)
+    assert len(set(walked)) == len(requirements)
@@ -0,0 +1,88 @@
+import pytest
+
+import search_index
+from search_index import SearchIndex
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add_many([
+        (1, {'title': 'Weather dashboard', 'description': 'Charts of the weather'}),
+        (2, {'title': 'Budget tracker', 'description': 'Track a weather budget and a budget forecast'}),
+        (3, {'title': 'Recipe planner', 'description': 'Plan meals with a dashboard'}),
+        (4, {'title': 'Python tutor', 'description': 'Learn python with exercises'}),
+        (5, {'title': 'Pythonic linter', 'description': 'Style checks'}),
+    ])
+    return index
+
+
+def ids(results):
+    return [doc_id for _, doc_id in results]
+
+
+def test_title_matches_outrank_description_matches(index):
+    # Both mention "dashboard" once; project 1 in the title
+    assert ids(index.search('dashboard')) == [1, 3]
+
+
+def test_more_occurrences_rank_higher(index):
+    assert ids(index.search('weather')) == [1, 2]
+    assert ids(index.search('budget')) == [2]
+
+
+def test_rarer_terms_weigh_more():
+    index = SearchIndex()
+    index.add_many([(doc_id, {'description': 'common'}) for doc_id in range(1, 10)])
+    index.add(10, description='common rare')
+    index.add(11, description='common common')
+    assert index.search('rare common')[0][1] == 10
+    assert index.search('rare')[0][0] > index.search('common')[0][0]
+
+
+def test_every_query_term_must_match(index):
+    assert ids(index.search('weather budget')) == [2]
+    assert index.search('weather recipe') == []
+    assert index.search('nothing') == []
+    assert index.search('') == []
+
+
+def test_prefixes_match_below_exact_words(index):
+    assert ids(index.search('python')) == [4, 5]
+    assert set(ids(index.search('pyth'))) == {4, 5}
+    exact = dict((doc_id, score) for score, doc_id in index.search('python'))
+    prefix = dict((doc_id, score) for score, doc_id in index.search('pyth'))
+    assert prefix[4] < exact[4]
+
+
+def test_prefix_expansion_keeps_the_most_common_completions(monkeypatch):
+    monkeypatch.setattr(search_index, 'PREFIX_EXPANSION_LIMIT', 2)
+    index = SearchIndex()
+    # "ab" completes to abc (3 docs), abd (2 docs) and abe (1 doc)
+    index.add_many([(1, {'title': 'abc abd abe'}), (2, {'title': 'abc abd'}), (3, {'title': 'abc'}),
+                    (4, {'title': 'abe'})])
+    assert sorted(term for term, _ in index._expand('ab')) == ['abc', 'abd']
+    assert 4 not in ids(index.search('ab'))
+
+
+def test_prefix_scan_is_bounded(monkeypatch):
+    monkeypatch.setattr(search_index, 'PREFIX_SCAN_LIMIT', 3)
+    index = SearchIndex()
+    index.add_many([(doc_id, {'title': f'word{doc_id:02d}'}) for doc_id in range(10)])
+    assert len(index._expand('word')) == 3
+
+
+def test_pages_select_after_the_cursor_and_filter_before_the_limit():
+    index = SearchIndex()
+    index.add_many([(doc_id, {'title': 'data ' * (doc_id % 4 + 1)}) for doc_id in range(1, 41)])
+    everything = index.search('data')
+    even = [result for result in everything if result[1] % 2 == 0]
+    
+    pages, after = [], None
+    while True:
+        page = index.search('data', 6, after, lambda doc_id: doc_id % 2 == 0)
+        pages.extend(page)
+        if len(page) < 6:
+            break
+        after = page[-1]
+    assert pages == even
@@ -0,0 +1,60 @@
+import os
+import re
+
+import setup_mysql_database
+from setup_mysql_database import BASE_TABLES, MIGRATION_TABLES, MIGRATIONS_DIR, list_migrations, split_sql_statements
+
+
+def test_split_on_semicolons_outside_quotes_and_comments():
+    sql = """
+        -- a comment; not a statement
+        INSERT INTO SKILLS (skill_name) VALUES ('C; C++'), ("it's");  # trailing
+        /* block; comment */ SELECT `a;b` FROM t;
+    """
+    assert split_sql_statements(sql) == [
+        'INSERT INTO SKILLS (skill_name) VALUES (\'C; C++\'), ("it\'s")',
+        'SELECT `a;b` FROM t',
+    ]
+
+
+def test_version_hints_are_kept_whole():
+    sql = """
+        /*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT; SET NAMES 'utf8' -- ; */;
+        /*!50003 CREATE TRIGGER t BEFORE INSERT ON x FOR EACH ROW SET NEW.a = ';' */;
+        SELECT 1;
+    """
+    assert split_sql_statements(sql) == [
+        "/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT; SET NAMES 'utf8' -- ; */",
+        "/*!50003 CREATE TRIGGER t BEFORE INSERT ON x FOR EACH ROW SET NEW.a = ';' */",
+        'SELECT 1',
+    ]
+
+
+def test_delimiter_lines_switch_the_terminator():
+    sql = """
+DELIMITER //
+CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END //
+DELIMITER ;
+SELECT 3;
+"""
+    assert split_sql_statements(sql) == ['CREATE PROCEDURE p() BEGIN SELECT 1; SELECT 2; END', 'SELECT 3']
+
+
+def test_setup_lists_every_table_the_migrations_create():
+    created = {'SCHEMA_MIGRATIONS'}
+    directory = os.path.join(os.path.dirname(setup_mysql_database.__file__), MIGRATIONS_DIR)
+    for _, _, path in list_migrations(directory):
+        with open(path, encoding='utf-8') as f:
+            created.update(re.findall(r'^CREATE TABLE IF NOT EXISTS (\w+)', f.read(), re.MULTILINE))
+    assert sorted(MIGRATION_TABLES) == sorted(created)
+    assert not set(BASE_TABLES) & created
+
+
+def test_collation_change_covers_projects_and_skills_only():
+    path = os.path.join(os.path.dirname(setup_mysql_database.__file__), MIGRATIONS_DIR, '001_hot_query_indexes.sql')
+    with open(path, encoding='utf-8') as f:
+        statements = split_sql_statements(f.read())
+    converted = dict(re.findall(r'^ALTER TABLE (\w+) CONVERT TO CHARACTER SET utf8mb4 COLLATE (\w+)$',
+                                '\n'.join(statements), re.MULTILINE))
+    # Emails are compared lowercased, so STUDENTS keeps its collation
+    assert converted == {'PROJECTS': 'utf8mb4_unicode_ci', 'SKILLS': 'utf8mb4_unicode_ci'}
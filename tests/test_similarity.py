@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+import app
+from similarity import SimilarityIndex, jaccard, skill_tokens
+
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+
+def requirement(skill_id, level):
+    return {'skill_id': skill_id, 'required_proficiency_level': level}
+
+
+def weighted_jaccard(a, b):
+    """Sum of the smaller over sum of the larger required level per skill"""
+    levels_a = {skill['skill_id']: LEVELS.index(skill['required_proficiency_level']) + 1 for skill in a}
+    levels_b = {skill['skill_id']: LEVELS.index(skill['required_proficiency_level']) + 1 for skill in b}
+    skills = levels_a.keys() | levels_b.keys()
+    return (sum(min(levels_a.get(s, 0), levels_b.get(s, 0)) for s in skills)
+            / sum(max(levels_a.get(s, 0), levels_b.get(s, 0)) for s in skills))
+
+
+def test_token_jaccard_is_the_level_weighted_jaccard():
+    a = [requirement(1, 'Advanced'), requirement(2, 'Beginner')]
+    b = [requirement(1, 'Beginner'), requirement(2, 'Beginner'), requirement(3, 'Intermediate')]
+    # min levels 1 + 1 + 0, max levels 3 + 1 + 2
+    assert jaccard(skill_tokens(a), skill_tokens(b)) == pytest.approx(2 / 6)
+    # Unweighted, only the skill ids count
+    assert jaccard(skill_tokens(a, weighted=False), skill_tokens(b, weighted=False)) == pytest.approx(2 / 3)
+    # A missing level counts as Beginner
+    assert skill_tokens([{'skill_id': 4}]) == skill_tokens([requirement(4, 'Beginner')])
+    
+    rng = random.Random(1)
+    for _ in range(200):
+        a = [requirement(s, rng.choice(LEVELS)) for s in rng.sample(range(1, 15), rng.randint(1, 6))]
+        b = [requirement(s, rng.choice(LEVELS)) for s in rng.sample(range(1, 15), rng.randint(1, 6))]
+        assert jaccard(skill_tokens(a), skill_tokens(b)) == pytest.approx(weighted_jaccard(a, b))
+
+
+@pytest.fixture
+def near_duplicates():
+    """300 random projects over 200 skills, each of the first 100 with a copy that differs in one skill"""
+    rng = random.Random(4)
+    requirements = {}
+    for project_id in range(1, 301):
+        requirements[project_id] = [requirement(s, rng.choice(LEVELS)) for s in rng.sample(range(1, 201), rng.randint(8, 12))]
+    for project_id in range(1, 101):
+        copy = [dict(skill) for skill in requirements[project_id]]
+        if project_id % 2:
+            copy[0]['required_proficiency_level'] = LEVELS[(LEVELS.index(copy[0]['required_proficiency_level']) + 1) % 3]
+        else:
+            copy.pop()
+        requirements[1000 + project_id] = copy
+    return requirements
+
+
+def test_lsh_finds_near_duplicates_with_exact_similarities(near_duplicates):
+    index = SimilarityIndex()
+    index.add_many(near_duplicates.items())
+    
+    found = 0
+    for project_id in range(1, 101):
+        similar = index.similar(project_id, 5)
+        found += (1000 + project_id) in [other for _, other in similar]
+        # Similarities are the exact weighted Jaccard, best first
+        for similarity, other in similar:
+            assert similarity == round(weighted_jaccard(near_duplicates[project_id], near_duplicates[other]), 4)
+        assert similar == sorted(similar, key=lambda item: (-item[0], -item[1]))
+    # A near-duplicate (weighted Jaccard above 0.7) shares a band with probability above 0.99999
+    assert found == 100
+
+
+def test_lsh_rarely_pairs_unrelated_projects(near_duplicates):
+    index = SimilarityIndex()
+    index.add_many(near_duplicates.items())
+    # Random projects over 200 skills share little, so most lookups rank few candidates
+    candidates = [len(index._candidates(project_id)[1]) for project_id in range(101, 301)]
+    assert sum(candidates) / len(candidates) < 5
+
+
+@pytest.fixture
+def similar_catalog(fake_db):
+    fake_db.executemany("INSERT INTO SKILLS (skill_id, skill_name) VALUES (?, ?)",
+                        [(skill_id, f'Skill {skill_id}') for skill_id in range(1, 6)])
+    fake_db.executemany("INSERT INTO PROJECTS (project_id, title) VALUES (?, ?)",
+                        [(project_id, f'Project {project_id}') for project_id in range(1, 8)])
+    # Projects 2-6 share skills 1-3 with project 1 to different degrees; 7 has no skills
+    fake_db.executemany("INSERT INTO PROJECT_SKILLS VALUES (?, ?, ?, 'Y')", [
+        (1, 1, 'Beginner'), (1, 2, 'Beginner'), (1, 3, 'Beginner'),
+        (2, 1, 'Beginner'), (2, 2, 'Beginner'), (2, 3, 'Beginner'),
+        (3, 1, 'Beginner'), (3, 2, 'Beginner'), (3, 3, 'Intermediate'),
+        (4, 1, 'Beginner'), (4, 2, 'Beginner'),
+        (5, 1, 'Beginner'), (5, 2, 'Beginner'), (5, 4, 'Beginner'),
+        (6, 1, 'Beginner'), (6, 2, 'Beginner'), (6, 3, 'Beginner'), (6, 5, 'Advanced'),
+    ])
+    fake_db.commit()
+
+
+def similar_ids(client, query=''):
+    response = client.get(f'/api/projects/1/similar{query}')
+    assert response.status_code == 200
+    return [(project['project_id'], project['similarity']) for project in response.get_json()['similar']]
+
+
+def test_similar_endpoint_ranks_and_limits(client, similar_catalog, monkeypatch):
+    # Equal similarities list the newer project first
+    assert similar_ids(client) == [(2, 1.0), (3, 0.75), (4, 0.6667), (6, 0.5), (5, 0.5)]
+    assert similar_ids(client, '?limit=2') == [(2, 1.0), (3, 0.75)]
+    # Limits are clamped to [1, SIMILAR_PROJECTS_MAX_LIMIT]
+    assert similar_ids(client, '?limit=0') == [(2, 1.0)]
+    monkeypatch.setattr(app, 'SIMILAR_PROJECTS_MAX_LIMIT', 3)
+    assert len(similar_ids(client, '?limit=1000')) == 3
+    assert client.get('/api/projects/1/similar?limit=many').status_code == 400
+
+
+def test_similar_endpoint_404s_on_unknown_projects(client, similar_catalog):
+    response = client.get('/api/projects/99/similar')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Project not found'}
+    # A known project without skills has no similar projects
+    assert client.get('/api/projects/7/similar').get_json() == {'project_id': 7, 'similar': []}
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, function, followers=5):
+    """Call flight.do from a leader and `followers` threads that arrive while the leader's run is blocked
+    
+    function(release) must block until release is set. Returns [(result or exception, shared)].
+    """
+    started, release = threading.Event(), threading.Event()
+    outcomes = []
+    lock = threading.Lock()
+    
+    def leader_function():
+        started.set()
+        return function(release)
+    
+    def call(target):
+        try:
+            outcome = flight.do(key, target)
+        except Exception as e:
+            outcome = (e, False)
+        with lock:
+            outcomes.append(outcome)
+    
+    threads = [threading.Thread(target=call, args=(leader_function,))]
+    threads[0].start()
+    assert started.wait(5)
+    threads += [threading.Thread(target=call, args=(pytest.fail,)) for _ in range(followers)]
+    for thread in threads[1:]:
+        thread.start()
+    
+    deadline = time.monotonic() + 5
+    while flight.stats()['coalesced'] < followers:
+        assert time.monotonic() < deadline, 'followers did not join the running call'
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_calls_run_once_and_share_the_result():
+    flight = SingleFlight()
+    runs = []
+    
+    def compute(release):
+        release.wait(5)
+        runs.append(1)
+        return {'value': 42}
+    
+    outcomes = run_concurrently(flight, 'key', compute)
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in outcomes) == [False] + [True] * 5
+    # Every caller gets the very same object
+    assert all(result is outcomes[0][0] for result, _ in outcomes)
+    assert flight.stats()['executions'] == 1 and flight.stats()['in_flight'] == 0
+    
+    # Nothing is cached once the call returned
+    assert flight.do('key', lambda: 'again') == ('again', False)
+
+
+def test_concurrent_calls_share_the_exception():
+    flight = SingleFlight()
+    error = ValueError('boom')
+    
+    def fail(release):
+        release.wait(5)
+        raise error
+    
+    outcomes = run_concurrently(flight, 'key', fail, followers=3)
+    assert [result for result, _ in outcomes] == [error] * 4
+    assert flight.stats()['errors'] == 1 and flight.stats()['in_flight'] == 0
+    assert flight.do('key', lambda: 'recovered') == ('recovered', False)
+
+
+def test_different_keys_and_disabled_flights_run_every_call():
+    flight = SingleFlight()
+    inner = []
+    
+    def outer():
+        # A call for another key inside a running one is not coalesced with it
+        inner.append(flight.do('other', lambda: 'inner'))
+        return 'outer'
+    
+    assert flight.do('key', outer) == ('outer', False)
+    assert inner == [('inner', False)]
+    
+    disabled = SingleFlight(enabled=False)
+    assert [disabled.do('key', lambda: 1) for _ in range(3)] == [(1, False)] * 3
+    assert disabled.stats()['executions'] == 0
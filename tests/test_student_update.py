@@ -0,0 +1,63 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def skill_writes(fake_db):
+    """Student 1 with 40 skills; returns the log of (operation, skill_id) row writes to STUDENT_SKILLS"""
+    fake_db.execute("INSERT INTO STUDENTS (student_id, name, email) VALUES (1, 'Ada', 'ada@example.com')")
+    fake_db.executemany("INSERT INTO SKILLS (skill_id, skill_name, skill_type) VALUES (?, ?, 'Technical')",
+                        [(skill_id, f'Skill {skill_id}') for skill_id in range(1, 51)])
+    fake_db.executemany("INSERT INTO STUDENT_SKILLS VALUES (1, ?, 'Intermediate', 2)",
+                        [(skill_id,) for skill_id in range(1, 41)])
+    fake_db.executescript("""
+        CREATE TABLE SKILL_WRITES (operation TEXT, skill_id INT);
+        CREATE TRIGGER skill_insert AFTER INSERT ON STUDENT_SKILLS
+            BEGIN INSERT INTO SKILL_WRITES VALUES ('insert', NEW.skill_id); END;
+        CREATE TRIGGER skill_update AFTER UPDATE ON STUDENT_SKILLS
+            BEGIN INSERT INTO SKILL_WRITES VALUES ('update', NEW.skill_id); END;
+        CREATE TRIGGER skill_delete AFTER DELETE ON STUDENT_SKILLS
+            BEGIN INSERT INTO SKILL_WRITES VALUES ('delete', OLD.skill_id); END;
+    """)
+    fake_db.commit()
+    
+    def writes():
+        return sorted(fake_db.execute('SELECT operation, skill_id FROM SKILL_WRITES').fetchall())
+    return writes
+
+
+def update_skills(client, fake_db, skills):
+    del fake_db.statements[:]
+    response = client.put('/api/students/1', json={
+        'name': 'Ada', 'email': 'ada@example.com',
+        'skills': [{'skill_id': skill_id, 'proficiency_level': level, 'years_of_experience': years}
+                   for skill_id, level, years in skills]
+    })
+    assert response.status_code == 200
+    return [statement for statement in fake_db.statements if 'STUDENT_SKILLS' in statement]
+
+
+@pytest.mark.parametrize('materialized', [True, False])
+def test_update_writes_only_the_changed_skills(client, fake_db, skill_writes, monkeypatch, materialized):
+    monkeypatch.setattr(app, 'MATERIALIZED_RECOMMENDATIONS', materialized)
+    unchanged = [(skill_id, 'Intermediate', 2) for skill_id in range(4, 41)]
+    
+    # Skill 1 changes level, 2 changes years, 3 is dropped and 45 is added
+    statements = update_skills(client, fake_db, [(1, 'Advanced', 2), (2, 'Intermediate', 5), (45, 'Beginner', 0)] + unchanged)
+    assert skill_writes() == [('delete', 3), ('insert', 45), ('update', 1), ('update', 2)]
+    # One locking read, one batched delete and one batched upsert, plus the profile re-read
+    assert [statement.split()[0] for statement in statements] == ['SELECT', 'DELETE', 'INSERT', 'SELECT']
+    
+    stored = fake_db.execute('SELECT skill_id, proficiency_level, years_of_experience FROM STUDENT_SKILLS '
+                             'WHERE student_id = 1 ORDER BY skill_id').fetchall()
+    assert stored[:2] == [(1, 'Advanced', 2), (2, 'Intermediate', 5)]
+    assert [row[0] for row in stored] == list(range(1, 3)) + list(range(4, 41)) + [45]
+
+
+def test_update_with_the_same_skills_writes_nothing(client, fake_db, skill_writes):
+    statements = update_skills(client, fake_db, [(skill_id, 'Intermediate', 2) for skill_id in range(1, 41)])
+    assert skill_writes() == []
+    assert all(statement.split()[0] == 'SELECT' for statement in statements)
+    # Unchanged skills leave the stored recommendations alone
+    assert not any(statement.split()[0] == 'DELETE' and 'RECOMMENDATIONS' in statement for statement in fake_db.statements)